@@ -0,0 +1,457 @@
+"""
+Servidor FindFace local para testes de carga e desenvolvimento offline.
+
+Implementa apenas os endpoints usados pela aplicação (login/logout, grupos
+de câmeras, câmeras e criação de eventos), com latência configurável,
+injeção de erros e contabilização de vazão. Usa somente a biblioteca padrão.
+
+Exemplo:
+    python findface_stub_server.py --port 8000 --groups 2 --cameras-per-group 8 \\
+        --rtsp "rtsp://127.0.0.1:8554/cam{n}" --latency-ms 40 --error-rate 0.01
+
+    # .env
+    FINDFACE_URL=http://127.0.0.1:8000
+
+GET /stats/ retorna as estatísticas em JSON.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+# Endpoints de criação de evento (SDK atual e wrapper legado)
+EVENT_PATHS = ("/events/faces/add/", "/events/create_from_image/")
+
+
+class StubStats:
+    """Contadores de vazão e latência do servidor (thread-safe)."""
+
+    # Amostras de latência mantidas para os percentis
+    LATENCY_SAMPLES = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._events = 0
+        self._faces = 0
+        self._bytes = 0
+        self._errors: Dict[int, int] = {}
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        # Janela do último intervalo de log
+        self._window_start = self._started_at
+        self._window_events = 0
+        self._window_bytes = 0
+
+    def begin(self) -> None:
+        """Registra o início de um upload."""
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def end(self, status: int, size: int, faces: int, latency: float) -> None:
+        """Registra o fim de um upload."""
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if status == 200:
+                self._events += 1
+                self._faces += faces
+                self._bytes += size
+                self._window_events += 1
+                self._window_bytes += size
+            else:
+                self._errors[status] = self._errors.get(status, 0) + 1
+
+    def window(self) -> Tuple[float, float]:
+        """
+        Fecha a janela corrente.
+
+        :return: Tupla (eventos/s, MB/s) desde a janela anterior.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = max(now - self._window_start, 1e-6)
+            rates = (self._window_events / elapsed, self._window_bytes / elapsed / 1e6)
+            self._window_start = now
+            self._window_events = 0
+            self._window_bytes = 0
+            return rates
+
+    def get_stats(self) -> dict:
+        """Estatísticas acumuladas."""
+        with self._lock:
+            elapsed = max(time.monotonic() - self._started_at, 1e-6)
+            latencies = sorted(self._latencies)
+
+            def percentile(p: float) -> float:
+                if not latencies:
+                    return 0.0
+                return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+            return {
+                "uptime_s": round(elapsed, 1),
+                "events": self._events,
+                "faces": self._faces,
+                "bytes": self._bytes,
+                "events_per_s": round(self._events / elapsed, 2),
+                "mb_per_s": round(self._bytes / elapsed / 1e6, 3),
+                "avg_upload_kb": round(self._bytes / self._events / 1024, 1) if self._events else 0.0,
+                "errors": dict(self._errors),
+                "in_flight": self._in_flight,
+                "max_in_flight": self._max_in_flight,
+                "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)}
+            }
+
+
+class StubState:
+    """Dados simulados (grupos, câmeras, tokens) e parâmetros do servidor."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.user = args.user
+        self.password = args.password
+        self.latency = args.latency_ms / 1000.0
+        self.latency_jitter = args.latency_jitter_ms / 1000.0
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.token_ttl = args.token_ttl
+        self.page_size = args.page_size
+        self.stats = StubStats()
+
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, float] = {}
+        self._next_event_id = 0
+
+        self.camera_groups: List[Dict[str, Any]] = []
+        self.cameras: List[Dict[str, Any]] = []
+        camera_number = 0
+        for group_index in range(args.groups):
+            group_id = group_index + 1
+            self.camera_groups.append({
+                "id": group_id,
+                "name": f"{args.prefix}{group_id}",
+                "active": True
+            })
+            for _ in range(args.cameras_per_group):
+                camera_number += 1
+                self.cameras.append({
+                    "id": camera_number,
+                    "name": f"Camera {camera_number}",
+                    "group": group_id,
+                    "active": True,
+                    "external_detector": True,
+                    "external_detector_token": f"stub-camera-{camera_number}",
+                    "comment": args.rtsp.format(n=camera_number)
+                })
+        self.camera_tokens = {c["external_detector_token"]: c["id"] for c in self.cameras}
+
+    def issue_token(self) -> str:
+        """Gera um token de sessão."""
+        token = secrets.token_hex(20)
+        with self._lock:
+            self._tokens[token] = time.monotonic()
+        return token
+
+    def revoke_token(self, token: str) -> None:
+        """Invalida um token de sessão."""
+        with self._lock:
+            self._tokens.pop(token, None)
+
+    def token_valid(self, token: Optional[str]) -> bool:
+        """Verifica um token de sessão (expira após token_ttl, se configurado)."""
+        with self._lock:
+            issued_at = self._tokens.get(token)
+            if issued_at is None:
+                return False
+            if self.token_ttl > 0 and time.monotonic() - issued_at > self.token_ttl:
+                del self._tokens[token]
+                return False
+            return True
+
+    def next_event_id(self) -> int:
+        """ID sequencial do próximo evento."""
+        with self._lock:
+            self._next_event_id += 1
+            return self._next_event_id
+
+    def simulate_latency(self) -> None:
+        """Dorme a latência configurada (com variação uniforme)."""
+        delay = self.latency
+        if self.latency_jitter:
+            delay += random.uniform(-self.latency_jitter, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def inject_error(self) -> bool:
+        """Sorteia uma falha conforme error_rate."""
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Roteia as requisições para os endpoints simulados."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, como o FindFace real
+    server_version = "FindfaceStub/1.0"
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        logging.getLogger("findface_stub").debug(format % args)
+
+    # ------------------------------------------------------------------
+    # Respostas
+    # ------------------------------------------------------------------
+
+    def _send_json(self, status: int, body: Any = None) -> None:
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        if data:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: int, desc: str) -> None:
+        self._send_json(status, {"code": "STUB_ERROR", "desc": desc})
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _authorized(self) -> bool:
+        auth = self.headers.get("Authorization", "")
+        token = auth[len("Token "):] if auth.startswith("Token ") else None
+        if self.state.token_valid(token):
+            return True
+        self._send_json(401, {"code": "UNAUTHORIZED", "desc": "Invalid token."})
+        return False
+
+    @staticmethod
+    def _paginate(items: List[Dict[str, Any]], query: Dict[str, List[str]], page_size: int) -> Dict[str, Any]:
+        """Página de resultados no formato da API (next_page com cursor de offset)."""
+        limit = int(query.get("limit", [page_size])[0] or page_size)
+        offset = int(query.get("page", [0])[0] or 0)
+        results = items[offset:offset + limit]
+        next_page = None
+        if offset + limit < len(items):
+            next_query = {k: v[0] for k, v in query.items()}
+            next_query["page"] = offset + limit
+            next_page = "?" + urlencode(next_query)
+        return {"results": results, "next_page": next_page, "prev_page": None}
+
+    # ------------------------------------------------------------------
+    # Métodos HTTP
+    # ------------------------------------------------------------------
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_body()
+
+        if path == "/auth/login/":
+            self._login()
+        elif path == "/auth/logout/":
+            if self._authorized():
+                self.state.revoke_token(self.headers["Authorization"][len("Token "):])
+                self._send_json(204)
+        elif path in EVENT_PATHS:
+            self._add_event(body)
+        else:
+            self._send_error(404, f"Endpoint não simulado: POST {path}")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+
+        if path == "/stats/":
+            self._send_json(200, self.state.stats.get_stats())
+            return
+        if not self._authorized():
+            return
+
+        if path == "/camera-groups/":
+            self._send_json(200, self._paginate(self.state.camera_groups, query, self.state.page_size))
+        elif path == "/camera-groups/count/":
+            self._send_json(200, {"count": len(self.state.camera_groups)})
+        elif path == "/cameras/":
+            self._send_json(200, self._paginate(self._filter_cameras(query), query, self.state.page_size))
+        elif path == "/cameras/count/":
+            self._send_json(200, {"count": len(self._filter_cameras(query))})
+        elif path.startswith("/cameras/") or path.startswith("/camera-groups/"):
+            self._get_by_id(path)
+        else:
+            self._send_error(404, f"Endpoint não simulado: GET {path}")
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def _login(self) -> None:
+        auth = self.headers.get("Authorization", "")
+        if self.state.user is not None:
+            try:
+                user, _, password = base64.b64decode(auth[len("Basic "):]).decode().partition(":")
+            except Exception:
+                user, password = None, None
+            if user != self.state.user or password != self.state.password:
+                self._send_json(401, {"code": "UNAUTHORIZED", "desc": "Invalid username/password."})
+                return
+        self._send_json(200, {"token": self.state.issue_token()})
+
+    def _filter_cameras(self, query: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        cameras = self.state.cameras
+        groups = query.get("camera_groups")
+        if groups:
+            wanted = {int(g) for g in groups[0].split(",") if g}
+            cameras = [c for c in cameras if c["group"] in wanted]
+        for flag in ("active", "external_detector"):
+            if flag in query:
+                value = query[flag][0].lower() == "true"
+                cameras = [c for c in cameras if c[flag] == value]
+        return cameras
+
+    def _get_by_id(self, path: str) -> None:
+        parts = [p for p in path.split("/") if p]
+        collection = self.state.cameras if parts[0] == "cameras" else self.state.camera_groups
+        if len(parts) == 2 and parts[1].isdigit():
+            for item in collection:
+                if item["id"] == int(parts[1]):
+                    self._send_json(200, item)
+                    return
+        self._send_error(404, "Not found.")
+
+    def _add_event(self, body: bytes) -> None:
+        stats = self.state.stats
+        stats.begin()
+        start = time.monotonic()
+        status, size, faces = 200, 0, 0
+        try:
+            if not self._authorized():
+                status = 401
+                return
+
+            fields, files = self._parse_multipart(body)
+            image = files.get("fullframe")
+            size = len(image) if image else 0
+            camera_id = self.state.camera_tokens.get(fields.get("token", [None])[0])
+            if camera_id is None and "camera" in fields:
+                # Wrapper legado (/events/create_from_image/) não envia o token
+                camera_id = int(fields["camera"][0])
+
+            self.state.simulate_latency()
+
+            if not image or not image.startswith(b"\xff\xd8"):
+                status = 400
+                self._send_error(status, "fullframe ausente ou não é JPEG.")
+                return
+            if camera_id is None:
+                status = 400
+                self._send_error(status, "Token de câmera inválido.")
+                return
+            if self.state.inject_error():
+                status = self.state.error_status
+                self._send_error(status, "Erro injetado.")
+                return
+
+            faces = 1 if fields.get("mf_selector", ["biggest"])[0] == "biggest" else max(1, len(fields.get("roi", [])) // 4)
+            self._send_json(200, {
+                "id": str(self.state.next_event_id()),
+                "camera": camera_id,
+                "matched": False,
+                "matched_card": None
+            })
+        finally:
+            stats.end(status, size, faces, time.monotonic() - start)
+
+    def _parse_multipart(self, body: bytes) -> Tuple[Dict[str, List[str]], Dict[str, bytes]]:
+        """Separa campos e arquivos de um corpo multipart/form-data."""
+        header = f"Content-Type: {self.headers.get('Content-Type', '')}\r\n\r\n".encode()
+        message = BytesParser(policy=HTTP).parsebytes(header + body)
+        fields: Dict[str, List[str]] = {}
+        files: Dict[str, bytes] = {}
+        if not message.is_multipart():
+            return fields, files
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            payload = part.get_payload(decode=True) or b""
+            if part.get_filename() is not None:
+                files[name] = payload
+            else:
+                fields.setdefault(name, []).append(payload.decode(errors="replace"))
+        return fields, files
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Servidor FindFace local (testes de carga e desenvolvimento offline)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--user", default=None, help="Usuário aceito no login (padrão: qualquer um)")
+    parser.add_argument("--password", default=None, help="Senha aceita no login")
+    parser.add_argument("--groups", type=int, default=1, help="Número de grupos de câmeras")
+    parser.add_argument("--cameras-per-group", type=int, default=4)
+    parser.add_argument("--prefix", default="TESTE", help="Prefixo do nome dos grupos (camera_prefix)")
+    parser.add_argument("--rtsp", default="rtsp://127.0.0.1:8554/cam{n}",
+                        help="Modelo da URL RTSP das câmeras ({n} = número da câmera)")
+    parser.add_argument("--page-size", type=int, default=100, help="Itens por página nas listagens")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latência simulada por upload")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Variação uniforme da latência")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fração de uploads que falham (0-1)")
+    parser.add_argument("--error-status", type=int, default=503, help="Status HTTP das falhas injetadas")
+    parser.add_argument("--token-ttl", type=float, default=0.0,
+                        help="Validade (s) do token de sessão; 0 = não expira (útil para testar o 401)")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="Intervalo (s) do log de vazão")
+    return parser.parse_args()
+
+
+def main():
+    """Inicia o servidor e registra a vazão periodicamente."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    logger = logging.getLogger("findface_stub")
+    args = parse_args()
+
+    state = StubState(args)
+    StubHandler.state = state
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.daemon_threads = True
+
+    threading.Thread(target=server.serve_forever, name="FindfaceStub", daemon=True).start()
+    logger.info(
+        f"FindFace local em http://{args.host}:{args.port} "
+        f"({len(state.camera_groups)} grupos, {len(state.cameras)} câmeras, "
+        f"latência {args.latency_ms:.0f}±{args.latency_jitter_ms:.0f}ms, erros {args.error_rate:.1%})"
+    )
+
+    try:
+        while True:
+            time.sleep(args.stats_interval)
+            events_per_s, mb_per_s = state.stats.window()
+            stats = state.stats.get_stats()
+            logger.info(
+                f"{events_per_s:.1f} eventos/s | {mb_per_s:.2f} MB/s | total {stats['events']} | "
+                f"erros {stats['errors']} | em andamento {stats['in_flight']} | "
+                f"p95 {stats['latency_ms']['p95']:.0f}ms"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        logger.info(f"Estatísticas finais: {json.dumps(state.stats.get_stats())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,10 +21,9 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from src.infrastructure.config.config_loader import ConfigLoader
-from src.infrastructure.clients import FindfaceMulti
 from src.infrastructure.repositories import CameraRepositoryFindface
 from src.infrastructure.logging import AsyncLogger
-from src.infrastructure.clients import FindfaceMulti, FindfaceMultiAsync
+from src.infrastructure.external.findface_client import create_findface_client
 from src.application.orchestrator import ApplicationOrchestrator
 
 
@@ -55,7 +54,6 @@ def main():
     async_logger = None
     orchestrator = None
     findface_client = None
-    findface_async_wrapper = None
     try:
         # Carrega configurações
         print("Carregando configurações...")
@@ -69,27 +67,12 @@ def main():
         # Cria cliente FindFace
         logger.info("Conectando ao FindFace...")
         try:
-            findface_client = FindfaceMulti(
-                url_base=settings.findface.url_base,
-                user=settings.findface.user,
-                password=settings.findface.password,
-                uuid=settings.findface.uuid
+            # O SDK mantém uma sessão keep-alive com pool usada por todas as chamadas
+            findface_client = create_findface_client(settings.findface, settings.findface_client)
+            logger.info(
+                f"Conexão com FindFace estabelecida "
+                f"({len(settings.findface.url_bases) or 1} nó(s), pool_maxsize={settings.findface_client.pool_maxsize})"
             )
-            logger.info("Conexão com FindFace estabelecida")
-            
-            # Envolve com wrapper assíncrono (pool de conexões)
-            try:
-                findface_async_wrapper = FindfaceMultiAsync(
-                    findface_client,
-                    pool_connections=10,
-                    pool_maxsize=20,
-                    timeout=30.0
-                )
-                logger.info("Pool de conexões httpx ativado para FindFace")
-                # Usa wrapper ao invés do cliente original
-                findface_client = findface_async_wrapper
-            except Exception as e:
-                logger.warning(f"Erro ao criar pool async: {e}. Usando cliente padrão.")
         except Exception as e:
             logger.warning(f"Erro ao conectar ao FindFace: {e}")
             logger.warning("Continuando sem FindFace...")
@@ -99,7 +82,10 @@ def main():
         try:
             camera_repository = CameraRepositoryFindface(
                 findface_client=findface_client,
-                camera_prefix=settings.camera.prefix
+                camera_prefix=settings.camera.prefix,
+                cache_file=settings.camera.cache_file,
+                discovery_workers=settings.camera.discovery_workers,
+                page_size=settings.camera.discovery_page_size
             )
         except Exception as e:
             logger.error(f"Erro ao criar repositório de câmeras: {e}", exc_info=True)
@@ -154,16 +140,8 @@ def main():
                     logger.error(f"Erro ao parar orquestrador durante tratamento de erro: {stop_error}", exc_info=True)
         return 1
     finally:
-        # Fecha pool de conexões
-        if findface_async_wrapper:
-            try:
-                findface_async_wrapper.close()
-            except:
-                pass
-        
-        # Faz logout do FindFace (se for o cliente original, não o wrapper)
-        if findface_client and not isinstance(findface_client, FindfaceMultiAsync):
-            # É o cliente original, pode fazer logout
+        # Faz logout do FindFace e fecha o pool de conexões
+        if findface_client:
             try:
                 findface_client.logout()
                 if async_logger:
@@ -171,13 +149,8 @@ def main():
                     logger.info("Logout do FindFace realizado")
             except:
                 pass
-        elif isinstance(findface_client, FindfaceMultiAsync):
-            # É o wrapper, fazer logout do cliente interno
             try:
-                findface_client.client.logout()
-                if async_logger:
-                    logger = async_logger.get_logger(__name__)
-                    logger.info("Logout do FindFace realizado")
+                findface_client.close()
             except:
                 pass
         
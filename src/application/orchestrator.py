@@ -4,22 +4,32 @@ Gerencia threads, filas e coordena os Use Cases.
 """
 
 import logging
+import queue
 import signal
 import threading
+import time
 from typing import List, Dict
 from threading import Event as ThreadEvent
 
 from src.domain.entities import Camera
 from src.domain.repositories import CameraRepository
-from src.infrastructure.clients import FindfaceMulti
+from src.infrastructure.clients import FindfaceMulti, FindfaceAsyncClient, AdaptiveConcurrencyLimiter
 from src.infrastructure.config.settings import AppSettings
+from src.infrastructure.capture import SnapshotSampler
+from src.infrastructure.imaging import JpegEncoderPool, EncodedFrameCache
 from src.infrastructure.memory import MemoryManager
-from src.application.queues import FrameQueue, EventQueue, FindfaceQueue
+from src.infrastructure.outbox import DiskOutbox
+from src.application.queues import FrameQueue, EventQueue, FindfaceQueue, PriorityFindfaceQueue
+from src.application.services.track_region_registry import TrackRegionRegistry
+from src.application.services.findface_payload_builder import FindfacePayloadBuilder
+from src.application.services.findface_event_coalescer import FindfaceEventCoalescer
 from src.application.use_cases import (
     StreamCameraUseCase,
     DetectFacesUseCase,
     ManageTracksUseCase,
     SendToFindfaceUseCase,
+    SendToFindfaceAsyncUseCase,
+    ReplayOutboxUseCase,
     DisplayCameraUseCase
 )
 from src.application.display.circular_buffer import CircularBuffer
@@ -57,7 +67,70 @@ class ApplicationOrchestrator:
         # Filas
         self.frame_queue = FrameQueue(maxsize=settings.queues.frame_queue_max_size)
         self.event_queue = EventQueue(maxsize=settings.queues.event_queue_max_size)
-        self.findface_queue = FindfaceQueue(maxsize=settings.queues.findface_queue_max_size)
+        if settings.queues.findface_priority:
+            self.findface_queue = PriorityFindfaceQueue(
+                maxsize=settings.queues.findface_queue_max_size,
+                quality_weight=settings.queues.findface_quality_weight,
+                age_weight=settings.queues.findface_age_weight,
+                max_age_seconds=settings.queues.findface_max_age_seconds,
+                on_evict=self._on_findface_event_evicted
+            )
+        else:
+            self.findface_queue = FindfaceQueue(maxsize=settings.queues.findface_queue_max_size)
+        
+        # Registro de regiões de tracks (re-detecção por ROI, opcional)
+        self.track_region_registry: TrackRegionRegistry = None
+        if settings.roi_detection.enabled:
+            self.track_region_registry = TrackRegionRegistry(settings.roi_detection)
+        
+        # Sender assíncrono do FindFace (findface_sender.mode = "asyncio")
+        self.findface_async_sender: SendToFindfaceAsyncUseCase = None
+        
+        # Limitador adaptativo de uploads ao FindFace (opcional)
+        self.findface_limiter: AdaptiveConcurrencyLimiter = None
+        
+        # Pool de codificação JPEG dos frames enviados (independente dos uploads)
+        self.jpeg_encoder_pool = JpegEncoderPool(
+            workers=settings.findface_sender.encode_workers,
+            quality=settings.findface_sender.jpeg_quality,
+            backend=settings.findface_sender.jpeg_backend
+        )
+        
+        # Cache de frames codificados, compartilhado pelos senders (opcional)
+        self.jpeg_cache: EncodedFrameCache = None
+        if settings.findface_sender.jpeg_cache_mb > 0:
+            self.jpeg_cache = EncodedFrameCache(max_bytes=settings.findface_sender.jpeg_cache_mb * 1024 * 1024)
+        
+        # Montagem do payload (modo de upload), compartilhada por senders e outbox
+        self.payload_builder = FindfacePayloadBuilder(
+            encoder=self.jpeg_encoder_pool,
+            upload_mode=settings.findface_sender.upload_mode,
+            crop_margin=settings.findface_sender.crop_margin,
+            downscale_max_side=settings.findface_sender.downscale_max_side,
+            frame_cache=self.jpeg_cache
+        )
+        
+        # Agrupamento de faces do mesmo frame em um envio (opcional)
+        self.findface_coalescer: FindfaceEventCoalescer = None
+        if settings.findface_sender.coalesce_window > 0:
+            self.findface_coalescer = FindfaceEventCoalescer(
+                window=settings.findface_sender.coalesce_window,
+                max_group_size=settings.findface_sender.coalesce_max_faces
+            )
+        
+        # Outbox em disco para eventos não enviados (opcional)
+        self.outbox: DiskOutbox = None
+        if settings.outbox.enabled:
+            self.outbox = DiskOutbox(
+                directory=settings.outbox.directory,
+                segment_max_bytes=settings.outbox.segment_max_mb * 1024 * 1024,
+                max_bytes=settings.outbox.max_disk_mb * 1024 * 1024,
+                max_age_seconds=settings.outbox.max_age_seconds,
+                fsync=settings.outbox.fsync
+            )
+        # Eventos descartados da fila por prioridade, gravados na outbox pela
+        # thread OutboxSpill (fora da thread do tracker, que os descarta)
+        self._evicted_events: queue.Queue = queue.Queue(maxsize=settings.queues.findface_queue_max_size)
         
         # Threads
         self.threads: List[threading.Thread] = []
@@ -65,10 +138,21 @@ class ApplicationOrchestrator:
         # Câmeras ativas
         self.cameras: List[Camera] = []
         
+        # Streams de câmeras em execução (por camera_id), com parada individual
+        self.camera_streams: Dict[str, StreamCameraUseCase] = {}
+        self.camera_stop_events: Dict[str, ThreadEvent] = {}
+        self.camera_threads: List[threading.Thread] = []
+        self._camera_threads_by_id: Dict[str, threading.Thread] = {}
+        self._cameras_lock = threading.Lock()
+        self._stream_recycles = 0
+        # Amostradores do stream principal (dual stream), por ID da câmera
+        self.snapshot_samplers: Dict[int, SnapshotSampler] = {}
+        
         # Display (opcional)
         self.display_buffers: Dict[str, CircularBuffer] = {}
         self.display_service: DisplayService = None
         self.display_threads: List[threading.Thread] = []
+        self.display_use_cases: Dict[str, DisplayCameraUseCase] = {}
         
         # Registra handlers de sinal
         self._register_signal_handlers()
@@ -121,11 +205,34 @@ class ApplicationOrchestrator:
             if self.settings.display.exibir_na_tela:
                 self._start_display_workers()
             
+            # Inicia watchdog de leituras travadas nos streams
+            if self.settings.camera.stall_timeout > 0:
+                self._start_stream_watchdog()
+            
+            # Inicia reconciliação de câmeras (adição/remoção sem reiniciar)
+            if self.settings.camera.reconcile_interval > 0:
+                self._start_camera_reconciler()
+            
             self.logger.info("Aplicação iniciada com sucesso!")
             self.logger.info(f"- {len(self.cameras)} câmeras ativas")
             self.logger.info(f"- {self.settings.workers.detection_workers} workers de detecção (frame_queue)")
+            if self.track_region_registry is not None:
+                self.logger.info(
+                    f"- Re-detecção por ROI ativa (frame completo a cada "
+                    f"{self.settings.roi_detection.full_frame_interval} frames)"
+                )
             self.logger.info(f"- {self.settings.workers.track_workers} workers de gerenciamento de tracks (event_queue)")
-            self.logger.info(f"- {self.settings.workers.findface_workers} workers de envio ao FindFace (findface_queue)")
+            if self.findface_async_sender is not None:
+                self.logger.info(
+                    f"- Envio assíncrono ao FindFace (até {self.settings.findface_sender.max_in_flight} uploads simultâneos)"
+                )
+            else:
+                self.logger.info(f"- {self.settings.workers.findface_workers} workers de envio ao FindFace (findface_queue)")
+            self.logger.info(
+                f"- {self.jpeg_encoder_pool.workers} threads de codificação JPEG "
+                f"({self.jpeg_encoder_pool.backend}, qualidade {self.jpeg_encoder_pool.quality}, "
+                f"upload {self.payload_builder.upload_mode})"
+            )
             if self.settings.display.exibir_na_tela:
                 self.logger.info(f"- {len(self.display_threads)} workers de display visual (1 por câmera)")
             self.logger.info(f"- {len(self.threads) + len(self.display_threads)} threads totais em execução")
@@ -229,7 +336,9 @@ class ApplicationOrchestrator:
                         display_config=self.settings.display,
                         display_buffers=self.display_buffers,
                         shared_model=detection_model,  # Modelo compartilhado
-                        queue_timeout=self.settings.workers.timeout
+                        queue_timeout=self.settings.workers.timeout,
+                        roi_config=self.settings.roi_detection,
+                        track_region_registry=self.track_region_registry
                     )
                     
                     def worker_wrapper(use_case, worker_id):
@@ -269,7 +378,12 @@ class ApplicationOrchestrator:
                         tracking_config=self.settings.tracking,
                         track_config=self.settings.track,
                         stop_event=self.stop_event,
-                        queue_timeout=self.settings.workers.timeout
+                        queue_timeout=self.settings.workers.timeout,
+                        track_region_registry=self.track_region_registry,
+                        outbox=self.outbox,
+                        payload_builder=self.payload_builder,
+                        snapshot_samplers=self.snapshot_samplers,
+                        snapshot_max_skew=self.settings.camera.snapshot_max_skew
                     )
                     
                     def worker_wrapper(use_case, worker_id):
@@ -295,19 +409,62 @@ class ApplicationOrchestrator:
             self.logger.error(f"Erro ao iniciar gerenciadores de tracks: {e}", exc_info=True)
             raise
     
+    def _create_findface_limiter(self, max_limit: int) -> AdaptiveConcurrencyLimiter:
+        """
+        Cria o limitador adaptativo de uploads, se habilitado.
+        
+        :param max_limit: Teto de concorrência do modo de envio em uso.
+        :return: Limitador ou None.
+        """
+        sender_config = self.settings.findface_sender
+        if not sender_config.adaptive_concurrency:
+            return None
+        
+        self.findface_limiter = AdaptiveConcurrencyLimiter(
+            min_limit=sender_config.min_concurrency,
+            max_limit=max_limit,
+            initial_limit=sender_config.initial_concurrency,
+            latency_target=sender_config.latency_target,
+            backoff_factor=sender_config.backoff_factor
+        )
+        self.logger.info(
+            f"  - Concorrência adaptativa ao FindFace: {self.findface_limiter.limit} inicial, "
+            f"{self.findface_limiter.min_limit}-{self.findface_limiter.max_limit}"
+        )
+        return self.findface_limiter
+    
     def _start_findface_workers(self):
         """Inicia workers de envio ao FindFace."""
+        if self.outbox is not None:
+            self._start_outbox_replay()
+            if isinstance(self.findface_queue, PriorityFindfaceQueue):
+                self._start_eviction_spill()
+        
+        if self.settings.findface_sender.mode == "asyncio":
+            try:
+                self._start_async_findface_sender()
+                return
+            except ImportError as e:
+                self.logger.warning(f"Envio assíncrono indisponível ({e}). Usando workers em threads.")
+        
         num_workers = self.settings.workers.findface_workers
         self.logger.info(f"Iniciando {num_workers} workers de envio ao FindFace...")
         
         try:
+            limiter = self._create_findface_limiter(max_limit=num_workers)
+            
             for i in range(num_workers):
                 try:
                     use_case = SendToFindfaceUseCase(
                         findface_queue=self.findface_queue,
                         findface_client=self.findface_client,
                         stop_event=self.stop_event,
-                        queue_timeout=self.settings.workers.timeout
+                        queue_timeout=self.settings.workers.timeout,
+                        limiter=limiter,
+                        outbox=self.outbox,
+                        encode_pool=self.jpeg_encoder_pool,
+                        payload_builder=self.payload_builder,
+                        coalescer=self.findface_coalescer
                     )
                     
                     def worker_wrapper(use_case, worker_id):
@@ -333,89 +490,440 @@ class ApplicationOrchestrator:
             self.logger.error(f"Erro ao iniciar workers de FindFace: {e}", exc_info=True)
             raise
     
+    def _start_outbox_replay(self):
+        """Inicia a thread de reenvio da outbox em disco."""
+        use_case = ReplayOutboxUseCase(
+            outbox=self.outbox,
+            findface_client=self.findface_client,
+            stop_event=self.stop_event,
+            idle_interval=self.settings.outbox.replay_idle_interval,
+            max_backoff=self.settings.outbox.replay_max_backoff
+        )
+        
+        def worker_wrapper(use_case):
+            """Wrapper para capturar exceções no reenvio da outbox."""
+            try:
+                use_case.execute()
+            except Exception as e:
+                self.logger.error(f"Erro no reenvio da outbox: {e}", exc_info=True)
+        
+        thread = threading.Thread(
+            target=worker_wrapper,
+            args=(use_case,),
+            name="OutboxReplay",
+            daemon=False
+        )
+        thread.start()
+        self.threads.append(thread)
+        self.logger.info(f"  - Reenvio da outbox iniciado ({len(self.outbox)} eventos pendentes)")
+    
+    def _start_eviction_spill(self):
+        """Inicia a thread que grava na outbox os eventos descartados da fila por prioridade."""
+        def spill_loop():
+            """Grava os eventos descartados até a parada (o restante fica para stop())."""
+            while not self.stop_event.is_set():
+                try:
+                    event = self._evicted_events.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self._spill_evicted_event(event)
+        
+        thread = threading.Thread(target=spill_loop, name="OutboxSpill", daemon=True)
+        thread.start()
+        self.threads.append(thread)
+    
+    def _on_findface_event_evicted(self, event):
+        """
+        Trata evento descartado da fila por prioridade para dar lugar a um melhor.
+        
+        Chamado na thread do tracker: apenas repassa o evento à thread
+        OutboxSpill, que codifica o JPEG e grava na outbox.
+        
+        :param event: Evento descartado.
+        """
+        event_id = event.id.value() if event.id else 'UNKNOWN'
+        if self.outbox is None:
+            self.logger.debug(f"Evento {event_id} descartado da fila do FindFace (menor prioridade)")
+            return
+        try:
+            self._evicted_events.put_nowait(event)
+        except queue.Full:
+            self.logger.warning(f"Gravação na outbox atrasada, evento {event_id} descartado da fila do FindFace")
+    
+    def _spill_evicted_event(self, event):
+        """
+        Grava na outbox um evento descartado da fila por prioridade.
+        
+        :param event: Evento descartado.
+        """
+        try:
+            metadata, data = FindfacePayloadBuilder.to_outbox_record(self.payload_builder.build(event), event)
+            self.outbox.append(metadata, data)
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar evento descartado na outbox: {e}")
+    
+    def _drain_findface_queue_to_outbox(self):
+        """Grava na outbox os eventos que ficaram na fila do FindFace na parada."""
+        while True:
+            try:
+                self._spill_evicted_event(self._evicted_events.get_nowait())
+            except queue.Empty:
+                break
+        
+        saved = 0
+        while True:
+            event = self.findface_queue.get(block=False)
+            if event is None:
+                break
+            try:
+                metadata, data = FindfacePayloadBuilder.to_outbox_record(self.payload_builder.build(event), event)
+                if self.outbox.append(metadata, data):
+                    saved += 1
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar evento na outbox: {e}")
+            finally:
+                self.findface_queue.task_done()
+        if saved:
+            self.logger.info(f"{saved} eventos não enviados gravados na outbox")
+    
+    def _start_async_findface_sender(self):
+        """Inicia o sender assíncrono (uma thread com event loop) do FindFace."""
+        sender_config = self.settings.findface_sender
+        self.logger.info(
+            f"Iniciando sender assíncrono do FindFace "
+            f"(max_in_flight={sender_config.max_in_flight}, http2={sender_config.http2})..."
+        )
+        
+        async_client = FindfaceAsyncClient(
+            self.findface_client,
+            max_connections=sender_config.max_in_flight,
+            timeout=sender_config.timeout,
+            http2=sender_config.http2
+        )
+        use_case = SendToFindfaceAsyncUseCase(
+            findface_queue=self.findface_queue,
+            async_client=async_client,
+            stop_event=self.stop_event,
+            queue_timeout=self.settings.workers.timeout,
+            max_in_flight=sender_config.max_in_flight,
+            encode_workers=sender_config.encode_workers,
+            limiter=self._create_findface_limiter(max_limit=sender_config.max_in_flight),
+            outbox=self.outbox,
+            encode_pool=self.jpeg_encoder_pool,
+            payload_builder=self.payload_builder,
+            coalescer=self.findface_coalescer
+        )
+        
+        def worker_wrapper(use_case):
+            """Wrapper para capturar exceções no sender assíncrono."""
+            try:
+                use_case.execute()
+            except Exception as e:
+                self.logger.error(f"Erro no sender assíncrono do FindFace: {e}", exc_info=True)
+        
+        self.findface_async_sender = use_case
+        thread = threading.Thread(
+            target=worker_wrapper,
+            args=(use_case,),
+            name="FindfaceAsyncSender",
+            daemon=False
+        )
+        thread.start()
+        self.threads.append(thread)
+        self.logger.info("  - Sender assíncrono do FindFace iniciado")
+    
     def _start_camera_streams(self):
         """Inicia streams de câmeras (uma thread por câmera)."""
         self.logger.info("Iniciando streams de câmeras...")
         
         try:
             for camera in self.cameras:
-                try:
-                    use_case = StreamCameraUseCase(
-                        camera=camera,
-                        frame_queue=self.frame_queue,
-                        camera_settings=self.settings.camera,
-                        performance_config=self.settings.performance,
-                        stop_event=self.stop_event
-                    )
-                    
-                    def worker_wrapper(use_case, camera_name):
-                        """Wrapper para capturar exceções em streams de câmera."""
-                        try:
-                            use_case.execute()
-                        except Exception as e:
-                            self.logger.error(f"Erro no stream da câmera {camera_name}: {e}", exc_info=True)
-                    
-                    thread = threading.Thread(
-                        target=worker_wrapper,
-                        args=(use_case, camera.camera_name.value()),
-                        name=f"Camera_{camera.camera_name.value()}",
-                        daemon=False
-                    )
-                    thread.start()
-                    self.threads.append(thread)
-                except Exception as e:
-                    self.logger.error(f"Erro ao criar stream para câmera {camera.camera_name.value()}: {e}", exc_info=True)
+                self._start_camera_stream(camera)
             
             self.logger.info(f"  - {len(self.cameras)} streams de câmeras iniciados")
         except Exception as e:
             self.logger.error(f"Erro ao iniciar streams de câmeras: {e}", exc_info=True)
             raise
     
+    def _start_camera_stream(self, camera: Camera):
+        """
+        Inicia o stream de uma câmera, com evento de parada próprio.
+        
+        :param camera: Câmera a iniciar.
+        """
+        camera_id = str(camera.camera_id.value())
+        try:
+            # Parada individual (reconciliação); stop() sinaliza todas
+            camera_stop_event = ThreadEvent()
+            use_case = StreamCameraUseCase(
+                camera=camera,
+                frame_queue=self.frame_queue,
+                camera_settings=self.settings.camera,
+                performance_config=self.settings.performance,
+                stop_event=camera_stop_event,
+                motion_gate_config=self.settings.motion_gate
+            )
+            self.camera_streams[camera_id] = use_case
+            self.camera_stop_events[camera_id] = camera_stop_event
+            if use_case.snapshot_sampler is not None:
+                self.snapshot_samplers[camera.camera_id.value()] = use_case.snapshot_sampler
+            
+            def worker_wrapper(use_case, camera_name):
+                """Wrapper para capturar exceções em streams de câmera."""
+                try:
+                    use_case.execute()
+                except Exception as e:
+                    self.logger.error(f"Erro no stream da câmera {camera_name}: {e}", exc_info=True)
+            
+            # Daemon: um read() travado no backend RTSP não pode segurar o processo
+            thread = threading.Thread(
+                target=worker_wrapper,
+                args=(use_case, camera.camera_name.value()),
+                name=f"Camera_{camera.camera_name.value()}",
+                daemon=True
+            )
+            thread.start()
+            self.camera_threads.append(thread)
+            self._camera_threads_by_id[camera_id] = thread
+        except Exception as e:
+            self.logger.error(f"Erro ao criar stream para câmera {camera.camera_name.value()}: {e}", exc_info=True)
+    
+    def _stop_camera_stream(self, camera_id: str, abandon: bool = False):
+        """
+        Sinaliza a parada do stream de uma câmera (a thread termina sozinha).
+        
+        :param camera_id: ID da câmera (string).
+        :param abandon: Não aguarda a thread na parada (leitura travada).
+        """
+        camera_stop_event = self.camera_stop_events.pop(camera_id, None)
+        if camera_stop_event is not None:
+            camera_stop_event.set()
+        use_case = self.camera_streams.pop(camera_id, None)
+        if use_case is not None:
+            self.snapshot_samplers.pop(use_case.camera.camera_id.value(), None)
+            if abandon:
+                use_case.abandon()
+        thread = self._camera_threads_by_id.pop(camera_id, None)
+        if abandon and thread in self.camera_threads:
+            self.camera_threads.remove(thread)
+    
+    def _start_stream_watchdog(self):
+        """Inicia a thread que recicla streams com leitura travada."""
+        stall_timeout = self.settings.camera.stall_timeout
+        summary_interval = 60.0
+        
+        def watchdog_loop():
+            """Verifica os streams a cada segundo e resume a disponibilidade periodicamente."""
+            last_summary = time.monotonic()
+            while not self.stop_event.wait(1.0):
+                try:
+                    self._recycle_stalled_streams(stall_timeout)
+                except Exception as e:
+                    self.logger.error(f"Erro no watchdog de streams: {e}", exc_info=True)
+                
+                if time.monotonic() - last_summary >= summary_interval:
+                    last_summary = time.monotonic()
+                    stats = self.get_camera_stream_stats()
+                    disconnected = [name for name, s in stats.items() if not s["connected"]]
+                    if disconnected:
+                        self.logger.warning(
+                            f"Streams conectados: {len(stats) - len(disconnected)}/{len(stats)} "
+                            f"(desconectados: {', '.join(disconnected)})"
+                        )
+        
+        thread = threading.Thread(target=watchdog_loop, name="StreamWatchdog", daemon=False)
+        thread.start()
+        self.threads.append(thread)
+        self.logger.info(f"  - Watchdog de streams ativo (leitura travada > {stall_timeout:.0f}s)")
+    
+    def _recycle_stalled_streams(self, stall_timeout: float):
+        """
+        Substitui streams cujo read() está bloqueado além de stall_timeout.
+        
+        A thread travada é abandonada (sai quando o read retornar e libera a
+        captura); um novo stream com captura nova assume a câmera na hora.
+        
+        :param stall_timeout: Segundos de leitura bloqueada tolerados.
+        """
+        with self._cameras_lock:
+            if self.stop_event.is_set():
+                return
+            for camera_id, use_case in list(self.camera_streams.items()):
+                stalled_for = use_case.read_stalled_for()
+                if stalled_for <= stall_timeout:
+                    continue
+                camera = use_case.camera
+                self.logger.warning(
+                    f"Leitura da câmera {camera.camera_name.value()} travada há {stalled_for:.0f}s; "
+                    f"recriando o stream"
+                )
+                self._stop_camera_stream(camera_id, abandon=True)
+                self._start_camera_stream(camera)
+                self._stream_recycles += 1
+    
     def _start_display_workers(self):
         """Inicia workers de display visual (um por câmera)."""
         self.logger.info("Iniciando workers de display visual...")
         
         try:
             for camera in self.cameras:
-                try:
-                    camera_id = str(camera.camera_id.value())  # Converte para string para consistência
-                    buffer = self.display_buffers[camera_id]
-                    
-                    use_case = DisplayCameraUseCase(
-                        camera_id=camera_id,
-                        buffer=buffer,
-                        display_service=self.display_service,
-                        config=self.settings.display
-                    )
-                    
-                    def worker_wrapper(use_case, camera_name):
-                        """Wrapper para capturar exceções em workers de display."""
-                        try:
-                            use_case.run()
-                        except Exception as e:
-                            self.logger.warning(f"Erro no display da câmera {camera_name}: {e}")
-                    
-                    thread = threading.Thread(
-                        target=worker_wrapper,
-                        args=(use_case, camera.camera_name.value()),
-                        name=f"Display_{camera.camera_name.value()}",
-                        daemon=True  # Display pode ser interrompido a qualquer momento
-                    )
-                    thread.start()
-                    self.display_threads.append(thread)
-                except Exception as e:
-                    self.logger.warning(f"Erro ao criar display para câmera {camera.camera_name.value()}: {e}")
+                self._start_display_worker(camera)
             
             self.logger.info(f"  - {len(self.display_threads)} workers de display iniciados")
         except Exception as e:
             self.logger.warning(f"Erro ao iniciar workers de display: {e}")
     
+    def _start_display_worker(self, camera: Camera):
+        """
+        Inicia o worker de display de uma câmera (cria o buffer se necessário).
+        
+        :param camera: Câmera a exibir.
+        """
+        try:
+            camera_id = str(camera.camera_id.value())  # Converte para string para consistência
+            buffer = self.display_buffers.setdefault(camera_id, CircularBuffer(max_size=5))
+            
+            use_case = DisplayCameraUseCase(
+                camera_id=camera_id,
+                buffer=buffer,
+                display_service=self.display_service,
+                config=self.settings.display
+            )
+            self.display_use_cases[camera_id] = use_case
+            
+            def worker_wrapper(use_case, camera_name):
+                """Wrapper para capturar exceções em workers de display."""
+                try:
+                    use_case.run()
+                except Exception as e:
+                    self.logger.warning(f"Erro no display da câmera {camera_name}: {e}")
+            
+            thread = threading.Thread(
+                target=worker_wrapper,
+                args=(use_case, camera.camera_name.value()),
+                name=f"Display_{camera.camera_name.value()}",
+                daemon=True  # Display pode ser interrompido a qualquer momento
+            )
+            thread.start()
+            self.display_threads.append(thread)
+        except Exception as e:
+            self.logger.warning(f"Erro ao criar display para câmera {camera.camera_name.value()}: {e}")
+    
+    def _stop_display_worker(self, camera_id: str):
+        """
+        Para o display de uma câmera e descarta seu buffer.
+        
+        :param camera_id: ID da câmera (string).
+        """
+        use_case = self.display_use_cases.pop(camera_id, None)
+        if use_case is not None:
+            use_case.stop()
+        self.display_buffers.pop(camera_id, None)
+    
+    def _start_camera_reconciler(self):
+        """Inicia a thread que sincroniza as câmeras em execução com o repositório."""
+        interval = self.settings.camera.reconcile_interval
+        
+        def reconcile_loop():
+            """Reconcilia periodicamente até a parada."""
+            while not self.stop_event.wait(interval):
+                try:
+                    self._reconcile_cameras()
+                except Exception as e:
+                    self.logger.error(f"Erro na reconciliação de câmeras: {e}", exc_info=True)
+        
+        thread = threading.Thread(target=reconcile_loop, name="CameraReconciler", daemon=False)
+        thread.start()
+        self.threads.append(thread)
+        self.logger.info(f"  - Reconciliação de câmeras a cada {interval:.0f}s")
+    
+    def _reconcile_cameras(self):
+        """
+        Compara as câmeras ativas do repositório com as em execução e inicia,
+        para ou reinicia (fonte/token alterados) apenas as que mudaram.
+        
+        Modelos, filas e tracks das demais câmeras não são tocados. Uma lista
+        vazia (FindFace fora, por exemplo) é ignorada para não derrubar tudo.
+        """
+        cameras = self.camera_repository.get_active_cameras()
+        if not cameras:
+            self.logger.warning("Reconciliação de câmeras: nenhuma câmera retornada; mantendo as atuais")
+            return
+        
+        with self._cameras_lock:
+            if self.stop_event.is_set():
+                return
+            
+            desired = {str(camera.camera_id.value()): camera for camera in cameras}
+            running = {str(camera.camera_id.value()): camera for camera in self.cameras}
+            removed = [cid for cid in running if cid not in desired]
+            added = [cid for cid in desired if cid not in running]
+            changed = [
+                cid for cid in desired
+                if cid in running and desired[cid].to_dict() != running[cid].to_dict()
+            ]
+            if not (removed or added or changed):
+                return
+            
+            display = self.settings.display.exibir_na_tela
+            for camera_id in removed + changed:
+                self._stop_camera_stream(camera_id)
+                if display:
+                    self._stop_display_worker(camera_id)
+                if camera_id in removed and self.track_region_registry is not None:
+                    self.track_region_registry.remove_camera(running[camera_id].camera_id.value())
+            
+            for camera_id in changed + added:
+                if display:
+                    self._start_display_worker(desired[camera_id])
+                self._start_camera_stream(desired[camera_id])
+            
+            self.cameras = list(desired.values())
+            
+            # Descarta referências a threads de câmeras já finalizadas
+            self.camera_threads = [t for t in self.camera_threads if t.is_alive()]
+            self.display_threads = [t for t in self.display_threads if t.is_alive()]
+        
+        def names(camera_ids, source):
+            return ", ".join(source[cid].camera_name.value() for cid in camera_ids)
+        
+        if added:
+            self.logger.info(f"Câmeras adicionadas: {names(added, desired)}")
+        if removed:
+            self.logger.info(f"Câmeras removidas: {names(removed, running)}")
+        if changed:
+            self.logger.info(f"Câmeras reiniciadas (configuração alterada): {names(changed, desired)}")
+    
+    def get_motion_gate_stats(self) -> Dict[str, dict]:
+        """
+        Retorna o estado do portão de movimento de cada câmera.
+        
+        :return: Dicionário {nome_da_câmera: estatísticas}.
+        """
+        return {
+            use_case.camera.camera_name.value(): use_case.motion_gate.get_stats()
+            for use_case in self.camera_streams.values()
+            if use_case.motion_gate is not None
+        }
+    
+    def get_camera_stream_stats(self) -> Dict[str, dict]:
+        """
+        Retorna disponibilidade e estado da conexão de cada câmera.
+        
+        :return: Dicionário {nome_da_câmera: estatísticas}.
+        """
+        return {
+            use_case.camera.camera_name.value(): use_case.get_stats()
+            for use_case in list(self.camera_streams.values())
+        }
+    
     def wait(self):
         """Aguarda todas as threads finalizarem."""
         self.logger.info("Aguardando threads finalizarem...")
         
         try:
-            for thread in self.threads:
+            # Threads de câmera podem ser criadas pela reconciliação: aguardadas por último
+            for thread in self.threads + list(self.camera_threads):
                 # Usa join com timeout para permitir KeyboardInterrupt
                 while thread.is_alive():
                     thread.join(timeout=0.5)
@@ -434,8 +942,11 @@ class ApplicationOrchestrator:
         self.logger.info("PARANDO APLICAÇÃO...")
         self.logger.info("=" * 80)
         
-        # Sinaliza parada
-        self.stop_event.set()
+        # Sinaliza parada (inclusive aos streams de cada câmera)
+        with self._cameras_lock:
+            self.stop_event.set()
+            for camera_stop_event in self.camera_stop_events.values():
+                camera_stop_event.set()
         
         # Aguarda filas serem processadas
         self._wait_for_queues()
@@ -443,9 +954,44 @@ class ApplicationOrchestrator:
         # Aguarda threads
         self.wait()
         
+        # Eventos que não chegaram a ser enviados ficam na outbox para o próximo início
+        if self.outbox is not None:
+            self._drain_findface_queue_to_outbox()
+            self.logger.info(f"Estatísticas da outbox: {self.outbox.get_stats()}")
+            self.outbox.close()
+        
+        self.logger.info(f"Codificação JPEG: {self.jpeg_encoder_pool.get_stats()}")
+        if isinstance(self.findface_queue, PriorityFindfaceQueue):
+            self.logger.info(f"Fila do FindFace por prioridade: {self.findface_queue.get_stats()}")
+        if self.findface_coalescer is not None:
+            self.logger.info(f"Agrupamento de faces por frame: {self.findface_coalescer.get_stats()}")
+        if self.jpeg_cache is not None:
+            self.logger.info(f"Cache de JPEG: {self.jpeg_cache.get_stats()}")
+            self.jpeg_cache.clear()
+        self.jpeg_encoder_pool.shutdown()
+        
         # Para o gerenciador de memória
         self.memory_manager.stop()
         
+        if self.track_region_registry is not None:
+            self.logger.info(f"Estatísticas de ROI: {self.track_region_registry.get_stats()}")
+        
+        if self.findface_limiter is not None:
+            self.logger.info(f"Concorrência adaptativa do FindFace: {self.findface_limiter.get_stats()}")
+        if hasattr(self.findface_client, "acquire_node"):
+            self.logger.info(f"Balanceamento entre nós do FindFace: {self.findface_client.get_stats()}")
+        breaker = getattr(self.findface_client, "circuit_breaker", None)
+        if breaker is not None:
+            self.logger.info(f"Circuit breaker do FindFace: {breaker.get_stats()}")
+        
+        for camera_name, stats in self.get_motion_gate_stats().items():
+            self.logger.info(f"Portão de movimento {camera_name}: {stats}")
+        
+        for camera_name, stats in self.get_camera_stream_stats().items():
+            self.logger.info(f"Stream {camera_name}: {stats}")
+        if self._stream_recycles:
+            self.logger.info(f"Streams recriados pelo watchdog: {self._stream_recycles}")
+        
         self.logger.info("=" * 80)
         self.logger.info("APLICAÇÃO FINALIZADA")
         self.logger.info("=" * 80)
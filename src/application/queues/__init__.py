@@ -5,5 +5,6 @@ Filas thread-safe para comunicação entre componentes.
 from .frame_queue import FrameQueue
 from .event_queue import EventQueue
 from .findface_queue import FindfaceQueue
+from .priority_findface_queue import PriorityFindfaceQueue, EventExpiredError
 
-__all__ = ["FrameQueue", "EventQueue", "FindfaceQueue"]
+__all__ = ["FrameQueue", "EventQueue", "FindfaceQueue", "PriorityFindfaceQueue", "EventExpiredError"]
@@ -0,0 +1,216 @@
+"""
+Fila do FindFace ordenada por prioridade (qualidade da face e idade do evento).
+"""
+
+import bisect
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.domain.entities import Event
+from .findface_queue import FindfaceQueue
+
+
+class EventExpiredError(Exception):
+    """Evento recusado pela fila por ter passado da idade máxima de envio."""
+
+
+class PriorityFindfaceQueue(FindfaceQueue):
+    """
+    Fila limitada que entrega primeiro os eventos mais úteis.
+
+    Prioridade = quality_weight * qualidade - age_weight * idade (s). Como a
+    idade cresce igualmente para todos os eventos, a ordem relativa não muda
+    com o tempo: a chave é calculada uma vez, a partir do timestamp do frame.
+
+    Com a fila cheia, o evento de menor prioridade é descartado (o novo, se
+    for ele o menor). Eventos mais velhos que max_age_seconds são descartados
+    sem envio; put() sinaliza esse caso com EventExpiredError, para que o
+    chamador não os grave na outbox. Fora isso, mesma interface de
+    FindfaceQueue (put/get/task_done/join).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        quality_weight: float = 1.0,
+        age_weight: float = 0.02,
+        max_age_seconds: float = 0.0,
+        on_evict: Optional[Callable[[Event], None]] = None
+    ):
+        """
+        Inicializa a fila.
+
+        :param maxsize: Tamanho máximo da fila.
+        :param quality_weight: Peso da qualidade da face (0-1).
+        :param age_weight: Penalidade por segundo de idade do evento.
+        :param max_age_seconds: Idade máxima para envio (0 = sem limite).
+        :param on_evict: Chamado com o evento descartado por falta de espaço (fora do lock).
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.quality_weight = float(quality_weight)
+        self.age_weight = float(age_weight)
+        self.max_age_seconds = float(max_age_seconds)
+        self.on_evict = on_evict
+
+        self.logger = logging.getLogger(__name__)
+
+        # Itens (chave, seq, evento) em ordem crescente de prioridade
+        self._items: List[Tuple[float, int, Event]] = []
+        self._seq = itertools.count()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._all_tasks_done = threading.Condition(self._mutex)
+        self._unfinished_tasks = 0
+
+        # Estatísticas
+        self._evicted = 0
+        self._rejected = 0
+        self._expired = 0
+
+    def _priority(self, event: Event) -> float:
+        """Chave estática de prioridade (maior = enviado antes)."""
+        quality = event.face_quality_score.value() if event.face_quality_score else 0.0
+        # Instante de captura no relógio monotônico (imune a ajustes do relógio de parede)
+        now = time.monotonic()
+        captured_at = now - event.frame.timestamp.age_seconds() if event.frame and event.frame.timestamp else now
+        # -age_weight * (agora - captured_at) = age_weight * captured_at + constante
+        return self.quality_weight * quality + self.age_weight * captured_at
+
+    def _is_expired(self, event: Event) -> bool:
+        """Verifica se o evento passou da idade máxima."""
+        if self.max_age_seconds <= 0 or not event.frame or not event.frame.timestamp:
+            return False
+        return event.frame.timestamp.age_seconds() > self.max_age_seconds
+
+    def _discard_locked(self, count: int = 1) -> None:
+        """Dá baixa em itens descartados sem passar por get() (lock já adquirido)."""
+        self._unfinished_tasks -= count
+        if self._unfinished_tasks <= 0:
+            self._unfinished_tasks = 0
+            self._all_tasks_done.notify_all()
+
+    def _purge_expired_locked(self) -> int:
+        """Remove eventos vencidos (lock já adquirido)."""
+        if self.max_age_seconds <= 0:
+            return 0
+        kept = [item for item in self._items if not self._is_expired(item[2])]
+        expired = len(self._items) - len(kept)
+        if expired:
+            self._items = kept
+            self._expired += expired
+            self._discard_locked(expired)
+        return expired
+
+    def put(self, event: Event, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Adiciona um evento à fila (nunca bloqueia).
+
+        Com a fila cheia, descarta o evento de menor prioridade; se o menor
+        for o próprio evento novo, ele é recusado.
+
+        :param event: Evento (melhor face do track) a ser enviado ao FindFace.
+        :param block: Ignorado (mantido pela compatibilidade com FindfaceQueue).
+        :param timeout: Ignorado.
+        :return: True se adicionado, False se recusado (fila cheia de eventos de maior prioridade).
+        :raises EventExpiredError: Se o evento já passou de max_age_seconds.
+        """
+        evicted = None
+        key = self._priority(event)
+
+        with self._mutex:
+            if self._is_expired(event):
+                self._expired += 1
+                raise EventExpiredError(
+                    f"Evento {event.id.value() if event.id else 'UNKNOWN'} mais velho que {self.max_age_seconds:g}s"
+                )
+
+            if len(self._items) >= self.maxsize:
+                self._purge_expired_locked()
+
+            if len(self._items) >= self.maxsize:
+                if key <= self._items[0][0]:
+                    self._rejected += 1
+                    return False
+                evicted = self._items.pop(0)[2]
+                self._evicted += 1
+                self._discard_locked()
+
+            bisect.insort(self._items, (key, next(self._seq), event))
+            self._unfinished_tasks += 1
+            self._not_empty.notify()
+
+        if evicted is not None and self.on_evict is not None:
+            try:
+                self.on_evict(evicted)
+            except Exception as e:
+                self.logger.error(f"Erro ao tratar evento descartado da fila do FindFace: {e}", exc_info=True)
+        return True
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Optional[Event]:
+        """
+        Remove e retorna o evento de maior prioridade.
+
+        :param block: Se True, bloqueia até ter item disponível.
+        :param timeout: Timeout em segundos (None = infinito).
+        :return: Evento ou None se fila vazia.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._not_empty:
+            while True:
+                self._purge_expired_locked()
+                if self._items:
+                    return self._items.pop()[2]
+                if not block:
+                    return None
+                if deadline is None:
+                    self._not_empty.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    self._not_empty.wait(remaining)
+
+    def qsize(self) -> int:
+        """Retorna o tamanho da fila."""
+        with self._mutex:
+            return len(self._items)
+
+    def empty(self) -> bool:
+        """Verifica se a fila está vazia."""
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """Verifica se a fila está cheia."""
+        return self.qsize() >= self.maxsize
+
+    def task_done(self):
+        """Indica que uma tarefa foi concluída."""
+        with self._all_tasks_done:
+            if self._unfinished_tasks <= 0:
+                raise ValueError("task_done() chamado mais vezes que o número de itens")
+            self._discard_locked()
+
+    def join(self):
+        """Bloqueia até que todos os itens sejam processados."""
+        with self._all_tasks_done:
+            while self._unfinished_tasks:
+                self._all_tasks_done.wait()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da fila.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._mutex:
+            return {
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+                "evicted": self._evicted,
+                "rejected": self._rejected,
+                "expired": self._expired
+            }
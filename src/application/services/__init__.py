@@ -3,5 +3,10 @@ Serviços da camada de aplicação.
 """
 
 from .landmark_detection_service import LandmarkDetectionService
+from .track_region_registry import TrackRegionRegistry
+from .motion_gate import MotionGate
+from .findface_payload_builder import FindfacePayloadBuilder
+from .findface_event_coalescer import FindfaceEventCoalescer
 
-__all__ = ["LandmarkDetectionService"]
+__all__ = ["LandmarkDetectionService", "TrackRegionRegistry", "MotionGate", "FindfacePayloadBuilder",
+           "FindfaceEventCoalescer"]
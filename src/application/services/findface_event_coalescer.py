@@ -0,0 +1,150 @@
+"""
+Agrupamento de eventos do mesmo frame em um único envio ao FindFace.
+
+Em cenas com muitas pessoas, vários tracks terminam com o melhor evento no
+mesmo frame. Em vez de um upload por face (mf_selector="biggest" + roi),
+os eventos do mesmo frame recebidos dentro de uma janela curta são enviados
+juntos: uma imagem, mf_selector="all" e roi cobrindo todas as faces.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Optional
+
+from src.domain.entities import Event
+
+
+class FindfaceEventCoalescer:
+    """
+    Buffer thread-safe de eventos agrupados por frame, compartilhado pelos senders.
+
+    Cada evento fica retido por até `window` segundos (contados a partir do
+    primeiro evento do frame); grupos prontos são retirados com pop_ready().
+    """
+
+    def __init__(self, window: float = 0.3, max_group_size: int = 16):
+        """
+        Inicializa o agrupador.
+
+        :param window: Tempo máximo (s) que um frame aguarda outras faces.
+        :param max_group_size: Máximo de faces por envio (grupo cheio sai na hora).
+        """
+        self.window = max(0.0, float(window))
+        self.max_group_size = max(1, int(max_group_size))
+
+        self._lock = threading.Lock()
+        # {chave do frame: (prazo, [eventos])}, em ordem de chegada
+        self._groups: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._held = 0
+        self._closed = False
+
+        # Estatísticas
+        self._groups_emitted = 0
+        self._events_emitted = 0
+        self._requests_saved = 0
+
+    @staticmethod
+    def frame_key(event: Event) -> Optional[Hashable]:
+        """
+        Chave do frame de origem do evento.
+
+        :param event: Evento.
+        :return: Tupla (câmera, id do frame, timestamp) ou None se o evento não tem frame.
+        """
+        frame = event.frame
+        if frame is None or event.camera_id is None:
+            return None
+        return (
+            event.camera_id.value(),
+            frame.id.value() if frame.id else None,
+            frame.timestamp.iso_format_with_tz() if frame.timestamp else None
+        )
+
+    def offer(self, event: Event) -> bool:
+        """
+        Retém um evento até seu grupo ficar pronto.
+
+        :param event: Evento consumido da fila do FindFace.
+        :return: False se o agrupador já foi fechado (evento não retido).
+        """
+        key = self.frame_key(event)
+        if key is None:
+            # Sem frame identificável: grupo próprio, pronto imediatamente
+            key = ("evento", id(event))
+
+        with self._lock:
+            if self._closed:
+                return False
+            group = self._groups.get(key)
+            if group is None:
+                self._groups[key] = (time.monotonic() + self.window, [event])
+            else:
+                group[1].append(event)
+            self._held += 1
+        return True
+
+    def pop_ready(self) -> Optional[List[Event]]:
+        """
+        Retira um grupo pronto (janela expirada ou grupo cheio).
+
+        :return: Lista de eventos do mesmo frame, ou None se nenhum grupo está pronto.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key, (deadline, events) in self._groups.items():
+                if now >= deadline or len(events) >= self.max_group_size:
+                    del self._groups[key]
+                    self._account(events)
+                    return events
+        return None
+
+    def close(self) -> List[List[Event]]:
+        """
+        Fecha o agrupador (novos eventos são recusados) e retira os grupos retidos.
+
+        Usado na parada: os senders devolvem os eventos retidos à fila.
+
+        :return: Lista de grupos.
+        """
+        with self._lock:
+            self._closed = True
+        return self.pop_all()
+
+    def pop_all(self) -> List[List[Event]]:
+        """
+        Retira todos os grupos retidos.
+
+        :return: Lista de grupos.
+        """
+        with self._lock:
+            groups = [events for _, events in self._groups.values()]
+            self._groups.clear()
+            for events in groups:
+                self._account(events)
+            return groups
+
+    def _account(self, events: List[Event]) -> None:
+        """Atualiza contadores ao liberar um grupo (lock já adquirido)."""
+        self._held -= len(events)
+        self._groups_emitted += 1
+        self._events_emitted += len(events)
+        self._requests_saved += len(events) - 1
+
+    def __len__(self) -> int:
+        """Número de eventos retidos."""
+        return self._held
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do agrupamento.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            return {
+                "held": self._held,
+                "groups_emitted": self._groups_emitted,
+                "events_emitted": self._events_emitted,
+                "requests_saved": self._requests_saved
+            }
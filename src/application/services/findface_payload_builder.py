@@ -0,0 +1,224 @@
+"""
+Montagem do payload de add_face_event a partir de um evento.
+
+Centraliza a extração dos dados do evento e a codificação JPEG, usada pelos
+senders, pelo transbordo para a outbox em disco e pela reexecução da outbox.
+
+Modos de upload (reduzem bytes enviados e tempo de codificação):
+- full: frame completo, roi = bbox da face.
+- crop: recorte da face com margem; roi reescrita nas coordenadas do recorte.
+- downscale: frame completo reduzido até max_side; roi escalada.
+
+Nos modos full e downscale a imagem enviada é a mesma para todas as faces
+de um frame; com frame_cache, ela é codificada uma única vez.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.domain.entities import Event
+from src.infrastructure.imaging import JpegEncoder, JpegEncoderPool, EncodedFrameCache
+
+
+class FindfacePayloadBuilder:
+    """Converte eventos em argumentos de FindfaceMulti.add_face_event."""
+
+    # Campos do payload persistidos na outbox (o JPEG vai como dados binários)
+    RECORD_FIELDS = ("token", "camera", "timestamp", "roi", "mf_selector")
+
+    UPLOAD_MODES = ("full", "crop", "downscale")
+
+    def __init__(
+        self,
+        encoder: Optional[Union[JpegEncoder, JpegEncoderPool]] = None,
+        upload_mode: str = "full",
+        crop_margin: float = 1.0,
+        downscale_max_side: int = 1280,
+        frame_cache: Optional[EncodedFrameCache] = None
+    ):
+        """
+        Inicializa o builder.
+
+        :param encoder: Codificador JPEG (ou pool de codificação); padrão JpegEncoder().
+        :param upload_mode: "full", "crop" ou "downscale".
+        :param crop_margin: Margem do recorte, em múltiplos da largura/altura da bbox
+                            (1.0 = uma bbox de cada lado).
+        :param downscale_max_side: Maior lado (px) do frame no modo downscale.
+        :param frame_cache: Cache de JPEGs por frame (modos full e downscale), opcional.
+        :raises ValueError: Se o modo for inválido.
+        """
+        if upload_mode not in self.UPLOAD_MODES:
+            raise ValueError(f"upload_mode inválido: {upload_mode} (use {', '.join(self.UPLOAD_MODES)})")
+
+        self.encoder = encoder if encoder is not None else JpegEncoder()
+        self.upload_mode = upload_mode
+        self.crop_margin = max(0.0, float(crop_margin))
+        self.downscale_max_side = max(64, int(downscale_max_side))
+        self.frame_cache = frame_cache
+
+    def build(self, event: Event) -> Dict[str, Any]:
+        """
+        Extrai os dados do evento e codifica o frame em JPEG.
+
+        Não faz I/O de rede: pode rodar em qualquer thread. O frame é lido
+        sem cópia (o codificador não modifica a imagem).
+
+        :param event: Evento a enviar.
+        :return: Argumentos nomeados para add_face_event.
+        :raises ValueError: Se o evento estiver incompleto ou a codificação falhar.
+        """
+        return self.build_group([event])
+
+    def build_group(self, events: List[Event]) -> Dict[str, Any]:
+        """
+        Monta um único envio para eventos do mesmo frame.
+
+        Com mais de um evento, usa mf_selector="all" e roi envolvendo todas
+        as faces, para o FindFace detectar cada uma na mesma imagem.
+
+        :param events: Eventos do mesmo frame (o primeiro fornece frame e câmera).
+        :return: Argumentos nomeados para add_face_event.
+        :raises ValueError: Se o evento estiver incompleto ou a codificação falhar.
+        """
+        event = events[0]
+
+        # Extrai informações do evento com proteção contra None
+        camera_id = event.camera_id.value() if event.camera_id else None
+        camera_token = event.camera_token.value() if event.camera_token else None
+        # Timestamp em formato ISO com timezone
+        timestamp = event.frame.timestamp.iso_format_with_tz() if event.frame else None
+        bboxes = [e.bbox.value() for e in events if e.bbox]
+        fullframe = event.frame.full_frame.ndarray_readonly if event.frame and event.frame.full_frame else None
+
+        # Valida se todos os dados foram extraídos
+        if camera_id is None or camera_token is None or timestamp is None or not bboxes or fullframe is None:
+            raise ValueError("Evento incompleto: faltam dados necessários")
+
+        # Converte bbox para ROI [left, top, right, bottom] (união das faces do grupo)
+        roi = [
+            int(min(bbox[0] for bbox in bboxes)),
+            int(min(bbox[1] for bbox in bboxes)),
+            int(max(bbox[2] for bbox in bboxes)),
+            int(max(bbox[3] for bbox in bboxes))
+        ]
+
+        if self.frame_cache is not None and self.upload_mode != "crop":
+            # Mesma imagem para todas as faces do frame: codifica uma vez.
+            # O dono da chave codifica na própria thread: threads do pool
+            # podem estar bloqueadas aguardando a mesma chave.
+            frame_id = event.frame.id.value() if event.frame.id else None
+            key = (camera_id, frame_id, timestamp, self.upload_mode)
+            encode = getattr(self.encoder, "encode_inline", self.encoder.encode)
+            jpeg = self.frame_cache.get_or_encode(
+                key,
+                lambda: encode(self._prepare_image(fullframe, roi)[0])
+            )
+            roi = self._scale_roi(roi, self._downscale_factor(fullframe))
+            del fullframe
+        else:
+            # Recorta/reduz conforme o modo e leva a roi para o novo sistema de coordenadas
+            image, roi = self._prepare_image(fullframe, roi)
+            del fullframe
+
+            # Codifica a imagem (JPEG como memoryview, sem cópia)
+            jpeg = self.encoder.encode(image)
+            del image
+
+        return {
+            "token": camera_token,
+            "fullframe": jpeg,
+            "camera": camera_id,
+            "timestamp": timestamp,
+            "roi": roi,
+            "mf_selector": "all" if len(events) > 1 else "biggest"
+        }
+
+    def _prepare_image(self, frame: np.ndarray, roi: List[int]) -> Tuple[np.ndarray, List[int]]:
+        """
+        Aplica o modo de upload ao frame.
+
+        :param frame: Frame completo (não é modificado).
+        :param roi: Bbox [left, top, right, bottom] no frame completo.
+        :return: Tupla (imagem a codificar, roi nas coordenadas da imagem).
+        """
+        if self.upload_mode == "crop":
+            return self._crop(frame, roi)
+        if self.upload_mode == "downscale":
+            return self._downscale(frame, roi)
+        return frame, roi
+
+    def _crop(self, frame: np.ndarray, roi: List[int]) -> Tuple[np.ndarray, List[int]]:
+        """Recorta a face com margem (view do frame, sem cópia)."""
+        height, width = frame.shape[:2]
+        left, top, right, bottom = roi
+        margin_x = int((right - left) * self.crop_margin)
+        margin_y = int((bottom - top) * self.crop_margin)
+
+        x1 = max(0, left - margin_x)
+        y1 = max(0, top - margin_y)
+        x2 = min(width, right + margin_x)
+        y2 = min(height, bottom + margin_y)
+        if x2 <= x1 or y2 <= y1:
+            # Bbox fora do frame: envia o frame completo
+            return frame, roi
+
+        return frame[y1:y2, x1:x2], [left - x1, top - y1, right - x1, bottom - y1]
+
+    def _downscale(self, frame: np.ndarray, roi: List[int]) -> Tuple[np.ndarray, List[int]]:
+        """Reduz o frame até downscale_max_side, escalando a roi."""
+        scale = self._downscale_factor(frame)
+        if scale >= 1.0:
+            return frame, roi
+
+        height, width = frame.shape[:2]
+        new_size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+        resized = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+        return resized, self._scale_roi(roi, scale)
+
+    def _downscale_factor(self, frame: np.ndarray) -> float:
+        """Fator de escala do frame enviado (1.0 fora do modo downscale)."""
+        if self.upload_mode != "downscale":
+            return 1.0
+        return min(1.0, self.downscale_max_side / max(frame.shape[:2]))
+
+    @staticmethod
+    def _scale_roi(roi: List[int], scale: float) -> List[int]:
+        """Escala a roi para o frame reduzido."""
+        if scale >= 1.0:
+            return roi
+        return [int(round(value * scale)) for value in roi]
+
+    @classmethod
+    def to_outbox_record(
+        cls,
+        payload: Dict[str, Any],
+        event: Optional[Event] = None
+    ) -> Tuple[Dict[str, Any], bytes]:
+        """
+        Converte um payload em registro da outbox (metadados + JPEG).
+
+        :param payload: Payload montado por build().
+        :param event: Evento de origem (para metadados de log), opcional.
+        :return: Tupla (metadados, bytes do JPEG).
+        """
+        metadata = {field: payload.get(field) for field in cls.RECORD_FIELDS}
+        if event is not None:
+            metadata["event_id"] = event.id.value() if event.id else None
+            metadata["camera_name"] = event.camera_name.value() if event.camera_name else None
+            metadata["quality"] = event.face_quality_score.value() if event.face_quality_score else None
+        return metadata, payload["fullframe"]
+
+    @classmethod
+    def from_outbox_record(cls, metadata: Dict[str, Any], data: bytes) -> Dict[str, Any]:
+        """
+        Reconstrói o payload de add_face_event a partir de um registro da outbox.
+
+        :param metadata: Metadados do registro.
+        :param data: Bytes do JPEG.
+        :return: Argumentos nomeados para add_face_event.
+        """
+        payload = {field: metadata.get(field) for field in cls.RECORD_FIELDS}
+        payload["fullframe"] = data
+        return payload
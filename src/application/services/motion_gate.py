@@ -0,0 +1,122 @@
+"""
+Portão de movimento por câmera baseado em diferença de frames.
+
+Compara uma miniatura em tons de cinza de cada frame com um fundo
+acumulado (média móvel exponencial) e só libera para detecção os frames
+com mudança suficiente, mais um frame de keep-alive periódico.
+"""
+
+import threading
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from src.infrastructure.config.settings import MotionGateConfig
+
+
+class MotionGate:
+    """
+    Portão de movimento de uma câmera.
+
+    Custo por frame: um resize para a miniatura + operações em ~64x36 pixels.
+    Não é thread-safe para should_process (uma instância por thread de
+    captura); get_stats pode ser chamado de qualquer thread.
+    """
+
+    def __init__(self, config: MotionGateConfig):
+        """
+        Inicializa o portão.
+
+        :param config: Configurações (já resolvidas para a câmera).
+        """
+        self.config = config
+        self._background: Optional[np.ndarray] = None
+        self._last_pass_time = 0.0
+        self._last_motion_time = 0.0
+
+        self._stats_lock = threading.Lock()
+        self._frames_seen = 0
+        self._frames_passed = 0
+        self._keepalive_passed = 0
+        self._last_changed_ratio = 0.0
+        self._motion_active = False
+
+    def should_process(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """
+        Decide se o frame deve seguir para detecção.
+
+        :param frame: Frame BGR (ou grayscale) capturado.
+        :param now: Instante atual (time.monotonic()), opcional.
+        :return: True se o frame deve ser enfileirado.
+        """
+        now = time.monotonic() if now is None else now
+        gray = self._thumbnail(frame)
+
+        if self._background is None or self._background.shape != gray.shape:
+            # Primeiro frame (ou mudança de resolução): inicializa fundo e libera
+            self._background = gray.copy()
+            self._last_motion_time = now
+            return self._record(now, changed_ratio=1.0, motion=True, keepalive=False)
+
+        diff = cv2.absdiff(gray, self._background)
+        changed_ratio = float(np.count_nonzero(diff > self.config.pixel_threshold)) / diff.size
+        cv2.accumulateWeighted(gray, self._background, self.config.background_alpha)
+
+        motion = changed_ratio >= self.config.min_changed_ratio
+        if motion:
+            self._last_motion_time = now
+        elif now - self._last_motion_time <= self.config.hold_seconds:
+            # Mantém aberto logo após movimento (faces paradas após entrar em cena)
+            motion = True
+
+        keepalive = not motion and now - self._last_pass_time >= self.config.keepalive_seconds
+        return self._record(now, changed_ratio, motion, keepalive)
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Reduz o frame para a miniatura em tons de cinza (float32)."""
+        height, width = frame.shape[:2]
+        thumb_width = self.config.thumbnail_width
+        thumb_height = max(1, int(round(height * thumb_width / float(width))))
+
+        thumb = cv2.resize(frame, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        return thumb.astype(np.float32)
+
+    def _record(self, now: float, changed_ratio: float, motion: bool, keepalive: bool) -> bool:
+        """Atualiza estatísticas e retorna a decisão."""
+        passed = motion or keepalive
+        if passed:
+            self._last_pass_time = now
+
+        with self._stats_lock:
+            self._frames_seen += 1
+            self._last_changed_ratio = changed_ratio
+            self._motion_active = motion
+            if passed:
+                self._frames_passed += 1
+            if keepalive:
+                self._keepalive_passed += 1
+        return passed
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estado e estatísticas do portão.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._stats_lock:
+            seen = self._frames_seen
+            return {
+                "motion_active": self._motion_active,
+                "last_changed_ratio": self._last_changed_ratio,
+                "frames_seen": seen,
+                "frames_passed": self._frames_passed,
+                "keepalive_passed": self._keepalive_passed,
+                "pass_ratio": (self._frames_passed / seen) if seen else 0.0,
+                "min_changed_ratio": self.config.min_changed_ratio,
+                "pixel_threshold": self.config.pixel_threshold,
+                "keepalive_seconds": self.config.keepalive_seconds
+            }
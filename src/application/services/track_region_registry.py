@@ -0,0 +1,259 @@
+"""
+Registro compartilhado das regiões previstas dos tracks ativos por câmera.
+
+Usado pela re-detecção guiada por tracks (ROI): os gerenciadores de tracks
+publicam o último bbox de cada track e os detectores consultam as regiões
+previstas para decidir se o próximo frame precisa de detecção completa ou
+apenas de crops ao redor dos tracks.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from src.domain.value_objects import BboxVO
+from src.infrastructure.config.settings import RoiDetectionConfig
+
+
+Region = Tuple[int, int, int, int]
+
+
+@dataclass
+class _TrackRegion:
+    """Estado mínimo de um track para previsão da próxima posição."""
+    bbox: Tuple[float, float, float, float]
+    timestamp: float
+    velocity_x: float = 0.0
+    velocity_y: float = 0.0
+
+
+class TrackRegionRegistry:
+    """
+    Registro thread-safe de regiões de tracks por câmera.
+
+    Produtores: ManageTracksUseCase (update/remove).
+    Consumidores: DetectFacesUseCase (regions_for_frame).
+
+    A previsão é linear: centro do último bbox deslocado pela velocidade
+    estimada entre as duas últimas atualizações do track.
+    """
+
+    # Suavização exponencial da velocidade (0 = ignora nova medida, 1 = só nova medida)
+    VELOCITY_SMOOTHING = 0.5
+
+    def __init__(self, config: RoiDetectionConfig):
+        """
+        Inicializa o registro.
+
+        :param config: Configurações da re-detecção por ROI.
+        """
+        self.config = config
+        self._lock = threading.Lock()
+        self._regions: Dict[int, Dict[Hashable, _TrackRegion]] = {}
+        self._frame_counters: Dict[int, int] = {}
+
+        # Estatísticas
+        self._full_passes = 0
+        self._roi_passes = 0
+        self._roi_regions = 0
+
+    def update(self, camera_id: int, track_key: Hashable, bbox: BboxVO, timestamp: float) -> None:
+        """
+        Atualiza a posição de um track.
+
+        :param camera_id: ID da câmera do track.
+        :param track_key: Chave única do track (opaca para o registro).
+        :param bbox: Último bbox do track.
+        :param timestamp: Timestamp Unix do frame do último evento.
+        """
+        x1, y1, x2, y2 = bbox.value()
+        new_bbox = (float(x1), float(y1), float(x2), float(y2))
+
+        with self._lock:
+            camera_regions = self._regions.setdefault(camera_id, {})
+            previous = camera_regions.get(track_key)
+
+            if previous is None:
+                camera_regions[track_key] = _TrackRegion(bbox=new_bbox, timestamp=timestamp)
+                return
+
+            dt = timestamp - previous.timestamp
+            if dt > 0:
+                prev_cx = (previous.bbox[0] + previous.bbox[2]) / 2.0
+                prev_cy = (previous.bbox[1] + previous.bbox[3]) / 2.0
+                new_cx = (new_bbox[0] + new_bbox[2]) / 2.0
+                new_cy = (new_bbox[1] + new_bbox[3]) / 2.0
+
+                alpha = self.VELOCITY_SMOOTHING
+                previous.velocity_x = (1 - alpha) * previous.velocity_x + alpha * (new_cx - prev_cx) / dt
+                previous.velocity_y = (1 - alpha) * previous.velocity_y + alpha * (new_cy - prev_cy) / dt
+
+            previous.bbox = new_bbox
+            previous.timestamp = max(previous.timestamp, timestamp)
+
+    def remove(self, camera_id: int, track_key: Hashable) -> None:
+        """
+        Remove um track finalizado.
+
+        :param camera_id: ID da câmera do track.
+        :param track_key: Chave única do track.
+        """
+        with self._lock:
+            camera_regions = self._regions.get(camera_id)
+            if camera_regions is None:
+                return
+            camera_regions.pop(track_key, None)
+            if not camera_regions:
+                del self._regions[camera_id]
+
+    def remove_camera(self, camera_id: int) -> None:
+        """
+        Remove todo o estado de uma câmera.
+
+        :param camera_id: ID da câmera.
+        """
+        with self._lock:
+            self._regions.pop(camera_id, None)
+            self._frame_counters.pop(camera_id, None)
+
+    def regions_for_frame(
+        self,
+        camera_id: int,
+        frame_width: int,
+        frame_height: int,
+        timestamp: float
+    ) -> Optional[List[Region]]:
+        """
+        Decide como o próximo frame de uma câmera deve ser processado.
+
+        :param camera_id: ID da câmera.
+        :param frame_width: Largura do frame.
+        :param frame_height: Altura do frame.
+        :param timestamp: Timestamp Unix do frame.
+        :return: None se o frame precisa de detecção completa, ou lista de
+                 regiões (x1, y1, x2, y2) já com margem e recortadas ao frame.
+        """
+        with self._lock:
+            counter = self._frame_counters.get(camera_id, 0)
+            self._frame_counters[camera_id] = counter + 1
+
+            # Passada completa periódica (detecta faces novas)
+            if counter % max(1, self.config.full_frame_interval) == 0:
+                self._full_passes += 1
+                return None
+
+            camera_regions = self._regions.get(camera_id)
+            if not camera_regions:
+                self._full_passes += 1
+                return None
+
+            # Descarta tracks sem atualização recente
+            max_age = self.config.max_track_age_seconds
+            for key in [k for k, r in camera_regions.items() if timestamp - r.timestamp > max_age]:
+                del camera_regions[key]
+
+            if not camera_regions or len(camera_regions) > self.config.max_regions:
+                self._full_passes += 1
+                return None
+
+            regions = [
+                self._predict_region(region, frame_width, frame_height, timestamp)
+                for region in camera_regions.values()
+            ]
+            regions = [r for r in regions if r is not None]
+
+            total_area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in regions)
+            if not regions or total_area > self.config.max_area_ratio * frame_width * frame_height:
+                self._full_passes += 1
+                return None
+
+            self._roi_passes += 1
+            self._roi_regions += len(regions)
+            return regions
+
+    def _predict_region(
+        self,
+        region: _TrackRegion,
+        frame_width: int,
+        frame_height: int,
+        timestamp: float
+    ) -> Optional[Region]:
+        """
+        Calcula a região prevista (com margem) de um track no instante dado.
+
+        :return: Região recortada aos limites do frame ou None se degenerada.
+        """
+        x1, y1, x2, y2 = region.bbox
+        dt = max(0.0, timestamp - region.timestamp)
+        dx = region.velocity_x * dt
+        dy = region.velocity_y * dt
+
+        pad_x = (x2 - x1) * self.config.padding
+        pad_y = (y2 - y1) * self.config.padding
+
+        rx1 = int(max(0, x1 + dx - pad_x))
+        ry1 = int(max(0, y1 + dy - pad_y))
+        rx2 = int(min(frame_width, x2 + dx + pad_x))
+        ry2 = int(min(frame_height, y2 + dy + pad_y))
+
+        if rx2 - rx1 < 2 or ry2 - ry1 < 2:
+            return None
+        return (rx1, ry1, rx2, ry2)
+
+    @staticmethod
+    def suppress_duplicates(
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        iou_threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Remove detecções duplicadas vindas de crops sobrepostos (NMS guloso).
+
+        :param boxes: Array (N, 4) de bboxes em coordenadas do frame.
+        :param confidences: Array (N,) de confianças.
+        :param iou_threshold: IoU acima do qual a detecção de menor confiança é descartada.
+        :return: Tupla (boxes, confidences) filtrados.
+        """
+        if len(boxes) <= 1:
+            return boxes, confidences
+
+        order = np.argsort(-confidences)
+        areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        keep = []
+
+        while order.size > 0:
+            i = order[0]
+            keep.append(i)
+            rest = order[1:]
+
+            xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+            yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+            xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+            yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+            inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+            iou = inter / (areas[i] + areas[rest] - inter + 1e-6)
+
+            order = rest[iou < iou_threshold]
+
+        keep = np.array(keep, dtype=np.int64)
+        return boxes[keep], confidences[keep]
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da re-detecção por ROI.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            total = self._full_passes + self._roi_passes
+            return {
+                "enabled": self.config.enabled,
+                "cameras_with_tracks": len(self._regions),
+                "tracked_regions": sum(len(r) for r in self._regions.values()),
+                "full_passes": self._full_passes,
+                "roi_passes": self._roi_passes,
+                "roi_regions": self._roi_regions,
+                "roi_ratio": (self._roi_passes / total) if total else 0.0
+            }
@@ -6,6 +6,8 @@ from .stream_camera_use_case import StreamCameraUseCase
 from .detect_faces_use_case import DetectFacesUseCase
 from .manage_tracks_use_case import ManageTracksUseCase
 from .send_to_findface_use_case import SendToFindfaceUseCase
+from .send_to_findface_async_use_case import SendToFindfaceAsyncUseCase
+from .replay_outbox_use_case import ReplayOutboxUseCase
 from .display_camera_use_case import DisplayCameraUseCase
 
 __all__ = [
@@ -13,5 +15,7 @@ __all__ = [
     "DetectFacesUseCase",
     "ManageTracksUseCase",
     "SendToFindfaceUseCase",
+    "SendToFindfaceAsyncUseCase",
+    "ReplayOutboxUseCase",
     "DisplayCameraUseCase"
 ]
@@ -4,19 +4,32 @@ Use Case para detecção facial e tracking usando YOLO + ByteTrack.
 
 import logging
 import gc
+import queue
+import threading
 import torch
 import numpy as np
-from typing import Optional, List, Dict
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Tuple
 from threading import Event as ThreadEvent
 from ultralytics import YOLO
 
 from src.domain.entities import Frame, Event
 from src.domain.value_objects import IdVO, BboxVO, ConfidenceVO, LandmarksVO
 from src.application.queues import FrameQueue, EventQueue
-from src.application.services import LandmarkDetectionService
+from src.application.services import LandmarkDetectionService, TrackRegionRegistry
 from src.application.display.circular_buffer import CircularBuffer
 from src.application.display.display_service import AnnotatedFrame
-from src.infrastructure.config.settings import ModeloDeteccaoConfig, TrackingConfig, ProcessingConfig, PerformanceConfig, FilterConfig, DisplayConfig
+from src.infrastructure.config.settings import ModeloDeteccaoConfig, TrackingConfig, ProcessingConfig, PerformanceConfig, FilterConfig, DisplayConfig, RoiDetectionConfig
+
+
+@dataclass
+class _InferenceJob:
+    """Unidade de inferência preparada: grupo de frames completos ou crops de ROI."""
+    frames: List[Frame]
+    images: List[np.ndarray]
+    imgsz: int
+    roi_regions: Optional[List[List[Tuple[int, int, int, int]]]] = None  # Regiões por frame (job de ROI)
+    crop_owners: Optional[List[Tuple[int, int, int]]] = None             # (índice do frame, x1, y1) por crop
 
 
 class DetectFacesUseCase:
@@ -37,7 +50,9 @@ class DetectFacesUseCase:
         display_config: DisplayConfig,
         display_buffers: Optional[Dict[str, CircularBuffer]] = None,
         shared_model: Optional[YOLO] = None,
-        queue_timeout: float = 0.5
+        queue_timeout: float = 0.5,
+        roi_config: Optional[RoiDetectionConfig] = None,
+        track_region_registry: Optional[TrackRegionRegistry] = None
     ):
         """
         Inicializa o use case.
@@ -55,6 +70,9 @@ class DetectFacesUseCase:
         :param display_config: Configurações de display visual.
         :param display_buffers: Dicionário de buffers de display por camera_id (opcional).
         :param shared_model: Modelo YOLO compartilhado entre workers (opcional).
+        :param queue_timeout: Timeout de espera na fila de frames.
+        :param roi_config: Configurações da re-detecção por ROI (opcional).
+        :param track_region_registry: Registro de regiões de tracks compartilhado (opcional).
         """
         self.frame_queue = frame_queue
         self.event_queue = event_queue
@@ -77,6 +95,10 @@ class DetectFacesUseCase:
         self.display_config = display_config
         self.display_buffers = display_buffers or {}
         
+        # Re-detecção guiada por tracks (opcional)
+        self.roi_config = roi_config or RoiDetectionConfig()
+        self.track_region_registry = track_region_registry
+        
         self._event_counter = 0
     
     def _get_device(self) -> str:
@@ -128,8 +150,9 @@ class DetectFacesUseCase:
     
     def _detection_loop(self):
         """Loop principal de detecção."""
-        batch_count = 0
-        gc_interval = 3  # Forçar GC a cada 3 batches (MAIS agressivo: era 5)
+        if self.performance_config.pipelined_detection:
+            self._pipelined_detection_loop()
+            return
         
         while not self.stop_event.is_set():
             try:
@@ -158,52 +181,134 @@ class DetectFacesUseCase:
                 # REMOVIDO: gc.collect() periódico
                 # A garbage collection é agora executada em uma thread separada
                 # pelo MemoryManager. Isto não bloqueia o loop de detecção.
-                # batch_count (esta variável pode ser removida ou reutilizada para outra coisa)
             except Exception as e:
                 self.logger.error(f"Erro no loop principal de detecção: {e}", exc_info=True)
                 # Continua executando mesmo com erro
     
-    def _process_batch(self, frames: List[Frame]):
+    def _pipelined_detection_loop(self):
         """
-        Processa um batch de frames.
+        Loop de detecção em pipeline de três estágios.
         
-        :param frames: Lista de frames a processar.
+        - Prefetch (thread própria): get_batch + planejamento ROI/shape + extração das imagens.
+        - Inferência (esta thread): apenas model.predict.
+        - Pós-processamento (thread própria): filtros, landmarks, eventos e display.
+        
+        Filas de tamanho 1 entre estágios (double buffering): enquanto um job é
+        inferido, o próximo já está preparado e o anterior está sendo pós-processado.
         """
-        self.logger.debug(f"Processando batch de {len(frames)} frames. Display ativado: {self.display_config.exibir_na_tela if self.display_config else 'config None'}, Buffers: {len(self.display_buffers)}")
+        prepared_queue: "queue.Queue[Optional[_InferenceJob]]" = queue.Queue(maxsize=1)
+        results_queue: "queue.Queue[Optional[Tuple[_InferenceJob, list]]]" = queue.Queue(maxsize=1)
         
-        # Prepara imagens para inferência
-        images = [frame.full_frame.value() for frame in frames]
+        prefetch_thread = threading.Thread(
+            target=self._prefetch_stage,
+            args=(prepared_queue,),
+            name=f"{threading.current_thread().name}-prefetch",
+            daemon=True
+        )
+        postprocess_thread = threading.Thread(
+            target=self._postprocess_stage,
+            args=(results_queue,),
+            name=f"{threading.current_thread().name}-postprocess",
+            daemon=True
+        )
+        prefetch_thread.start()
+        postprocess_thread.start()
         
         try:
-            try:
-                # Executa detecção (tracking será feito manualmente)
-                results = self.model.predict(
-                    source=images,
-                    conf=self.modelo_deteccao_config.confidence_threshold,
-                    iou=self.modelo_deteccao_config.iou_threshold,
-                    imgsz=self.performance_config.inference_size,
-                    device=self.device,
-                    verbose=False,
-                    stream=False
-                )
-            except Exception as e:
-                self.logger.error(f"Erro ao executar inferência do modelo YOLO: {e}", exc_info=True)
-                return
+            while True:
+                job = prepared_queue.get()
+                if job is None:
+                    break  # Prefetch finalizado (stop_event)
+                
+                try:
+                    results = self._run_inference(job)
+                except Exception as e:
+                    self.logger.error(f"Erro ao executar inferência do modelo YOLO: {e}", exc_info=True)
+                    results = None
+                
+                results_queue.put((job, results))
+        finally:
+            results_queue.put(None)
+            prefetch_thread.join(timeout=5.0)
+            postprocess_thread.join(timeout=30.0)
+            if postprocess_thread.is_alive():
+                self.logger.warning("Thread de pós-processamento não terminou em 30s")
+    
+    def _prefetch_stage(self, prepared_queue: "queue.Queue"):
+        """
+        Estágio de prefetch: consome a fila de frames e prepara jobs de inferência.
+        
+        :param prepared_queue: Fila de saída (jobs preparados; None sinaliza fim).
+        """
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    frames = self.frame_queue.get_batch(self.batch_size, timeout=self.queue_timeout)
+                    if not frames:
+                        continue
+                    
+                    try:
+                        jobs = self._prepare_batch(frames)
+                    except Exception as e:
+                        self.logger.error(f"Erro ao preparar batch de {len(frames)} frames: {e}", exc_info=True)
+                        for _ in frames:
+                            self.frame_queue.task_done()
+                        continue
+                    
+                    for job in jobs:
+                        prepared_queue.put(job)
+                except Exception as e:
+                    self.logger.error(f"Erro no estágio de prefetch: {e}", exc_info=True)
+        finally:
+            prepared_queue.put(None)
+    
+    def _postprocess_stage(self, results_queue: "queue.Queue"):
+        """
+        Estágio de pós-processamento: transforma resultados em eventos.
+        
+        :param results_queue: Fila de entrada ((job, results); None sinaliza fim).
+        """
+        while True:
+            item = results_queue.get()
+            if item is None:
+                break
             
-            # Processa cada frame de resultados
+            job, results = item
             try:
-                for frame, result in zip(frames, results):
+                if results is not None:
+                    self._postprocess_job(job, results)
+            except Exception as e:
+                self.logger.error(f"Erro no pós-processamento de {len(job.frames)} frames: {e}", exc_info=True)
+            finally:
+                for _ in job.frames:
+                    self.frame_queue.task_done()
+                job.images.clear()
+    
+    def _process_batch(self, frames: List[Frame]):
+        """
+        Processa um batch de frames (modo sequencial).
+        
+        Com a re-detecção por ROI ativada, frames cujas câmeras possuem tracks
+        recentes são processados apenas nas regiões previstas dos tracks; os
+        demais (e as passadas completas periódicas) usam o frame inteiro.
+        
+        :param frames: Lista de frames a processar.
+        """
+        self.logger.debug(f"Processando batch de {len(frames)} frames. Display ativado: {self.display_config.exibir_na_tela if self.display_config else 'config None'}, Buffers: {len(self.display_buffers)}")
+        
+        try:
+            for job in self._prepare_batch(frames):
+                try:
                     try:
-                        self._process_detections(frame, result)
+                        results = self._run_inference(job)
                     except Exception as e:
-                        self.logger.error(f"Erro ao processar detecções do frame: {e}", exc_info=True)
-            except Exception as e:
-                self.logger.error(f"Erro ao iterar sobre resultados: {e}", exc_info=True)
+                        self.logger.error(f"Erro ao executar inferência do modelo YOLO: {e}", exc_info=True)
+                        continue
+                    self._postprocess_job(job, results)
+                finally:
+                    # Libera memória das imagens
+                    job.images.clear()
         finally:
-            # Libera memória das imagens
-            images.clear()
-            del images
-            
             # Limpa cache GPU AGRESSIVAMENTE
             try:
                 if torch.cuda.is_available():
@@ -212,14 +317,189 @@ class DetectFacesUseCase:
             except Exception as e:
                 self.logger.warning(f"Erro ao limpar cache GPU: {e}")
     
-    def _process_detections(self, frame: Frame, result):
+    def _prepare_batch(self, frames: List[Frame]) -> List["_InferenceJob"]:
         """
-        Processa detecções de um frame.
+        Divide um batch em jobs de inferência prontos para o modelo.
+        
+        - Frames com ROIs de tracks viram um único job de crops (todas as câmeras).
+        - Os demais são agrupados por (imgsz, altura, largura): o letterbox do
+          ultralytics usa um único shape por batch, então misturar 720p e 4K
+          desperdiçaria computação com padding ou com upscale de frames pequenos.
+        
+        :param frames: Frames do batch.
+        :return: Lista de jobs (cada frame pertence a exatamente um job).
+        """
+        full_frames: List[Frame] = []
+        roi_frames: List[Frame] = []
+        roi_regions: List[List[Tuple[int, int, int, int]]] = []
+        
+        for frame in frames:
+            regions = self._plan_roi_regions(frame)
+            if regions is None:
+                full_frames.append(frame)
+            else:
+                roi_frames.append(frame)
+                roi_regions.append(regions)
+        
+        jobs: List[_InferenceJob] = []
+        
+        for (imgsz, height, width), group in self._group_by_shape(full_frames).items():
+            self.logger.debug(f"Job de {len(group)} frames {width}x{height} com imgsz={imgsz}")
+            jobs.append(_InferenceJob(
+                frames=group,
+                images=[frame.full_frame.value() for frame in group],
+                imgsz=imgsz
+            ))
+        
+        if roi_frames:
+            crops = []
+            owners = []  # (índice do frame no job, x1, y1) de cada crop
+            for frame_idx, (frame, regions) in enumerate(zip(roi_frames, roi_regions)):
+                frame_ndarray = frame.ndarray_readonly
+                for x1, y1, x2, y2 in regions:
+                    crops.append(frame_ndarray[y1:y2, x1:x2])
+                    owners.append((frame_idx, x1, y1))
+            
+            jobs.append(_InferenceJob(
+                frames=roi_frames,
+                images=crops,
+                imgsz=self.roi_config.inference_size,
+                roi_regions=roi_regions,
+                crop_owners=owners
+            ))
+        
+        return jobs
+    
+    def _plan_roi_regions(self, frame: Frame) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        Consulta o registro de tracks para decidir entre frame completo e ROIs.
+        
+        :param frame: Frame a processar.
+        :return: None para detecção completa ou lista de regiões (x1, y1, x2, y2).
+        """
+        if self.track_region_registry is None or not self.roi_config.enabled:
+            return None
+        
+        try:
+            return self.track_region_registry.regions_for_frame(
+                camera_id=frame.camera_id.value(),
+                frame_width=frame.width,
+                frame_height=frame.height,
+                timestamp=frame.timestamp.timestamp()
+            )
+        except Exception as e:
+            self.logger.warning(f"Erro ao planejar ROIs do frame, usando frame completo: {e}")
+            return None
+    
+    def _group_by_shape(self, frames: List[Frame]) -> Dict[Tuple[int, int, int], List[Frame]]:
+        """
+        Agrupa frames com shapes compatíveis para inferência em lote.
+        
+        :param frames: Frames a agrupar.
+        :return: Dicionário {(imgsz, altura, largura): frames} preservando a ordem de chegada.
+        """
+        groups: Dict[Tuple[int, int, int], List[Frame]] = {}
+        for frame in frames:
+            imgsz = self.performance_config.inference_size_for(
+                frame.camera_name.value(), frame.width, frame.height
+            )
+            groups.setdefault((imgsz, frame.height, frame.width), []).append(frame)
+        return groups
+    
+    def _run_inference(self, job: "_InferenceJob") -> list:
+        """
+        Executa o modelo de detecção sobre as imagens de um job.
+        
+        :param job: Job preparado.
+        :return: Lista de resultados do YOLO (um por imagem).
+        """
+        # Executa detecção (tracking será feito manualmente)
+        return self.model.predict(
+            source=job.images,
+            conf=self.modelo_deteccao_config.confidence_threshold,
+            iou=self.modelo_deteccao_config.iou_threshold,
+            imgsz=job.imgsz,
+            device=self.device,
+            verbose=False,
+            stream=False
+        )
+    
+    def _postprocess_job(self, job: "_InferenceJob", results: list):
+        """
+        Converte os resultados de um job em detecções por frame.
+        
+        :param job: Job inferido.
+        :param results: Resultados do YOLO.
+        """
+        if job.roi_regions is None:
+            for frame, result in zip(job.frames, results):
+                try:
+                    boxes, confidences = self._extract_boxes(result)
+                    self._process_detections(frame, boxes, confidences)
+                except Exception as e:
+                    self.logger.error(f"Erro ao processar detecções do frame: {e}", exc_info=True)
+            return
+        
+        # Job de ROI: translada detecções dos crops para coordenadas do frame
+        boxes_por_frame: List[List[np.ndarray]] = [[] for _ in job.frames]
+        confs_por_frame: List[List[np.ndarray]] = [[] for _ in job.frames]
+        
+        for (frame_idx, offset_x, offset_y), result in zip(job.crop_owners, results):
+            try:
+                boxes, confidences = self._extract_boxes(result)
+            except Exception as e:
+                self.logger.warning(f"Erro ao extrair boxes de crop ROI: {e}")
+                continue
+            if len(boxes) == 0:
+                continue
+            boxes[:, [0, 2]] += offset_x
+            boxes[:, [1, 3]] += offset_y
+            boxes_por_frame[frame_idx].append(boxes)
+            confs_por_frame[frame_idx].append(confidences)
+        
+        for frame_idx, (frame, regions) in enumerate(zip(job.frames, job.roi_regions)):
+            try:
+                if boxes_por_frame[frame_idx]:
+                    boxes = np.concatenate(boxes_por_frame[frame_idx])
+                    confidences = np.concatenate(confs_por_frame[frame_idx])
+                    if len(regions) > 1:
+                        boxes, confidences = TrackRegionRegistry.suppress_duplicates(
+                            boxes, confidences, self.roi_config.merge_iou_threshold
+                        )
+                else:
+                    boxes = np.empty((0, 4), dtype=np.float32)
+                    confidences = np.empty((0,), dtype=np.float32)
+                
+                self._process_detections(frame, boxes, confidences)
+            except Exception as e:
+                self.logger.error(f"Erro ao processar detecções ROI do frame: {e}", exc_info=True)
+    
+    def _extract_boxes(self, result) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extrai boxes e confianças de um resultado YOLO como arrays NumPy.
         
-        :param frame: Frame processado.
         :param result: Resultado do YOLO.
+        :return: Tupla (boxes (N, 4), confidences (N,)).
         """
         if result.boxes is None or len(result.boxes) == 0:
+            return np.empty((0, 4), dtype=np.float32), np.empty((0,), dtype=np.float32)
+        
+        boxes = result.boxes.xyxy.cpu().numpy()
+        confidences = result.boxes.conf.cpu().numpy()
+        return boxes, confidences
+    
+    def _process_detections(self, frame: Frame, boxes: np.ndarray, confidences: np.ndarray):
+        """
+        Processa detecções de um frame.
+        
+        :param frame: Frame processado.
+        :param boxes: Array (N, 4) de bboxes (x1, y1, x2, y2) em coordenadas do frame.
+        :param confidences: Array (N,) de confianças.
+        """
+        # Filtra ANTES de crops, landmarks e criação de eventos
+        boxes, confidences = self._filter_detections(boxes, confidences, frame.width, frame.height)
+        
+        if len(boxes) == 0:
             # Se display ativado e sem detecções, ainda pode enviar frame vazio
             if self.display_config and self.display_config.exibir_na_tela:
                 self.logger.debug(f"Enviando frame vazio para display (sem detecções)")
@@ -229,13 +509,6 @@ class DetectFacesUseCase:
                     self.logger.warning(f"Erro ao enviar frame vazio para display: {e}")
             return
         
-        try:
-            boxes = result.boxes.xyxy.cpu().numpy()
-            confidences = result.boxes.conf.cpu().numpy()
-        except Exception as e:
-            self.logger.error(f"Erro ao extrair boxes do resultado YOLO: {e}", exc_info=True)
-            return
-        
         # Obtém frame completo
         try:
             full_frame = frame.full_frame.value()
@@ -327,14 +600,60 @@ class DetectFacesUseCase:
                 del boxes, confidences
             except Exception as e:
                 self.logger.warning(f"Erro ao limpar estruturas temporárias: {e}")
-            
-            # Libera frame da memória (não mais necessário)
-            # O frame será removido da referência quando sair desta função
-            try:
-                if result is not None:
-                    del result  # Deleta o resultado do modelo também
-            except Exception as e:
-                self.logger.warning(f"Erro ao deletar resultado do modelo: {e}")
+    
+    def _filter_detections(
+        self,
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        frame_width: int,
+        frame_height: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aplica o FilterConfig como máscara vetorizada sobre as detecções.
+        
+        Descarta faces pequenas, de baixa confiança ou cortadas pela borda do
+        frame, e recorta as coordenadas restantes aos limites do frame.
+        
+        :param boxes: Array (N, 4) de bboxes (x1, y1, x2, y2).
+        :param confidences: Array (N,) de confianças.
+        :param frame_width: Largura do frame.
+        :param frame_height: Altura do frame.
+        :return: Tupla (boxes, confidences) filtrados.
+        """
+        if len(boxes) == 0:
+            return boxes, confidences
+        
+        widths = boxes[:, 2] - boxes[:, 0]
+        heights = boxes[:, 3] - boxes[:, 1]
+        
+        mask = (
+            (confidences >= self.filter_config.min_confidence) &
+            (widths >= self.filter_config.min_bbox_width) &
+            (heights >= self.filter_config.min_bbox_height)
+        )
+        
+        if self.filter_config.discard_border_clipped:
+            margin = self.filter_config.border_margin
+            mask &= (
+                (boxes[:, 0] > margin) &
+                (boxes[:, 1] > margin) &
+                (boxes[:, 2] < frame_width - margin) &
+                (boxes[:, 3] < frame_height - margin)
+            )
+        
+        if mask.all():
+            filtered_boxes, filtered_confidences = boxes, confidences
+        else:
+            filtered_boxes, filtered_confidences = boxes[mask], confidences[mask]
+            self.logger.debug(f"Filtro descartou {int((~mask).sum())} de {len(boxes)} detecções")
+        
+        # Garante coordenadas válidas para BboxVO (não negativas, dentro do frame)
+        filtered_boxes = np.clip(
+            filtered_boxes,
+            0,
+            [frame_width, frame_height, frame_width, frame_height]
+        )
+        return filtered_boxes, filtered_confidences
     
     def _release_frame_memory(self, frame: Frame) -> None:
         """
@@ -369,8 +688,10 @@ class DetectFacesUseCase:
         
         self.logger.debug(f"camera_id extraído: {camera_id}, buffers disponíveis: {list(self.display_buffers.keys())}")
         
-        # Verifica se existe buffer para esta câmera
-        if camera_id not in self.display_buffers:
+        # Verifica se existe buffer para esta câmera (um único get: a câmera
+        # pode ser removida pela reconciliação a qualquer momento)
+        buffer = self.display_buffers.get(camera_id)
+        if buffer is None:
             self.logger.debug(f"Buffer de display não encontrado para camera_id: {camera_id}")
             return
         
@@ -384,7 +705,7 @@ class DetectFacesUseCase:
         
         # Adiciona ao buffer (não-bloqueante, descarta se cheio)
         try:
-            success = self.display_buffers[camera_id].put_nowait(annotated_frame)
+            success = buffer.put_nowait(annotated_frame)
             if success:
                 self.logger.debug(f"Frame enviado ao buffer de display para {camera_id}, eventos: {len(events)}")
             else:
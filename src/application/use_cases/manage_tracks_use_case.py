@@ -8,10 +8,16 @@ import time
 from typing import Dict, List, Optional
 from threading import Event as ThreadEvent, Lock
 
-from src.domain.entities import Track, Event
-from src.domain.value_objects import IdVO
+import numpy as np
+
+from src.domain.entities import Track, Event, Frame
+from src.domain.value_objects import IdVO, BboxVO, LandmarksVO, FullFrameVO
 from src.domain.services.track_matching_service import TrackMatchingService
-from src.application.queues import EventQueue, FindfaceQueue
+from src.application.queues import EventQueue, FindfaceQueue, EventExpiredError
+from src.application.services.track_region_registry import TrackRegionRegistry
+from src.application.services.findface_payload_builder import FindfacePayloadBuilder
+from src.infrastructure.outbox import DiskOutbox
+from src.infrastructure.capture import SnapshotSampler
 from src.infrastructure.config.settings import TrackingConfig, TrackConfig
 
 
@@ -25,7 +31,12 @@ class ManageTracksUseCase:
         tracking_config: TrackingConfig,
         track_config: TrackConfig,
         stop_event: ThreadEvent,
-        queue_timeout: float = 0.5
+        queue_timeout: float = 0.5,
+        track_region_registry: Optional[TrackRegionRegistry] = None,
+        outbox: Optional[DiskOutbox] = None,
+        payload_builder: Optional[FindfacePayloadBuilder] = None,
+        snapshot_samplers: Optional[Dict[int, SnapshotSampler]] = None,
+        snapshot_max_skew: float = 0.5
     ):
         """
         Inicializa o use case.
@@ -35,6 +46,14 @@ class ManageTracksUseCase:
         :param tracking_config: Configurações de tracking.
         :param track_config: Configurações de track.
         :param stop_event: Evento para parar a execução.
+        :param queue_timeout: Timeout de espera na fila de eventos.
+        :param track_region_registry: Registro compartilhado de regiões de tracks,
+                                      usado pela re-detecção por ROI (opcional).
+        :param outbox: Outbox em disco para eventos que não cabem na fila do FindFace (opcional).
+        :param payload_builder: Builder usado ao gravar na outbox (opcional).
+        :param snapshot_samplers: Amostradores do stream principal por câmera (dual stream,
+                                  compartilhado e atualizado pelo orquestrador).
+        :param snapshot_max_skew: Diferença máxima (s) entre o melhor evento e o frame principal.
         """
         self.event_queue = event_queue
         self.findface_queue = findface_queue
@@ -42,12 +61,19 @@ class ManageTracksUseCase:
         self.track_config = track_config
         self.stop_event = stop_event
         self.queue_timeout = queue_timeout
+        self.track_region_registry = track_region_registry
+        self.outbox = outbox
+        self._payload_builder = payload_builder or FindfacePayloadBuilder()
+        self.snapshot_samplers = snapshot_samplers
+        self.snapshot_max_skew = snapshot_max_skew
         
         self.logger = logging.getLogger(__name__)
         # Tracks organizados por câmera: {camera_id: [Track, Track, ...]}
         self._tracks_por_camera: Dict[int, List[Track]] = {}
         self._lock = Lock()
         self._track_id_counter = 0
+        # Frame do stream principal do melhor evento de cada track (dual stream)
+        self._snapshots: Dict[tuple, np.ndarray] = {}
     
     def execute(self):
         """Executa o gerenciamento de tracks."""
@@ -133,6 +159,9 @@ class ManageTracksUseCase:
                 # Atualiza lista
                 if len(tracks_ativos) != len(tracks):
                     self._tracks_por_camera[camera_id] = tracks_ativos
+                    for track in tracks:
+                        if track not in tracks_ativos:
+                            self._release_track_state(camera_id, track)
             
             # FORA DO LOCK: Faz matching (operação cara)
             track_matched = None
@@ -183,7 +212,11 @@ class ManageTracksUseCase:
                 # Se encontrou match, adiciona evento ao track
                 if track_matched is not None:
                     try:
+                        previous_best = track_matched.best_event
                         track_matched.add_event(event, min_threshold_pixels=self.track_config.min_movement_pixels)
+                        self._publish_track_region(camera_id, track_matched, event)
+                        if track_matched.best_event is not previous_best:
+                            self._sample_snapshot(camera_id, track_matched)
                         
                         # Verifica se deve finalizar
                         if self._should_finalize_track(track_matched):
@@ -201,12 +234,133 @@ class ManageTracksUseCase:
                         )
                         
                         self._tracks_por_camera.setdefault(camera_id, []).append(novo_track)
+                        self._publish_track_region(camera_id, novo_track, event)
+                        self._sample_snapshot(camera_id, novo_track)
                         self.logger.debug(f"Novo track {self._track_id_counter} criado para câmera {camera_id}")
                     except Exception as e:
                         self.logger.error(f"Erro ao criar novo track: {e}", exc_info=True)
         except Exception as e:
             self.logger.error(f"Erro ao processar evento: {e}", exc_info=True)
     
+    def _track_region_key(self, track: Track) -> tuple:
+        """
+        Chave do track no registro de regiões.
+        
+        Cada gerenciador possui seu próprio contador de IDs, por isso a chave
+        inclui a identidade da instância para evitar colisões entre workers.
+        """
+        return (id(self), track.id.value())
+    
+    def _publish_track_region(self, camera_id: int, track: Track, event: Event):
+        """
+        Publica a posição mais recente do track no registro de regiões.
+        
+        :param camera_id: ID da câmera.
+        :param track: Track atualizado.
+        :param event: Evento recém associado ao track.
+        """
+        if self.track_region_registry is None:
+            return
+        
+        try:
+            self.track_region_registry.update(
+                camera_id=camera_id,
+                track_key=self._track_region_key(track),
+                bbox=event.bbox,
+                timestamp=event.frame.timestamp.timestamp()
+            )
+        except Exception as e:
+            self.logger.warning(f"Erro ao publicar região do track {track.id.value()}: {e}")
+    
+    def _release_track_state(self, camera_id: int, track: Track) -> Optional[np.ndarray]:
+        """
+        Remove o estado auxiliar de um track que saiu de _tracks_por_camera.
+        
+        Toda saída de track (finalização ou descarte por inatividade) passa
+        por aqui; caso contrário a região publicada e o frame do stream
+        principal (um slot do FrameRing) ficariam retidos.
+        
+        :param camera_id: ID da câmera.
+        :param track: Track removido.
+        :return: Frame do stream principal associado ao track, se houver.
+        """
+        key = self._track_region_key(track)
+        if self.track_region_registry is not None:
+            self.track_region_registry.remove(camera_id, key)
+        return self._snapshots.pop(key, None)
+    
+    def _sample_snapshot(self, camera_id: int, track: Track):
+        """
+        Associa ao melhor evento do track o frame do stream principal mais próximo.
+        
+        Feito quando o melhor evento muda (não na finalização, que pode ocorrer
+        segundos depois, com a pessoa já fora de cena).
+        
+        :param camera_id: ID da câmera.
+        :param track: Track cujo melhor evento mudou.
+        """
+        if not self.snapshot_samplers:
+            return
+        sampler = self.snapshot_samplers.get(camera_id)
+        if sampler is None or track.best_event is None:
+            return
+        
+        key = self._track_region_key(track)
+        image = sampler.nearest(track.best_event.frame.timestamp.timestamp(), self.snapshot_max_skew)
+        if image is not None:
+            self._snapshots[key] = image
+        else:
+            # O frame anterior era de outro evento: o envio usa o sub-stream
+            self._snapshots.pop(key, None)
+    
+    def _with_snapshot(self, event: Event, image: np.ndarray) -> Event:
+        """
+        Troca o frame do evento pelo frame do stream principal, reescalando bbox e landmarks.
+        
+        :param event: Melhor evento (frame do sub-stream).
+        :param image: Frame do stream principal.
+        :return: Evento com o frame principal (o original, se a conversão falhar).
+        """
+        try:
+            height, width = image.shape[:2]
+            scale_x = width / event.frame.width
+            scale_y = height / event.frame.height
+            
+            x1, y1, x2, y2 = event.bbox.value()
+            bbox = BboxVO((
+                max(0, int(x1 * scale_x)),
+                max(0, int(y1 * scale_y)),
+                min(width, int(round(x2 * scale_x))),
+                min(height, int(round(y2 * scale_y)))
+            ))
+            
+            landmarks = event.landmarks
+            if not landmarks.is_empty():
+                points = np.array(landmarks.to_list(), dtype=np.float32)
+                points[..., 0] *= scale_x
+                points[..., 1] *= scale_y
+                landmarks = LandmarksVO(points)
+            
+            frame = Frame(
+                id=event.frame.id,
+                full_frame=FullFrameVO(image),
+                camera_id=event.frame.camera_id,
+                camera_name=event.frame.camera_name,
+                camera_token=event.frame.camera_token,
+                timestamp=event.frame.timestamp
+            )
+            return Event(
+                id=event.id,
+                frame=frame,
+                bbox=bbox,
+                confidence=event.confidence,
+                landmarks=landmarks,
+                face_quality_score=event.face_quality_score
+            )
+        except Exception as e:
+            self.logger.warning(f"Erro ao usar o frame do stream principal no evento {event.id.value()}: {e}")
+            return event
+    
     def _should_finalize_track(self, track: Track) -> bool:
         """
         Verifica se um track deve ser finalizado.
@@ -243,6 +397,8 @@ class ManageTracksUseCase:
         if track in tracks:
             tracks.remove(track)
         
+        snapshot = self._release_track_state(camera_id, track)
+        
         # Verifica se track tem movimento suficiente
         if not track.has_movement:
             self.logger.debug(
@@ -276,11 +432,29 @@ class ManageTracksUseCase:
             del track
             return
         
-        if not self.findface_queue.put(best_event_copy, block=False):
-            self.logger.warning(
-                f"Fila do FindFace cheia, evento do track {track.id.value()} descartado "
-                f"(tamanho fila: {self.findface_queue.qsize()})"
-            )
+        if snapshot is not None:
+            best_event_copy = self._with_snapshot(best_event_copy, snapshot)
+        
+        try:
+            queued = self.findface_queue.put(best_event_copy, block=False)
+        except EventExpiredError as e:
+            # Vencido não vai para a outbox: seria reenviado ainda mais velho
+            self.logger.debug(f"Track {track.id.value()} finalizado com evento vencido, descartado: {e}")
+            track.finalize()
+            del track
+            return
+        
+        if not queued:
+            if self._spill_to_outbox(best_event_copy):
+                self.logger.warning(
+                    f"Fila do FindFace cheia, evento do track {track.id.value()} gravado na outbox "
+                    f"(pendentes: {len(self.outbox)})"
+                )
+            else:
+                self.logger.warning(
+                    f"Fila do FindFace cheia, evento do track {track.id.value()} descartado "
+                    f"(tamanho fila: {self.findface_queue.qsize()})"
+                )
         else:
             try:
                 self.logger.info(
@@ -298,6 +472,23 @@ class ManageTracksUseCase:
         track.finalize()
         del track  # GC irá descartar imediatamente
     
+    def _spill_to_outbox(self, event: Event) -> bool:
+        """
+        Grava na outbox um evento que não coube na fila do FindFace.
+        
+        :param event: Melhor evento do track.
+        :return: True se o evento foi preservado na outbox.
+        """
+        if self.outbox is None:
+            return False
+        try:
+            payload = self._payload_builder.build(event)
+            metadata, data = FindfacePayloadBuilder.to_outbox_record(payload, event)
+            return self.outbox.append(metadata, data)
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar evento na outbox: {e}", exc_info=True)
+            return False
+    
     def _cleanup_inactive_tracks(self):
         """Finaliza e remove tracks inativos de todas as câmeras."""
         try:
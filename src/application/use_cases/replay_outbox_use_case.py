@@ -0,0 +1,126 @@
+"""
+Use Case para reenviar ao FindFace os eventos guardados na outbox em disco.
+"""
+
+import logging
+from threading import Event as ThreadEvent
+
+from src.application.services.findface_payload_builder import FindfacePayloadBuilder
+from src.infrastructure.clients import FindfaceMulti, FindfaceHTTPError
+from src.infrastructure.outbox import DiskOutbox
+
+
+class ReplayOutboxUseCase:
+    """
+    Reenvia os eventos da outbox em ordem, um por vez.
+
+    Enquanto o FindFace estiver indisponível, o registro mais antigo é
+    retentado com backoff exponencial; nada é removido da outbox até o
+    envio ser confirmado. Respostas 4xx definitivas (payload rejeitado)
+    descartam o registro para não bloquear os demais.
+    """
+
+    # Status que indicam falha transitória (não descartam o registro)
+    RETRYABLE_STATUS = {401, 403, 408, 429}
+
+    def __init__(
+        self,
+        outbox: DiskOutbox,
+        findface_client: FindfaceMulti,
+        stop_event: ThreadEvent,
+        idle_interval: float = 1.0,
+        max_backoff: float = 30.0
+    ):
+        """
+        Inicializa o use case.
+
+        :param outbox: Outbox em disco.
+        :param findface_client: Cliente do FindFace.
+        :param stop_event: Evento para parar a execução.
+        :param idle_interval: Espera (s) quando a outbox está vazia.
+        :param max_backoff: Espera máxima (s) entre tentativas com o FindFace fora.
+        """
+        self.outbox = outbox
+        self.findface_client = findface_client
+        self.stop_event = stop_event
+        self.idle_interval = idle_interval
+        self.max_backoff = max_backoff
+
+        self.logger = logging.getLogger(__name__)
+        self._replayed_count = 0
+        self._rejected_count = 0
+
+    def execute(self):
+        """Executa o reenvio até stop_event."""
+        self.logger.info(f"Iniciando reenvio da outbox ({len(self.outbox)} eventos pendentes)")
+
+        try:
+            self._replay_loop()
+        except Exception as e:
+            self.logger.error(f"Erro no reenvio da outbox: {e}", exc_info=True)
+        finally:
+            self.logger.info(
+                f"Reenvio da outbox finalizado: {self._replayed_count} reenviados, "
+                f"{self._rejected_count} rejeitados, {len(self.outbox)} pendentes"
+            )
+
+    def _replay_loop(self):
+        """Loop principal de reenvio."""
+        backoff = 0.0
+
+        while not self.stop_event.is_set():
+            record = self.outbox.peek()
+            if record is None:
+                self.stop_event.wait(self.idle_interval)
+                continue
+
+            metadata, data = record
+            payload = FindfacePayloadBuilder.from_outbox_record(metadata, data)
+            event_id = metadata.get("event_id")
+
+            try:
+                response = self.findface_client.add_face_event(**payload)
+            except FindfaceHTTPError as e:
+                if 400 <= e.status_code < 500 and e.status_code not in self.RETRYABLE_STATUS:
+                    self._rejected_count += 1
+                    self.logger.error(f"Evento {event_id} da outbox rejeitado pelo FindFace, descartando: {e}")
+                    self.outbox.ack()
+                    continue
+                backoff = self._wait_backoff(backoff, e)
+                continue
+            except (ConnectionError, RuntimeError) as e:
+                backoff = self._wait_backoff(backoff, e)
+                continue
+            except (ValueError, TypeError) as e:
+                self._rejected_count += 1
+                self.logger.error(f"Registro inválido na outbox (evento {event_id}), descartando: {e}")
+                self.outbox.ack()
+                continue
+
+            self.outbox.ack()
+            self._replayed_count += 1
+            if backoff:
+                self.logger.info("FindFace disponível novamente, reenviando outbox")
+            backoff = 0.0
+
+            findface_event_id = response.get('id', 'N/A') if isinstance(response, dict) else 'N/A'
+            self.logger.info(
+                f"✓ Evento {event_id} reenviado da outbox | câmera: {metadata.get('camera_name')} | "
+                f"findface_id: {findface_event_id} | pendentes: {len(self.outbox)}"
+            )
+
+    def _wait_backoff(self, backoff: float, error: Exception) -> float:
+        """
+        Aguarda antes da próxima tentativa (backoff exponencial).
+
+        :param backoff: Espera anterior em segundos.
+        :param error: Erro da tentativa.
+        :return: Espera aplicada.
+        """
+        backoff = min(self.max_backoff, backoff * 2 if backoff else self.idle_interval)
+        self.logger.warning(
+            f"FindFace indisponível para reenvio da outbox ({error}); "
+            f"nova tentativa em {backoff:.1f}s ({len(self.outbox)} pendentes)"
+        )
+        self.stop_event.wait(backoff)
+        return backoff
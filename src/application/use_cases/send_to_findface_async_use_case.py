@@ -0,0 +1,242 @@
+"""
+Use Case para enviar eventos ao FindFace em um único event loop (asyncio).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event as ThreadEvent
+from typing import List, Optional, Set
+
+from src.domain.entities import Event
+from src.application.queues import FindfaceQueue
+from src.application.services.findface_payload_builder import FindfacePayloadBuilder
+from src.application.services.findface_event_coalescer import FindfaceEventCoalescer
+from src.application.use_cases.send_to_findface_use_case import SendToFindfaceUseCase
+from src.infrastructure.clients import FindfaceAsyncClient, AdaptiveConcurrencyLimiter, CircuitOpenError, is_transient_error
+from src.infrastructure.imaging import JpegEncoderPool
+from src.infrastructure.outbox import DiskOutbox
+
+
+class SendToFindfaceAsyncUseCase(SendToFindfaceUseCase):
+    """
+    Envio assíncrono ao FindFace: uma thread, um event loop, N uploads em voo.
+
+    A FindfaceQueue (thread-safe, bloqueante) é drenada por uma única thread
+    ponte; cada evento vira uma corrotina de upload. A codificação JPEG roda
+    no pool de codificação (a codificação libera o GIL) e o limite de
+    uploads simultâneos é um asyncio.Semaphore (ou o limitador adaptativo,
+    se configurado): eventos só saem da fila quando há vaga, então a fila
+    continua sendo o buffer de backpressure.
+    """
+
+    def __init__(
+        self,
+        findface_queue: FindfaceQueue,
+        async_client: FindfaceAsyncClient,
+        stop_event: ThreadEvent,
+        queue_timeout: float = 0.5,
+        max_in_flight: int = 64,
+        encode_workers: int = 4,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        outbox: Optional[DiskOutbox] = None,
+        encode_pool: Optional[JpegEncoderPool] = None,
+        payload_builder: Optional[FindfacePayloadBuilder] = None,
+        coalescer: Optional[FindfaceEventCoalescer] = None
+    ):
+        """
+        Inicializa o use case.
+
+        :param findface_queue: Fila de eventos a enviar.
+        :param async_client: Cliente assíncrono do FindFace.
+        :param stop_event: Evento para parar a execução.
+        :param queue_timeout: Timeout da leitura bloqueante na fila.
+        :param max_in_flight: Máximo de uploads simultâneos.
+        :param encode_workers: Threads de codificação JPEG (ignorado com encode_pool).
+        :param limiter: Limitador adaptativo (substitui o limite fixo max_in_flight).
+        :param outbox: Outbox em disco para eventos não enviados (opcional).
+        :param encode_pool: Pool compartilhado de codificação JPEG (opcional).
+        :param payload_builder: Builder configurado (modo de upload), opcional.
+        :param coalescer: Agrupador de eventos do mesmo frame (opcional).
+        """
+        super().__init__(
+            findface_queue=findface_queue,
+            findface_client=async_client.client,
+            stop_event=stop_event,
+            queue_timeout=queue_timeout,
+            limiter=limiter,
+            outbox=outbox,
+            encode_pool=encode_pool,
+            payload_builder=payload_builder,
+            coalescer=coalescer
+        )
+        self.async_client = async_client
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.encode_workers = encode_pool.workers if encode_pool is not None else max(1, int(encode_workers))
+
+        # Timeout mínimo para a ponte não girar em falso com timeouts de 1ms
+        self._bridge_timeout = max(self.queue_timeout, 0.1)
+        self._max_in_flight_seen = 0
+        
+        # Criados dentro do event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._slot_freed: Optional[asyncio.Event] = None
+
+    def execute(self):
+        """Executa o event loop de envio até stop_event."""
+        self.logger.info(
+            f"Iniciando envio assíncrono ao FindFace (max_in_flight={self.max_in_flight}, "
+            f"encode_workers={self.encode_workers})"
+        )
+
+        try:
+            asyncio.run(self._async_send_loop())
+        except Exception as e:
+            self.logger.error(f"Erro no envio assíncrono ao FindFace: {e}", exc_info=True)
+        finally:
+            self._log_statistics()
+            self.logger.info(
+                f"Envio assíncrono ao FindFace finalizado "
+                f"(pico de uploads simultâneos: {self._max_in_flight_seen})"
+            )
+
+    async def _async_send_loop(self):
+        """Drena a fila e dispara uploads respeitando o limite de concorrência."""
+        loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._slot_freed = asyncio.Event()
+        tasks: Set[asyncio.Task] = set()
+
+        # Ponte fila -> loop: uma thread dedicada aos get() bloqueantes
+        bridge = ThreadPoolExecutor(max_workers=1, thread_name_prefix="FindfaceBridge")
+        # Tarefas no pool compartilhado codificam direto na thread do pool
+        own_encoders = self.encode_pool is None
+        encoders = (
+            ThreadPoolExecutor(max_workers=self.encode_workers, thread_name_prefix="FindfaceEncode")
+            if own_encoders else self.encode_pool.executor
+        )
+
+        await self.async_client.open()
+        try:
+            while not self.stop_event.is_set():
+                # Circuito aberto: não consome; os eventos esperam na fila
+                circuit_wait = self._circuit_wait_time()
+                if circuit_wait:
+                    await asyncio.sleep(circuit_wait)
+                    continue
+
+                if not await self._acquire_slot():
+                    continue
+
+                try:
+                    events = await loop.run_in_executor(bridge, self._next_group)
+                except Exception as e:
+                    self._release_slot()
+                    self.logger.error(f"Erro ao ler da fila do FindFace: {e}", exc_info=True)
+                    continue
+
+                if events is None:
+                    self._release_slot()
+                    continue
+
+                task = asyncio.create_task(self._send_group_async(events, encoders))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                self._max_in_flight_seen = max(self._max_in_flight_seen, len(tasks))
+
+            # Aguarda uploads em andamento antes de fechar o cliente
+            if tasks:
+                self.logger.info(f"Aguardando {len(tasks)} uploads em andamento...")
+                await asyncio.wait(tasks, timeout=self.async_client.timeout)
+        finally:
+            await self.async_client.aclose()
+            # A ponte pode estar no meio de uma leitura: espera antes de devolver os retidos
+            bridge.shutdown(wait=True)
+            self._release_coalesced()
+            if own_encoders:
+                encoders.shutdown(wait=True)
+
+    async def _acquire_slot(self) -> bool:
+        """
+        Reserva uma vaga de upload.
+
+        :return: True se reservou; False após timeout (para reavaliar stop_event).
+        """
+        if self.limiter is None:
+            await self._semaphore.acquire()
+            return True
+
+        # Releases acontecem nas tasks deste mesmo loop: clear + try_acquire
+        # sem await entre eles não perde notificações
+        self._slot_freed.clear()
+        if self.limiter.try_acquire():
+            return True
+        try:
+            await asyncio.wait_for(self._slot_freed.wait(), timeout=self._bridge_timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.limiter.try_acquire()
+
+    def _release_slot(self, latency: Optional[float] = None, success: bool = True):
+        """
+        Libera uma vaga de upload (e registra a amostra no limitador).
+
+        :param latency: Duração do upload (None = vaga não usada).
+        :param success: Se o upload foi bem-sucedido.
+        """
+        if self.limiter is None:
+            self._semaphore.release()
+            return
+        self.limiter.release(latency, success)
+        self._slot_freed.set()
+
+    def _dequeue_timeout(self) -> float:
+        """Timeout da leitura na fila (executada na thread ponte via _next_group)."""
+        if self.coalescer is None:
+            return self._bridge_timeout
+        return max(0.05, min(self._bridge_timeout, self.coalescer.window))
+
+    async def _send_group_async(
+        self,
+        events: List[Event],
+        encoders: ThreadPoolExecutor
+    ):
+        """
+        Codifica (pool de threads) e envia um evento ou grupo do mesmo frame.
+
+        :param events: Eventos a enviar.
+        :param encoders: Pool de codificação JPEG.
+        """
+        loop = asyncio.get_running_loop()
+        event = events[0]
+        event_id = event.id.value() if event.id else 'UNKNOWN'
+        latency = None
+        success = False
+        payload = None
+
+        try:
+            payload = await loop.run_in_executor(encoders, self._prepare_group_payload, events)
+            start = time.monotonic()
+            try:
+                response = await self.async_client.add_face_event(**payload)
+                success = True
+            finally:
+                latency = time.monotonic() - start
+            self._success_count += len(events)
+            self._log_group_success(events, response)
+        except CircuitOpenError as e:
+            self.logger.debug(f"Circuito do FindFace aberto: {e}")
+            latency = None  # Sem amostra: a requisição não saiu
+            await loop.run_in_executor(encoders, self._requeue_group, events, payload)
+        except Exception as e:
+            self._failure_count += len(events)
+            self.logger.error(f"Falha ao enviar evento {event_id} ao FindFace: {e}")
+            if is_transient_error(e) and payload is not None:
+                await loop.run_in_executor(encoders, self._spill_to_outbox, event, payload)
+        finally:
+            self._release_slot(latency, success)
+            for _ in events:
+                try:
+                    self.findface_queue.task_done()
+                except Exception as e:
+                    self.logger.warning(f"Erro ao marcar task_done: {e}")
@@ -3,11 +3,17 @@ Use Case para enviar eventos ao FindFace.
 """
 
 import logging
+import time
 from threading import Event as ThreadEvent
+from typing import Any, Dict, List, Optional
 
 from src.domain.entities import Event
-from src.application.queues import FindfaceQueue
-from src.infrastructure.clients import FindfaceMulti
+from src.application.queues import FindfaceQueue, EventExpiredError
+from src.application.services.findface_payload_builder import FindfacePayloadBuilder
+from src.application.services.findface_event_coalescer import FindfaceEventCoalescer
+from src.infrastructure.clients import FindfaceMulti, AdaptiveConcurrencyLimiter, CircuitOpenError, is_transient_error
+from src.infrastructure.imaging import JpegEncoderPool
+from src.infrastructure.outbox import DiskOutbox
 
 
 class SendToFindfaceUseCase:
@@ -18,7 +24,12 @@ class SendToFindfaceUseCase:
         findface_queue: FindfaceQueue,
         findface_client: FindfaceMulti,
         stop_event: ThreadEvent,
-        queue_timeout: float = 0.5
+        queue_timeout: float = 0.5,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        outbox: Optional[DiskOutbox] = None,
+        encode_pool: Optional[JpegEncoderPool] = None,
+        payload_builder: Optional[FindfacePayloadBuilder] = None,
+        coalescer: Optional[FindfaceEventCoalescer] = None
     ):
         """
         Inicializa o use case.
@@ -26,15 +37,27 @@ class SendToFindfaceUseCase:
         :param findface_queue: Fila de eventos a enviar.
         :param findface_client: Cliente do FindFace.
         :param stop_event: Evento para parar a execução.
+        :param limiter: Limitador adaptativo compartilhado entre os senders (opcional).
+        :param outbox: Outbox em disco para eventos não enviados por falha de conexão (opcional).
+        :param encode_pool: Pool compartilhado de codificação JPEG; sem ele, codifica na própria thread.
+        :param payload_builder: Builder configurado (modo de upload); padrão usa encode_pool em modo "full".
+        :param coalescer: Agrupador compartilhado de eventos do mesmo frame (opcional).
         """
         self.findface_queue = findface_queue
         self.findface_client = findface_client
         self.stop_event = stop_event
         self.queue_timeout = queue_timeout
+        self.limiter = limiter
+        self.outbox = outbox
+        self.encode_pool = encode_pool
+        self.payload_builder = payload_builder or FindfacePayloadBuilder(encoder=encode_pool)
+        self.coalescer = coalescer
         
         self.logger = logging.getLogger(__name__)
         self._success_count = 0
         self._failure_count = 0
+        self._spilled_count = 0
+        self._requeued_count = 0
     
     def execute(self):
         """Executa o envio de eventos ao FindFace."""
@@ -55,140 +78,333 @@ class SendToFindfaceUseCase:
         
         while not self.stop_event.is_set():
             try:
-                event = self.findface_queue.get(block=True, timeout=self.queue_timeout)
+                # Circuito aberto: não consome; os eventos esperam na fila
+                circuit_wait = self._circuit_wait_time()
+                if circuit_wait:
+                    self.stop_event.wait(circuit_wait)
+                    continue
                 
-                if event is None:
+                # Reserva a vaga antes de consumir: sem vaga, o evento fica na fila
+                if self.limiter is not None and not self.limiter.acquire(timeout=max(self.queue_timeout, 0.1)):
                     continue
                 
-                self.logger.debug(
-                    f"Consumido evento {event.id.value() if event.id else 'UNKNOWN'} da fila do FindFace "
-                    f"(câmera: {event.camera_id.value() if event.camera_id else 'UNKNOWN'}, tamanho fila: {self.findface_queue.qsize()})"
-                )
+                events = self._next_group()
+                
+                if events is None:
+                    if self.limiter is not None:
+                        self.limiter.release()
+                    continue
                 
                 try:
-                    self._send_event(event)
+                    self._send_group(events)
                 except Exception as e:
                     self.logger.error(f"Erro ao enviar evento: {e}", exc_info=True)
                 finally:
-                    try:
-                        self.findface_queue.task_done()
-                    except Exception as e:
-                        self.logger.warning(f"Erro ao marcar task_done: {e}")
+                    # Um task_done por evento consumido da fila
+                    for _ in events:
+                        try:
+                            self.findface_queue.task_done()
+                        except Exception as e:
+                            self.logger.warning(f"Erro ao marcar task_done: {e}")
                     
                     # REMOVIDO: gc.collect() periódico
                     # A garbage collection é agora executada em uma thread separada
                     # pelo MemoryManager. Isto não bloqueia o loop de envio.
             except Exception as e:
                 self.logger.error(f"Erro no loop de envio ao FindFace: {e}", exc_info=True)
+        
+        self._release_coalesced()
+    
+    def _next_group(self) -> Optional[List[Event]]:
+        """
+        Obtém o próximo envio: um evento ou um grupo de eventos do mesmo frame.
+        
+        Sem coalescer, cada evento da fila é um envio. Com coalescer, o evento
+        lido fica retido até seu grupo ficar pronto.
+        
+        :return: Eventos a enviar juntos, ou None se nada está pronto.
+        """
+        if self.coalescer is not None:
+            group = self.coalescer.pop_ready()
+            if group is not None:
+                return group
+        
+        event = self.findface_queue.get(block=True, timeout=self._dequeue_timeout())
+        if event is None:
+            return self.coalescer.pop_ready() if self.coalescer is not None else None
+        
+        self.logger.debug(
+            f"Consumido evento {event.id.value() if event.id else 'UNKNOWN'} da fila do FindFace "
+            f"(câmera: {event.camera_id.value() if event.camera_id else 'UNKNOWN'}, tamanho fila: {self.findface_queue.qsize()})"
+        )
+        
+        if self.coalescer is None or not self.coalescer.offer(event):
+            return [event]
+        return self.coalescer.pop_ready()
+    
+    def _dequeue_timeout(self) -> float:
+        """Timeout da leitura na fila (curto o bastante para liberar grupos no prazo)."""
+        if self.coalescer is None:
+            return self.queue_timeout
+        return max(0.05, min(self.queue_timeout, self.coalescer.window))
+    
+    def _release_coalesced(self):
+        """Na parada, devolve à fila os eventos ainda retidos no coalescer."""
+        if self.coalescer is None:
+            return
+        for events in self.coalescer.close():
+            for event in events:
+                self._requeue_or_spill(event, None)
+                try:
+                    self.findface_queue.task_done()
+                except Exception as e:
+                    self.logger.warning(f"Erro ao marcar task_done: {e}")
     
     def _send_event(self, event: Event):
         """
         Envia um evento ao FindFace.
         
-        IMPORTANTE: Após esta função (com ou sem erro), o evento deve ser
-        completamente descartado da memória via cleanup().
-        
         :param event: Evento a enviar.
         """
-        fullframe_bytes = None  # Inicializa como None para evitar erro no finally
+        self._send_group([event])
+    
+    def _send_group(self, events: List[Event]):
+        """
+        Envia ao FindFace um evento, ou vários do mesmo frame em uma requisição.
+        
+        IMPORTANTE: Após esta função (com ou sem erro), os eventos devem ser
+        completamente descartados da memória via cleanup().
+        
+        A vaga do limitador (se houver) reservada em _send_loop é liberada
+        aqui, com a latência e o resultado da chamada ao FindFace.
+        
+        :param events: Eventos a enviar (mesmo frame).
+        """
+        event = events[0]
+        payload = None  # Inicializa como None para evitar erro no finally
+        latency = None
+        success = False
         
         try:
-            try:
-                # Extrai informações do evento com proteção contra None
-                camera_id = event.camera_id.value() if event.camera_id else None
-                camera_token = event.camera_token.value() if event.camera_token else None
-                # Timestamp em formato ISO com timezone
-                timestamp = event.frame.timestamp.iso_format_with_tz() if event.frame else None
-                bbox = event.bbox.value() if event.bbox else None
-                fullframe = event.frame.full_frame.value() if event.frame and event.frame.full_frame else None
-                
-                # Valida se todos os dados foram extraídos
-                if camera_id is None or camera_token is None or timestamp is None or bbox is None or fullframe is None:
-                    raise ValueError(f"Evento incompleto: faltam dados necessários")
-            except Exception as e:
-                self.logger.error(f"Erro ao extrair informações do evento: {e}", exc_info=True)
-                raise
-            
-            try:
-                # Converte bbox para ROI [left, top, right, bottom]
-                roi = [
-                    int(bbox[0]),  # left (x1)
-                    int(bbox[1]),  # top (y1)
-                    int(bbox[2]),  # right (x2)
-                    int(bbox[3])   # bottom (y2)
-                ]
-            except Exception as e:
-                self.logger.error(f"Erro ao converter bbox para ROI: {e}", exc_info=True)
-                raise
-            
-            try:
-                # Converte fullframe numpy array para bytes
-                import cv2
-                _, buffer = cv2.imencode('.jpg', fullframe)
-                fullframe_bytes = buffer.tobytes()
-                
-                # Libera buffer de memória imediatamente
-                del buffer
-                del fullframe  # Libera frame grande da memória
-            except Exception as e:
-                self.logger.error(f"Erro ao codificar frame para JPEG: {e}", exc_info=True)
-                raise
+            payload = self._prepare_group_payload(events)
             
+            start = time.monotonic()
             try:
                 # Envia ao FindFace usando o SDK
-                response = self.findface_client.add_face_event(
-                    token=camera_token,
-                    fullframe=fullframe_bytes,
-                    camera=camera_id,
-                    timestamp=timestamp,
-                    roi=roi,
-                    mf_selector="biggest"
-                )
+                response = self.findface_client.add_face_event(**payload)
+                success = True
+            except CircuitOpenError:
+                raise
             except Exception as e:
-                self._failure_count += 1
                 self.logger.error(
                     f"Erro ao chamar FindFace API para evento {event.id.value() if event.id else 'UNKNOWN'}: {e}",
                     exc_info=True
                 )
                 raise
+            finally:
+                latency = time.monotonic() - start
             
-            try:
-                self._success_count += 1
-                
-                # Extrai informações do resultado com proteção
-                findface_event_id = response.get('id', 'N/A') if response else 'N/A'
-                matches_count = response.get('matches', {}).get('count', 0) if isinstance(response.get('matches') if response else None, dict) else 0
-                
-                # Log com proteção contra None
-                event_id = event.id.value() if event.id else 'UNKNOWN'
-                camera_name = event.camera_name.value() if event.camera_name else 'UNKNOWN'
-                quality = event.face_quality_score.value() if event.face_quality_score else 0.0
-                
-                self.logger.info(
-                    f"✓ Evento {event_id} enviado ao FindFace | "
-                    f"câmera: {camera_name} | "
-                    f"qualidade: {quality:.4f} | "
-                    f"findface_id: {findface_event_id} | "
-                    f"matches: {matches_count}"
-                )
-            except Exception as e:
-                self.logger.warning(f"Erro ao processar resposta do FindFace: {e}")
+            self._success_count += len(events)
+            self._log_group_success(events, response)
             
+        except CircuitOpenError as e:
+            # Recusado localmente, sem tocar a rede: os eventos voltam para a fila
+            self.logger.debug(f"Circuito do FindFace aberto: {e}")
+            latency = None  # Sem amostra: a requisição não saiu
+            self._requeue_group(events, payload)
         except Exception as e:
-            self._failure_count += 1
+            self._failure_count += len(events)
             self.logger.error(
                 f"Falha ao enviar evento {event.id.value() if event.id else 'UNKNOWN'} ao FindFace: {e}",
                 exc_info=True
             )
+            if is_transient_error(e):
+                self._spill_to_outbox(event, payload)
         finally:
-            # Libera memória do fullframe_bytes se foi criado
+            if self.limiter is not None:
+                self.limiter.release(latency, success)
+            # Libera memória do JPEG codificado; evento será descartado pelo GC
+            payload = None
+    
+    def _prepare_payload(self, event: Event) -> Dict[str, Any]:
+        """
+        Extrai os dados do evento e codifica o frame em JPEG.
+        
+        Não faz I/O de rede: pode rodar em qualquer thread. Com encode_pool,
+        a codificação roda no pool de codificação (limitada a encode_workers
+        threads, independente do número de senders).
+        
+        :param event: Evento a enviar.
+        :return: Argumentos nomeados para add_face_event.
+        :raises ValueError: Se o evento estiver incompleto.
+        """
+        try:
+            return self.payload_builder.build(event)
+        except Exception as e:
+            self.logger.error(f"Erro ao preparar payload do evento: {e}", exc_info=True)
+            raise
+    
+    def _prepare_group_payload(self, events: List[Event]) -> Dict[str, Any]:
+        """
+        Monta o payload de um envio (um evento ou grupo do mesmo frame).
+        
+        :param events: Eventos a enviar.
+        :return: Argumentos nomeados para add_face_event.
+        :raises ValueError: Se o evento estiver incompleto.
+        """
+        if len(events) == 1:
+            return self._prepare_payload(events[0])
+        try:
+            return self.payload_builder.build_group(events)
+        except Exception as e:
+            self.logger.error(f"Erro ao preparar payload de {len(events)} eventos: {e}", exc_info=True)
+            raise
+    
+    def _circuit_wait_time(self) -> float:
+        """
+        Tempo a aguardar antes de consumir a fila, se o circuito estiver aberto.
+        
+        :return: Segundos de espera (0 se o FindFace pode ser chamado).
+        """
+        breaker = getattr(self.findface_client, "circuit_breaker", None)
+        if breaker is None or not breaker.is_open:
+            return 0.0
+        return min(1.0, max(breaker.retry_after(), 0.1))
+    
+    def _requeue_or_spill(self, event: Event, payload: Optional[Dict[str, Any]]) -> bool:
+        """
+        Devolve à fila um evento recusado pelo circuit breaker.
+        
+        Se a fila estiver cheia, grava na outbox (se houver). Eventos
+        vencidos (EventExpiredError) são descartados.
+        
+        :param event: Evento não enviado.
+        :param payload: Payload já montado, usado apenas pela outbox.
+        :return: True se o evento foi preservado.
+        """
+        try:
+            if self.findface_queue.put(event, block=False):
+                self._requeued_count += 1
+                return True
+        except EventExpiredError as e:
+            self._failure_count += 1
+            self.logger.debug(f"Evento vencido não devolvido à fila do FindFace: {e}")
+            return False
+        self._failure_count += 1
+        if self._spill_to_outbox(event, payload):
+            return True
+        self.logger.warning(
+            f"Fila do FindFace cheia com circuito aberto, evento "
+            f"{event.id.value() if event.id else 'UNKNOWN'} descartado"
+        )
+        return False
+    
+    def _requeue_group(self, events: List[Event], payload: Optional[Dict[str, Any]]):
+        """
+        Devolve à fila os eventos de um envio recusado pelo circuit breaker.
+        
+        Eventos de um grupo que não couberem na fila vão para a outbox: no
+        payload do grupo se nenhum voltou à fila, senão em um payload só com
+        as faces que sobraram (as devolvidas seriam enviadas duas vezes).
+        Vencidos são descartados.
+        
+        :param events: Eventos não enviados.
+        :param payload: Payload já montado, usado apenas pela outbox.
+        """
+        if len(events) == 1:
+            self._requeue_or_spill(events[0], payload)
+            return
+        
+        dropped = []
+        expired = 0
+        for event in events:
             try:
-                if fullframe_bytes is not None:
-                    del fullframe_bytes
-            except Exception as e:
-                self.logger.warning(f"Erro ao deletar fullframe_bytes: {e}")
+                if not self.findface_queue.put(event, block=False):
+                    dropped.append(event)
+            except EventExpiredError:
+                expired += 1
+        self._requeued_count += len(events) - len(dropped) - expired
+        self._failure_count += expired
+        if dropped:
+            self._failure_count += len(dropped)
+            if len(dropped) < len(events) and self.outbox is not None:
+                try:
+                    payload = self._prepare_group_payload(dropped)
+                except Exception:
+                    payload = None
+            if not self._spill_to_outbox(dropped[0], payload):
+                self.logger.warning(
+                    f"Fila do FindFace cheia com circuito aberto, {len(dropped)} eventos descartados"
+                )
+    
+    def _spill_to_outbox(self, event: Event, payload: Optional[Dict[str, Any]]) -> bool:
+        """
+        Grava na outbox um evento cujo envio falhou por indisponibilidade.
+        
+        :param event: Evento não enviado.
+        :param payload: Payload já montado (JPEG codificado).
+        :return: True se o evento foi preservado na outbox.
+        """
+        if self.outbox is None or payload is None:
+            return False
+        try:
+            metadata, data = FindfacePayloadBuilder.to_outbox_record(payload, event)
+            if self.outbox.append(metadata, data):
+                self._spilled_count += 1
+                self.logger.warning(
+                    f"Evento {metadata.get('event_id')} gravado na outbox para reenvio "
+                    f"(pendentes: {len(self.outbox)})"
+                )
+                return True
+            self.logger.error(f"Outbox cheia, evento {metadata.get('event_id')} descartado")
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar evento na outbox: {e}", exc_info=True)
+        return False
+    
+    def _log_success(self, event: Event, response: Optional[Dict[str, Any]]):
+        """
+        Loga o resultado de um envio bem-sucedido.
+        
+        :param event: Evento enviado.
+        :param response: Resposta da API do FindFace.
+        """
+        try:
+            # Extrai informações do resultado com proteção
+            findface_event_id = response.get('id', 'N/A') if response else 'N/A'
+            matches_count = response.get('matches', {}).get('count', 0) if isinstance(response.get('matches') if response else None, dict) else 0
             
-            # Evento será descartado, garbage collection cuidará da limpeza
+            # Log com proteção contra None
+            event_id = event.id.value() if event.id else 'UNKNOWN'
+            camera_name = event.camera_name.value() if event.camera_name else 'UNKNOWN'
+            quality = event.face_quality_score.value() if event.face_quality_score else 0.0
+            
+            self.logger.info(
+                f"✓ Evento {event_id} enviado ao FindFace | "
+                f"câmera: {camera_name} | "
+                f"qualidade: {quality:.4f} | "
+                f"findface_id: {findface_event_id} | "
+                f"matches: {matches_count}"
+            )
+        except Exception as e:
+            self.logger.warning(f"Erro ao processar resposta do FindFace: {e}")
+    
+    def _log_group_success(self, events: List[Event], response: Optional[Dict[str, Any]]):
+        """
+        Loga o resultado de um envio bem-sucedido (evento único ou grupo).
+        
+        :param events: Eventos enviados.
+        :param response: Resposta da API do FindFace.
+        """
+        if len(events) == 1:
+            self._log_success(events[0], response)
+            return
+        
+        event_ids = ", ".join(str(e.id.value()) if e.id else 'UNKNOWN' for e in events)
+        camera_name = events[0].camera_name.value() if events[0].camera_name else 'UNKNOWN'
+        self.logger.info(
+            f"✓ {len(events)} eventos do mesmo frame enviados ao FindFace em uma requisição "
+            f"(mf_selector=all) | câmera: {camera_name} | eventos: {event_ids}"
+        )
     
     def _log_statistics(self):
         """Loga estatísticas de envio."""
@@ -197,5 +413,7 @@ class SendToFindfaceUseCase:
             success_rate = (self._success_count / total) * 100
             self.logger.info(
                 f"Estatísticas de envio: {self._success_count} sucessos, "
-                f"{self._failure_count} falhas ({success_rate:.1f}% taxa de sucesso)"
+                f"{self._failure_count} falhas ({success_rate:.1f}% taxa de sucesso), "
+                f"{self._spilled_count} gravados na outbox, "
+                f"{self._requeued_count} devolvidos à fila (circuito aberto)"
             )
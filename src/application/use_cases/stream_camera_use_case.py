@@ -4,14 +4,17 @@ Use Case para capturar stream RTSP e enfileirar frames.
 
 import cv2
 import logging
+import random
 import time
-from typing import Optional
+from typing import List, Optional, Union
 from threading import Event as ThreadEvent
 
 from src.domain.entities import Camera, Frame
 from src.domain.value_objects import IdVO, TimestampVO, FullFrameVO
 from src.application.queues import FrameQueue
-from src.infrastructure.config.settings import CameraSettingsConfig, PerformanceConfig
+from src.application.services.motion_gate import MotionGate
+from src.infrastructure.capture import FfmpegCapture, FrameRing, PtsClock, SnapshotSampler
+from src.infrastructure.config.settings import CameraSettingsConfig, PerformanceConfig, MotionGateConfig
 
 
 class StreamCameraUseCase:
@@ -23,7 +26,8 @@ class StreamCameraUseCase:
         frame_queue: FrameQueue,
         camera_settings: CameraSettingsConfig,
         performance_config: PerformanceConfig,
-        stop_event: ThreadEvent
+        stop_event: ThreadEvent,
+        motion_gate_config: Optional[MotionGateConfig] = None
     ):
         """
         Inicializa o use case.
@@ -33,6 +37,7 @@ class StreamCameraUseCase:
         :param camera_settings: Configurações de câmera.
         :param performance_config: Configurações de performance.
         :param stop_event: Evento para parar a execução.
+        :param motion_gate_config: Configurações do portão de movimento (opcional).
         """
         self.camera = camera
         self.frame_queue = frame_queue
@@ -42,73 +47,184 @@ class StreamCameraUseCase:
         self.logger = logging.getLogger(f"{__name__}.{camera.camera_name.value()}")
         
         self._frame_counter = 0
-        self._capture: Optional[cv2.VideoCapture] = None
+        self._capture: Optional[Union[cv2.VideoCapture, FfmpegCapture]] = None
+        # Buffers reaproveitados pelo backend opencv (criado no primeiro frame)
+        self._frame_ring: Optional[FrameRing] = None
+        # Horário de captura a partir do PTS do stream (None = horário da leitura)
+        self._pts_clock: Optional[PtsClock] = (
+            PtsClock(camera_settings.pts_max_drift) if camera_settings.pts_timestamps else None
+        )
+        
+        # Supervisão e disponibilidade
+        self._started_at = time.monotonic()
+        self._connected_since: Optional[float] = None
+        self._uptime_total = 0.0
+        self._last_session_uptime = 0.0
+        self._reconnects = 0
+        self._consecutive_failures = 0
+        self._last_error: Optional[str] = None
+        self._read_started_at: Optional[float] = None
+        
+        # Portão de movimento (opcional, estado próprio por câmera)
+        self.motion_gate: Optional[MotionGate] = None
+        if motion_gate_config is not None and motion_gate_config.enabled:
+            self.motion_gate = MotionGate(motion_gate_config.for_camera(camera.camera_name.value()))
+        
+        # Amostrador do stream principal (dual stream, opcional)
+        self.snapshot_sampler: Optional[SnapshotSampler] = None
+        if camera_settings.dual_stream and camera.snapshot_source is not None:
+            self.snapshot_sampler = SnapshotSampler(
+                source=camera.snapshot_source.value(),
+                open_capture=self._open_capture,
+                stop_event=stop_event,
+                fps=camera_settings.snapshot_fps,
+                history_seconds=camera_settings.snapshot_history,
+                ring_slots=camera_settings.frame_ring_slots,
+                pts_clock=PtsClock(camera_settings.pts_max_drift) if camera_settings.pts_timestamps else None,
+                reconnect_delay=camera_settings.rtsp_reconnect_delay,
+                max_backoff=camera_settings.rtsp_max_backoff
+            )
     
     def execute(self):
-        """Executa a captura de frames do stream RTSP."""
-        self.logger.info(f"Iniciando captura da câmera {self.camera.camera_name.value()}")
+        """
+        Supervisiona a captura: reconecta indefinidamente até stop_event.
+        
+        Entre tentativas aplica backoff exponencial com jitter (de
+        rtsp_reconnect_delay até rtsp_max_backoff). Após rtsp_max_retries
+        falhas consecutivas os logs passam a nível de erro, mas a câmera
+        nunca é abandonada. Uma sessão que ficou de pé por rtsp_max_backoff
+        segundos zera a contagem (streams instáveis continuam espaçados).
+        """
+        camera_name = self.camera.camera_name.value()
+        self.logger.info(f"Iniciando captura da câmera {camera_name}")
+        
+        if self.snapshot_sampler is not None:
+            self.snapshot_sampler.start(name=f"Snapshot_{camera_name}")
         
-        retries = 0
-        while not self.stop_event.is_set() and retries < self.camera_settings.rtsp_max_retries:
+        while not self.stop_event.is_set():
             try:
                 self._connect()
                 self._capture_loop()
-            except ConnectionError as e:
-                retries += 1
-                self.logger.error(
-                    f"Erro de conexão na câmera {self.camera.camera_name.value()}: {e}. "
-                    f"Tentativa {retries}/{self.camera_settings.rtsp_max_retries}"
-                )
-                
-                if retries < self.camera_settings.rtsp_max_retries:
-                    try:
-                        self.logger.info(f"Aguardando {self.camera_settings.rtsp_reconnect_delay}s para reconectar...")
-                        time.sleep(self.camera_settings.rtsp_reconnect_delay)
-                    except Exception as sleep_error:
-                        self.logger.warning(f"Erro durante espera para reconectar: {sleep_error}")
-                else:
-                    self.logger.error(f"Máximo de tentativas alcançado para câmera {self.camera.camera_name.value()}")
             except Exception as e:
-                retries += 1
-                self.logger.error(
-                    f"Erro na captura da câmera {self.camera.camera_name.value()}: {e}. "
-                    f"Tentativa {retries}/{self.camera_settings.rtsp_max_retries}",
-                    exc_info=True
-                )
-                
-                if retries < self.camera_settings.rtsp_max_retries:
-                    try:
-                        self.logger.info(f"Aguardando {self.camera_settings.rtsp_reconnect_delay}s para reconectar...")
-                        time.sleep(self.camera_settings.rtsp_reconnect_delay)
-                    except Exception as sleep_error:
-                        self.logger.warning(f"Erro durante espera para reconectar: {sleep_error}")
-                else:
-                    self.logger.error(f"Máximo de tentativas alcançado para câmera {self.camera.camera_name.value()}")
+                self._last_error = str(e)
+                self.logger.debug(f"Sessão da câmera {camera_name} encerrada: {e}", exc_info=True)
             finally:
                 try:
                     self._disconnect()
                 except Exception as disconnect_error:
                     self.logger.warning(f"Erro ao desconectar da câmera: {disconnect_error}")
+            
+            if self.stop_event.is_set():
+                break
+            
+            if self._last_session_uptime >= self.camera_settings.rtsp_max_backoff:
+                self._consecutive_failures = 0
+            self._consecutive_failures += 1
+            self._reconnects += 1
+            
+            delay = self._backoff_delay(self._consecutive_failures)
+            message = (
+                f"Câmera {camera_name} desconectada ({self._last_error or 'stream interrompido'}). "
+                f"Falha {self._consecutive_failures}; reconectando em {delay:.1f}s"
+            )
+            if self._consecutive_failures >= self.camera_settings.rtsp_max_retries:
+                self.logger.error(message)
+            else:
+                self.logger.warning(message)
+            self.stop_event.wait(delay)
         
-        self.logger.info(f"Captura finalizada para câmera {self.camera.camera_name.value()}")
+        self.logger.info(f"Captura finalizada para câmera {camera_name}")
+    
+    def _backoff_delay(self, failures: int) -> float:
+        """
+        Espera antes da próxima reconexão (exponencial, com jitter).
+        
+        :param failures: Falhas consecutivas (>= 1).
+        :return: Segundos de espera.
+        """
+        base = max(0.1, float(self.camera_settings.rtsp_reconnect_delay))
+        ceiling = max(base, float(self.camera_settings.rtsp_max_backoff))
+        delay = min(ceiling, base * (2 ** min(failures - 1, 16)))
+        # Jitter: espalha reconexões de câmeras que caíram juntas
+        return random.uniform(delay / 2, delay)
     
     def _connect(self):
-        """Conecta ao stream RTSP."""
+        """Conecta ao stream RTSP (com timeouts de abertura e leitura, se suportados)."""
         try:
             self.logger.info(f"Conectando ao RTSP: {self.camera.source.value()}")
-            self._capture = cv2.VideoCapture(self.camera.source.value())
+            self._capture = self._open_capture(self.camera.source.value())
             
             if not self._capture.isOpened():
                 raise ConnectionError(f"Não foi possível conectar ao RTSP: {self.camera.source.value()}")
             
+            self._connected_since = time.monotonic()
+            self._last_session_uptime = 0.0
+            if self._pts_clock is not None:
+                self._pts_clock.reset()
+            self._last_error = None
             self.logger.info("Conexão RTSP estabelecida com sucesso")
         except Exception as e:
-            self.logger.error(f"Erro ao conectar ao RTSP: {e}", exc_info=True)
+            self.logger.error(f"Erro ao conectar ao RTSP: {e}")
             raise
     
+    def _open_capture(
+        self,
+        source: str,
+        fps: float = 0.0,
+        ring_slots: Optional[int] = None
+    ) -> Union[cv2.VideoCapture, FfmpegCapture]:
+        """
+        Abre um stream com o backend configurado.
+        
+        :param source: URL do stream.
+        :param fps: Limite de frames entregues pelo backend ffmpeg (0 = todos).
+        :param ring_slots: Buffers do anel do backend ffmpeg (None = frame_ring_slots).
+        :return: Captura (pode não estar aberta; verificar isOpened()).
+        """
+        if self.camera_settings.capture_backend == "ffmpeg":
+            return self._open_ffmpeg(source, fps, ring_slots)
+        params = self._capture_params()
+        if params:
+            return cv2.VideoCapture(source, cv2.CAP_ANY, params)
+        return cv2.VideoCapture(source)
+    
+    def _open_ffmpeg(self, source: str, fps: float = 0.0, ring_slots: Optional[int] = None) -> FfmpegCapture:
+        """Abre o stream com o backend ffmpeg (processo dedicado à câmera)."""
+        settings = self.camera_settings
+        return FfmpegCapture(
+            source,
+            ffmpeg_path=settings.ffmpeg_path,
+            rtsp_transport=settings.ffmpeg_rtsp_transport,
+            threads=settings.ffmpeg_threads,
+            hwaccel=settings.ffmpeg_hwaccel,
+            low_latency=settings.ffmpeg_low_latency,
+            output_width=settings.ffmpeg_output_width,
+            output_height=settings.ffmpeg_output_height,
+            ring_slots=settings.frame_ring_slots if ring_slots is None else ring_slots,
+            fps=fps,
+            open_timeout=settings.rtsp_open_timeout,
+            read_timeout=settings.rtsp_read_timeout
+        )
+    
+    def _capture_params(self) -> List[int]:
+        """Parâmetros de abertura do VideoCapture (timeouts em ms)."""
+        params = []
+        for prop, seconds in (
+            ("CAP_PROP_OPEN_TIMEOUT_MSEC", self.camera_settings.rtsp_open_timeout),
+            ("CAP_PROP_READ_TIMEOUT_MSEC", self.camera_settings.rtsp_read_timeout),
+        ):
+            # Disponíveis a partir do OpenCV 4.5.x (backend FFmpeg)
+            if seconds > 0 and hasattr(cv2, prop):
+                params.extend([getattr(cv2, prop), int(seconds * 1000)])
+        return params
+    
     def _disconnect(self):
         """Desconecta do stream RTSP."""
         try:
+            if self._connected_since is not None:
+                self._last_session_uptime = time.monotonic() - self._connected_since
+                self._uptime_total += self._last_session_uptime
+                self._connected_since = None
             if self._capture is not None:
                 self._capture.release()
                 self._capture = None
@@ -116,18 +232,130 @@ class StreamCameraUseCase:
         except Exception as e:
             self.logger.warning(f"Erro ao desconectar do RTSP: {e}")
     
+    def abandon(self):
+        """
+        Chamado pelo watchdog ao abandonar a thread com leitura travada.
+        
+        No backend ffmpeg encerra o processo filho: o read() bloqueado no
+        pipe retorna e a thread termina. O cv2.VideoCapture não pode ser
+        liberado de outra thread durante um read(); nesse caso a thread só
+        termina quando a leitura retornar.
+        """
+        capture = self._capture
+        if isinstance(capture, FfmpegCapture):
+            capture.release()
+    
+    def read_stalled_for(self) -> float:
+        """
+        Há quanto tempo a leitura em andamento está bloqueada.
+        
+        :return: Segundos desde o início do read() corrente (0 se não está lendo).
+        """
+        started_at = self._read_started_at
+        return time.monotonic() - started_at if started_at is not None else 0.0
+    
+    def get_stats(self) -> dict:
+        """
+        Retorna disponibilidade e estado da conexão.
+        
+        :return: Dicionário com estatísticas.
+        """
+        now = time.monotonic()
+        connected_since = self._connected_since
+        session_uptime = now - connected_since if connected_since is not None else 0.0
+        elapsed = max(now - self._started_at, 1e-6)
+        stats = {
+            "connected": connected_since is not None,
+            "session_uptime_s": round(session_uptime, 1),
+            "availability": round(min(1.0, (self._uptime_total + session_uptime) / elapsed), 4),
+            "reconnects": self._reconnects,
+            "consecutive_failures": self._consecutive_failures,
+            "frames": self._frame_counter,
+            "last_error": self._last_error
+        }
+        capture = self._capture
+        if isinstance(capture, FfmpegCapture):
+            stats["frame_ring"] = capture.get_stats()
+        elif self._frame_ring is not None:
+            stats["frame_ring"] = self._frame_ring.get_stats()
+        if self.snapshot_sampler is not None:
+            stats["snapshot"] = self.snapshot_sampler.get_stats()
+        if self._pts_clock is not None and not isinstance(capture, FfmpegCapture):
+            stats["pts"] = self._pts_clock.get_stats()
+        return stats
+    
+    def _frame_timestamp(self) -> TimestampVO:
+        """
+        Horário de captura do frame recém-lido.
+        
+        Com pts_timestamps, vem do PTS do stream (sem o atraso de buffer e
+        decodificação); o backend ffmpeg não expõe PTS e usa a leitura.
+        
+        :return: TimestampVO com fuso e tempo monotônico.
+        """
+        capture = self._capture
+        if self._pts_clock is None or isinstance(capture, FfmpegCapture):
+            return TimestampVO.now()
+        captured_at, monotonic_ns = self._pts_clock.map(capture.get(cv2.CAP_PROP_POS_MSEC))
+        return TimestampVO(captured_at, monotonic_ns)
+    
+    def _read_frame(self):
+        """
+        Lê o próximo frame, decodificando em um buffer reaproveitado.
+        
+        No backend opencv o primeiro frame define o formato do anel; os
+        seguintes são decodificados nos slots via read(image). Se a resolução
+        do stream mudar, o OpenCV aloca um array novo e o anel é recriado.
+        
+        :return: (sucesso, frame).
+        """
+        capture = self._capture
+        slots = self.camera_settings.frame_ring_slots
+        if isinstance(capture, FfmpegCapture) or slots <= 0:
+            return capture.read()
+        
+        ring = self._frame_ring
+        if ring is None:
+            ret, frame_data = capture.read()
+        else:
+            ret, frame_data = capture.read(ring.acquire())
+        
+        if ret and frame_data is not None and (
+            ring is None or frame_data.shape != ring.shape or frame_data.dtype != ring.dtype
+        ):
+            self._frame_ring = FrameRing(slots, frame_data.shape, frame_data.dtype)
+            self.logger.debug(
+                f"Anel de frames: {slots} buffers de {frame_data.shape} "
+                f"({self._frame_ring.nbytes / (1024 * 1024):.0f} MB)"
+            )
+        return ret, frame_data
+    
     def _capture_loop(self):
         """Loop principal de captura de frames."""
         while not self.stop_event.is_set():
             try:
-                ret, frame_data = self._capture.read()
+                self._read_started_at = time.monotonic()
+                try:
+                    ret, frame_data = self._read_frame()
+                finally:
+                    self._read_started_at = None
                 
                 if not ret or frame_data is None:
+                    self._last_error = "falha ao ler frame"
                     self.logger.warning("Falha ao ler frame do RTSP")
                     break
                 
+                timestamp = self._frame_timestamp()
                 self._frame_counter += 1
                 
+                # Descarta frames sem movimento antes de criar a entidade
+                if self.motion_gate is not None:
+                    try:
+                        if not self.motion_gate.should_process(frame_data):
+                            continue
+                    except Exception as e:
+                        self.logger.warning(f"Erro no portão de movimento, enfileirando frame: {e}")
+                
                 try:
                     # Cria entidade Frame
                     frame = Frame(
@@ -135,7 +363,7 @@ class StreamCameraUseCase:
                         camera_id=self.camera.camera_id,
                         camera_name=self.camera.camera_name,
                         camera_token=self.camera.camera_token,
-                        timestamp=TimestampVO.now(),
+                        timestamp=timestamp,
                         full_frame=FullFrameVO(frame_data)
                     )
                     
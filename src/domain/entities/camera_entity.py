@@ -2,7 +2,7 @@
 Entidade Camera do domínio.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from src.domain.value_objects import IdVO, NameVO, CameraTokenVO, CameraSourceVO
 
 
@@ -17,7 +17,8 @@ class Camera:
         camera_name: NameVO,
         camera_token: CameraTokenVO,
         source: CameraSourceVO,
-        active: bool = True
+        active: bool = True,
+        snapshot_source: Optional[CameraSourceVO] = None
     ):
         """
         Inicializa a entidade Camera.
@@ -27,6 +28,8 @@ class Camera:
         :param camera_token: Token de autenticação da câmera (CameraTokenVO).
         :param source: URL RTSP da câmera (CameraSourceVO).
         :param active: Se a câmera está ativa (bool, padrão: True).
+        :param snapshot_source: URL RTSP do stream principal (alta resolução), usada só
+                                para o frame enviado ao FindFace (opcional).
         :raises TypeError: Se algum parâmetro não for do tipo esperado.
         """
         if not isinstance(camera_id, IdVO):
@@ -44,11 +47,17 @@ class Camera:
         if not isinstance(active, bool):
             raise TypeError(f"active deve ser bool, recebido: {type(active).__name__}")
         
+        if snapshot_source is not None and not isinstance(snapshot_source, CameraSourceVO):
+            raise TypeError(
+                f"snapshot_source deve ser CameraSourceVO, recebido: {type(snapshot_source).__name__}"
+            )
+        
         self._camera_id = camera_id
         self._camera_name = camera_name
         self._camera_token = camera_token
         self._source = source
         self._active = active
+        self._snapshot_source = snapshot_source
 
     @property
     def camera_id(self) -> IdVO:
@@ -75,6 +84,11 @@ class Camera:
         """Retorna se a câmera está ativa."""
         return self._active
 
+    @property
+    def snapshot_source(self) -> Optional[CameraSourceVO]:
+        """Retorna a URL RTSP do stream principal (None se a câmera tem um só stream)."""
+        return self._snapshot_source
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Converte a entidade para um dicionário.
@@ -86,7 +100,8 @@ class Camera:
             'name': self._camera_name.value(),
             'token': self._camera_token.value(),
             'source': self._source.value(),
-            'active': self._active
+            'active': self._active,
+            'snapshot_source': self._snapshot_source.value() if self._snapshot_source else None
         }
 
     @classmethod
@@ -103,7 +118,8 @@ class Camera:
             camera_name=NameVO(data['name']),
             camera_token=CameraTokenVO(data['token']),
             source=CameraSourceVO(data['source']),
-            active=data.get('active', True)
+            active=data.get('active', True),
+            snapshot_source=CameraSourceVO(data['snapshot_source']) if data.get('snapshot_source') else None
         )
 
     def __eq__(self, other) -> bool:
@@ -3,7 +3,6 @@ Entidade Track do domínio.
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
 from src.domain.value_objects import IdVO
 from src.domain.entities.event_entity import Event
 
@@ -95,8 +94,7 @@ class Track:
         if self._last_event is None:
             return False
         
-        last_timestamp = self._last_event.frame.timestamp.value()
-        time_diff = (datetime.now() - last_timestamp).total_seconds()
+        time_diff = self._last_event.frame.timestamp.age_seconds()
         
         return time_diff <= max_inactivity_seconds
 
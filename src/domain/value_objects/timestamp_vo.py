@@ -2,25 +2,36 @@
 Value Object para timestamp.
 """
 
+import time
 from datetime import datetime
+from typing import Optional
 
 
 class TimestampVO:
     """
     Value Object que representa um timestamp (carimbo de data/hora).
+    
+    Opcionalmente carrega o instante equivalente em time.monotonic_ns(),
+    usado em cálculos internos de idade e latência (imune a ajustes do
+    relógio do sistema).
     """
 
-    def __init__(self, timestamp: datetime):
+    def __init__(self, timestamp: datetime, monotonic_ns: Optional[int] = None):
         """
         Inicializa o TimestampVO.
 
-        :param timestamp: Timestamp como objeto datetime.
-        :raises TypeError: Se timestamp não for datetime.
+        :param timestamp: Timestamp como objeto datetime (de preferência com fuso).
+        :param monotonic_ns: Mesmo instante em time.monotonic_ns() (opcional).
+        :raises TypeError: Se timestamp não for datetime ou monotonic_ns não for int.
         """
         if not isinstance(timestamp, datetime):
             raise TypeError(f"timestamp deve ser datetime, recebido: {type(timestamp).__name__}")
         
+        if monotonic_ns is not None and not isinstance(monotonic_ns, int):
+            raise TypeError(f"monotonic_ns deve ser int, recebido: {type(monotonic_ns).__name__}")
+        
         self._value = timestamp
+        self._monotonic_ns = monotonic_ns
 
     def value(self) -> datetime:
         """
@@ -30,6 +41,23 @@ class TimestampVO:
         """
         return self._value
 
+    @property
+    def monotonic_ns(self) -> Optional[int]:
+        """Retorna o instante em time.monotonic_ns() (None se não informado)."""
+        return self._monotonic_ns
+
+    def age_seconds(self) -> float:
+        """
+        Retorna há quantos segundos o timestamp ocorreu.
+        
+        Usa o relógio monotônico quando disponível.
+
+        :return: Idade em segundos.
+        """
+        if self._monotonic_ns is not None:
+            return (time.monotonic_ns() - self._monotonic_ns) / 1e9
+        return time.time() - self.timestamp()
+
     def iso_format(self) -> str:
         """
         Retorna o timestamp no formato ISO 8601.
@@ -107,8 +135,8 @@ class TimestampVO:
     @classmethod
     def now(cls) -> 'TimestampVO':
         """
-        Cria um TimestampVO com o timestamp atual.
+        Cria um TimestampVO com o timestamp atual (com fuso local).
 
         :return: Nova instância de TimestampVO.
         """
-        return cls(datetime.now())
+        return cls(datetime.now().astimezone(), time.monotonic_ns())
@@ -0,0 +1,10 @@
+"""
+Backends de captura de vídeo.
+"""
+
+from src.infrastructure.capture.frame_ring import FrameRing
+from src.infrastructure.capture.ffmpeg_capture import FfmpegCapture
+from src.infrastructure.capture.pts_clock import PtsClock
+from src.infrastructure.capture.snapshot_sampler import SnapshotSampler
+
+__all__ = ['FrameRing', 'FfmpegCapture', 'PtsClock', 'SnapshotSampler']
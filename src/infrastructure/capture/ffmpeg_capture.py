@@ -0,0 +1,315 @@
+"""
+Captura de vídeo por um processo ffmpeg dedicado.
+
+Alternativa ao cv2.VideoCapture com controle de transporte RTSP, threads
+do decodificador, flags de baixa latência, aceleração por hardware e
+redimensionamento na saída. A decodificação roda no processo ffmpeg; o
+Python só copia bytes do pipe (readinto libera o GIL) direto para um slot
+do FrameRing, sem ndarray novo por frame.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.infrastructure.capture.frame_ring import FrameRing
+
+
+class FfmpegCapture:
+    """
+    Fonte de frames BGR lidos de ``ffmpeg -f rawvideo``.
+
+    Segue a interface usada do cv2.VideoCapture (isOpened, read, release),
+    então o StreamCameraUseCase trata os dois backends da mesma forma.
+    """
+
+    # Linhas finais do stderr do ffmpeg guardadas para diagnóstico
+    STDERR_TAIL = 20
+
+    # Opção de timeout do socket RTSP por executável (detectada uma vez)
+    _timeout_options: Dict[str, str] = {}
+    _timeout_options_lock = threading.Lock()
+
+    def __init__(
+        self,
+        source: str,
+        ffmpeg_path: str = "ffmpeg",
+        rtsp_transport: str = "tcp",
+        threads: int = 0,
+        hwaccel: str = "",
+        low_latency: bool = True,
+        output_width: int = 0,
+        output_height: int = 0,
+        ring_slots: int = 8,
+        fps: float = 0.0,
+        open_timeout: float = 10.0,
+        read_timeout: float = 10.0
+    ):
+        """
+        Descobre o tamanho do frame e inicia o processo ffmpeg.
+
+        :param source: URL do stream (ou arquivo).
+        :param ffmpeg_path: Executável do ffmpeg (o ffprobe é procurado ao lado).
+        :param rtsp_transport: Transporte RTSP ("tcp" ou "udp").
+        :param threads: Threads do decodificador (0 = automático).
+        :param hwaccel: Aceleração por hardware do ffmpeg (ex.: "cuda"; "" = desativada).
+        :param low_latency: Desativa o buffer de entrada do ffmpeg (nobuffer, low_delay).
+        :param output_width: Largura de saída (0 = nativa; só largura mantém a proporção).
+        :param output_height: Altura de saída (0 = nativa ou proporcional à largura).
+        :param ring_slots: Buffers pré-alocados no anel de frames.
+        :param fps: Limita os frames entregues (0 = todos); o ffmpeg decodifica tudo,
+                    mas só converte e envia pelo pipe os frames amostrados.
+        :param open_timeout: Timeout (s) da descoberta do tamanho do frame.
+        :param read_timeout: Timeout (s) de I/O do socket RTSP (0 = padrão do ffmpeg).
+        """
+        self.source = source
+        self.ffmpeg_path = ffmpeg_path
+        self.rtsp_transport = rtsp_transport
+        self.threads = threads
+        self.hwaccel = hwaccel
+        self.low_latency = low_latency
+        self.fps = fps
+        self.open_timeout = open_timeout
+        self.read_timeout = read_timeout
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self.ring: Optional[FrameRing] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._stderr_tail: deque = deque(maxlen=self.STDERR_TAIL)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._frame_bytes = 0
+
+        try:
+            size = self._output_size(int(output_width), int(output_height))
+        except Exception as e:
+            self.logger.error(f"Não foi possível obter o tamanho do frame de {source}: {e}")
+            return
+
+        width, height = size
+        self.ring = FrameRing(ring_slots, (height, width, 3))
+        self._frame_bytes = width * height * 3
+        self._start(size)
+
+    @property
+    def is_rtsp(self) -> bool:
+        return self.source.lower().startswith(("rtsp://", "rtsps://"))
+
+    def _input_args(self) -> List[str]:
+        """Opções de entrada comuns ao ffmpeg e ao ffprobe."""
+        args = []
+        if self.is_rtsp:
+            args += ["-rtsp_transport", self.rtsp_transport]
+            if self.read_timeout > 0:
+                # Timeout de I/O do socket, em microssegundos
+                option = self._socket_timeout_option(self.ffmpeg_path)
+                args += [option, str(int(self.read_timeout * 1_000_000))]
+        return args
+
+    @classmethod
+    def _socket_timeout_option(cls, ffmpeg_path: str) -> str:
+        """
+        Nome da opção de timeout do socket RTSP para a versão instalada.
+
+        Até o FFmpeg 4.x é -stimeout (lá -timeout coloca o RTSP em modo de
+        escuta); a partir do 5.0 é -timeout. A versão é lida de
+        ``ffmpeg -version`` uma vez por executável.
+
+        :param ffmpeg_path: Executável do ffmpeg.
+        :return: "-stimeout" ou "-timeout".
+        """
+        with cls._timeout_options_lock:
+            option = cls._timeout_options.get(ffmpeg_path)
+            if option is None:
+                major = cls._major_version(ffmpeg_path)
+                option = "-stimeout" if major is not None and major < 5 else "-timeout"
+                cls._timeout_options[ffmpeg_path] = option
+            return option
+
+    @staticmethod
+    def _major_version(ffmpeg_path: str) -> Optional[int]:
+        """
+        Versão principal do ffmpeg (None se desconhecida, ex.: builds do git).
+
+        :param ffmpeg_path: Executável do ffmpeg.
+        """
+        try:
+            result = subprocess.run(
+                [ffmpeg_path, "-version"],
+                capture_output=True,
+                text=True,
+                timeout=5.0
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = re.search(r"version\s+n?(\d+)\.", result.stdout)
+        return int(match.group(1)) if match else None
+
+    def _output_size(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        Tamanho dos frames entregues.
+
+        Com largura e altura configuradas não há sonda (evita uma conexão
+        RTSP a mais); caso contrário o tamanho nativo vem do ffprobe.
+
+        :return: (largura, altura).
+        """
+        if width > 0 and height > 0:
+            return width, height
+
+        native_width, native_height = self._probe_size()
+        if width > 0:
+            # Proporcional à largura, arredondado para par (exigência de vários codecs)
+            return width, max(2, int(round(native_height * width / native_width / 2)) * 2)
+        if height > 0:
+            return max(2, int(round(native_width * height / native_height / 2)) * 2), height
+        return native_width, native_height
+
+    def _probe_size(self) -> Tuple[int, int]:
+        """
+        Lê largura e altura nativas do primeiro stream de vídeo com ffprobe.
+
+        :return: (largura, altura).
+        :raises RuntimeError: Se o ffprobe falhar.
+        """
+        directory, name = os.path.split(self.ffmpeg_path)
+        ffprobe_path = os.path.join(directory, name.replace("ffmpeg", "ffprobe"))
+        command = [
+            ffprobe_path, "-v", "error", *self._input_args(),
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height",
+            "-of", "csv=p=0:s=x",
+            self.source
+        ]
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=self.open_timeout if self.open_timeout > 0 else None
+        )
+        output = result.stdout.strip().splitlines()
+        if result.returncode != 0 or not output:
+            raise RuntimeError(result.stderr.strip() or f"ffprobe retornou {result.returncode}")
+        width, height = output[0].split("x")[:2]
+        return int(width), int(height)
+
+    def _command(self, size: Tuple[int, int]) -> List[str]:
+        """Linha de comando do ffmpeg."""
+        command = [self.ffmpeg_path, "-hide_banner", "-nostdin", "-loglevel", "error"]
+        if self.low_latency:
+            command += ["-fflags", "nobuffer", "-flags", "low_delay"]
+        if self.hwaccel:
+            command += ["-hwaccel", self.hwaccel]
+        if self.threads > 0:
+            command += ["-threads", str(self.threads)]
+        command += [*self._input_args(), "-i", self.source, "-an", "-sn", "-dn"]
+        filters = [f"scale={size[0]}:{size[1]}"]
+        if self.fps > 0:
+            filters.append(f"fps={self.fps:g}")
+        command += ["-vf", ",".join(filters)]
+        command += ["-pix_fmt", "bgr24", "-f", "rawvideo", "pipe:1"]
+        return command
+
+    def _start(self, size: Tuple[int, int]):
+        """Inicia o processo ffmpeg e a thread que drena o stderr."""
+        try:
+            # bufsize=0: stdout sem buffer, readinto vai direto ao slot
+            self._process = subprocess.Popen(
+                self._command(size),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=0
+            )
+        except OSError as e:
+            self.logger.error(f"Não foi possível iniciar o ffmpeg ({self.ffmpeg_path}): {e}")
+            self._process = None
+            return
+
+        self._stderr_thread = threading.Thread(
+            target=self._drain_stderr,
+            name="FfmpegStderr",
+            daemon=True
+        )
+        self._stderr_thread.start()
+
+    def _drain_stderr(self):
+        """Consome o stderr (evita bloquear o ffmpeg) guardando as últimas linhas."""
+        process = self._process
+        if process is None or process.stderr is None:
+            return
+        try:
+            for line in iter(process.stderr.readline, b""):
+                self._stderr_tail.append(line.decode(errors="replace").rstrip())
+        except (OSError, ValueError):
+            pass
+
+    def isOpened(self) -> bool:
+        """True se o processo ffmpeg está rodando."""
+        return self._process is not None and self._process.poll() is None
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Lê o próximo frame para um buffer do anel.
+
+        :return: (sucesso, frame BGR); o frame é uma view do anel.
+        """
+        process = self._process
+        if process is None or process.stdout is None:
+            return False, None
+
+        frame = self.ring.acquire()
+        buffer = memoryview(frame).cast("B")
+        filled = 0
+        try:
+            while filled < self._frame_bytes:
+                count = process.stdout.readinto(buffer[filled:])
+                if not count:
+                    self._log_exit()
+                    return False, None
+                filled += count
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Erro ao ler o pipe do ffmpeg: {e}")
+            return False, None
+        finally:
+            buffer.release()
+        return True, frame
+
+    def _log_exit(self):
+        """Registra o fim do stream com o final do stderr do ffmpeg."""
+        tail = " | ".join(list(self._stderr_tail)[-3:])
+        self.logger.warning(f"ffmpeg encerrou o stream de {self.source}" + (f": {tail}" if tail else ""))
+
+    def release(self):
+        """Encerra o processo ffmpeg."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.terminate()
+            try:
+                process.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=2.0)
+        except Exception as e:
+            self.logger.warning(f"Erro ao encerrar o ffmpeg: {e}")
+        finally:
+            for stream in (process.stdout, process.stderr):
+                if stream is not None:
+                    stream.close()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join(timeout=1.0)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do anel de frames.
+
+        :return: Dicionário com estatísticas.
+        """
+        return self.ring.get_stats() if self.ring is not None else {}
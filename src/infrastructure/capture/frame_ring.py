@@ -0,0 +1,97 @@
+"""
+Anel de buffers de frame pré-alocados.
+
+Cada slot é um ndarray próprio, alocado uma vez. acquire() entrega uma view
+do slot; toda view (e toda sub-view, como recortes de bbox) mantém o slot
+referenciado através de ``.base``. Um slot volta a ser usado só quando a
+contagem de referências cai ao mínimo do anel, ou seja, quando o último
+Frame/Event que apontava para ele foi descartado.
+"""
+
+import sys
+import threading
+from typing import Tuple
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    Buffers de frame de formato fixo reaproveitados.
+
+    acquire() entrega sempre o slot livre de menor índice (LIFO), e não o
+    próximo em ordem circular: os mesmos poucos slots são reciclados e os
+    demais nunca são escritos. Como np.empty só reserva a memória, slots
+    intocados não ocupam RAM; o consumo acompanha a profundidade real de
+    frames em uso, e a quantidade de slots é apenas o teto.
+
+    Se todos os slots ainda estiverem em uso (fila cheia, tracks longos), um
+    buffer avulso é alocado e contado como falta, sem bloquear a captura.
+    Com zero slots todo acquire() aloca um buffer novo.
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, ...], dtype=np.uint8):
+        """
+        Aloca os slots.
+
+        :param slots: Quantidade de buffers (0 = sem reaproveitamento).
+        :param shape: Formato de cada frame (altura, largura, canais).
+        :param dtype: Tipo dos pixels.
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._slots = [np.empty(self.shape, dtype=self.dtype) for _ in range(max(0, int(slots)))]
+        self._lock = threading.Lock()
+        # Referências de um slot livre: a lista + o argumento de getrefcount
+        probe = [np.empty(0)]
+        self._free_refcount = sys.getrefcount(probe[0])
+
+        self._acquired = 0
+        self._misses = 0
+        self._peak = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memória total dos slots, em bytes."""
+        return sum(slot.nbytes for slot in self._slots)
+
+    def acquire(self) -> np.ndarray:
+        """
+        Obtém um buffer gravável para o próximo frame.
+
+        :return: View do primeiro slot livre (ou buffer avulso, se todos estiverem em uso).
+        """
+        with self._lock:
+            self._acquired += 1
+            for index in range(len(self._slots)):
+                slot = self._slots[index]
+                if sys.getrefcount(slot) <= self._free_refcount + 1:  # +1: variável local
+                    self._peak = max(self._peak, index + 1)
+                    return slot[...]
+            self._misses += 1
+        return np.empty(self.shape, dtype=self.dtype)
+
+    def in_use(self) -> int:
+        """Slots atualmente referenciados por frames."""
+        with self._lock:
+            return sum(
+                1 for slot in self._slots
+                if sys.getrefcount(slot) > self._free_refcount + 1
+            )
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de uso do anel.
+
+        :return: Dicionário com estatísticas.
+        """
+        in_use = self.in_use()
+        with self._lock:
+            return {
+                "slots": len(self._slots),
+                "in_use": in_use,
+                "peak": self._peak,  # Slots já escritos (os demais não ocupam RAM)
+                "acquired": self._acquired,
+                "misses": self._misses,
+                "mb": round(self.nbytes / (1024 * 1024), 1)
+            }
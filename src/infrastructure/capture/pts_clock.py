@@ -0,0 +1,83 @@
+"""
+Conversão do PTS do stream em horário de captura.
+
+O instante em que read() retorna inclui o buffer de rede e o atraso do
+decodificador. O PTS (CAP_PROP_POS_MSEC) marca quando o frame foi gerado
+na câmera, mas em uma escala própria do stream. O relógio ancora essa
+escala no relógio do sistema pelo menor atraso observado e reancora se o
+PTS voltar, parar ou derivar além do limite.
+"""
+
+import math
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class PtsClock:
+    """Mapeia PTS (ms) para horário de parede e tempo monotônico (ns)."""
+
+    def __init__(self, max_drift: float = 2.0):
+        """
+        Inicializa o relógio.
+
+        :param max_drift: Atraso adicional (s) sobre a âncora a partir do qual
+                          o PTS é reancorado (derivas de clock, saltos do stream).
+        """
+        self.max_drift = max(0.1, float(max_drift))
+        self._offset: Optional[float] = None
+        self._last_pts: Optional[float] = None
+
+        self._reanchors = 0
+        self._fallbacks = 0
+        self._delay = 0.0
+
+    def reset(self) -> None:
+        """Descarta a âncora (nova sessão: o PTS recomeça)."""
+        self._offset = None
+        self._last_pts = None
+
+    def map(self, pts_ms: Optional[float]) -> Tuple[datetime, int]:
+        """
+        Converte o PTS do frame recém-lido.
+
+        :param pts_ms: Posição do frame no stream (ms); None/inválido usa o relógio atual.
+        :return: (horário de captura com fuso, tempo monotônico em ns).
+        """
+        wall = time.time()
+        mono = time.monotonic_ns()
+
+        if pts_ms is None or not math.isfinite(pts_ms) or pts_ms < 0 or pts_ms / 1000.0 == self._last_pts:
+            # Backend sem PTS (ou PTS parado): horário da leitura
+            self._fallbacks += 1
+            return datetime.fromtimestamp(wall).astimezone(), mono
+
+        pts = pts_ms / 1000.0
+        offset = wall - pts
+        if self._offset is None or pts < self._last_pts:
+            if self._offset is not None:
+                self._reanchors += 1
+            self._offset = offset
+        elif offset < self._offset:
+            # Frame chegou com menos atraso: âncora mais precisa
+            self._offset = offset
+        elif offset - self._offset > self.max_drift:
+            self._reanchors += 1
+            self._offset = offset
+        self._last_pts = pts
+
+        captured_at = pts + self._offset
+        self._delay = wall - captured_at
+        return datetime.fromtimestamp(captured_at).astimezone(), mono - int(self._delay * 1e9)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do mapeamento.
+
+        :return: Dicionário com estatísticas.
+        """
+        return {
+            "delay_ms": round(self._delay * 1000, 1),  # Atraso da leitura além do mínimo observado
+            "reanchors": self._reanchors,
+            "fallbacks": self._fallbacks
+        }
@@ -0,0 +1,191 @@
+"""
+Amostragem do stream principal (alta resolução) de uma câmera.
+
+A detecção roda no sub-stream; o stream principal só fornece o frame que
+vai ao FindFace. O amostrador mantém o stream aberto (o codec precisa de
+todos os pacotes), mas só converte para BGR alguns frames por segundo e
+guarda um histórico curto, de onde sai o frame mais próximo do instante
+do melhor evento de cada track.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.infrastructure.capture.ffmpeg_capture import FfmpegCapture
+from src.infrastructure.capture.frame_ring import FrameRing
+from src.infrastructure.capture.pts_clock import PtsClock
+
+
+class SnapshotSampler:
+    """
+    Thread que amostra o stream principal de uma câmera em um FrameRing.
+
+    Com cv2.VideoCapture, todos os frames passam por grab() (decodificação)
+    e só os amostrados por retrieve() (conversão de cor e cópia). Com o
+    backend ffmpeg o limite de fps é aplicado no próprio ffmpeg.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        open_capture: Callable[[str, float], Any],
+        stop_event: threading.Event,
+        fps: float = 5.0,
+        history_seconds: float = 2.0,
+        ring_slots: int = 8,
+        pts_clock: Optional[PtsClock] = None,
+        reconnect_delay: float = 5.0,
+        max_backoff: float = 60.0
+    ):
+        """
+        Inicializa o amostrador (a thread só começa em start()).
+
+        :param source: URL RTSP do stream principal.
+        :param open_capture: Abre uma captura: (url, fps, ring_slots) -> objeto com isOpened/read/release.
+        :param stop_event: Evento de parada da câmera.
+        :param fps: Frames convertidos por segundo.
+        :param history_seconds: Janela de frames amostrados mantida em memória.
+        :param ring_slots: Buffers reaproveitados para os frames amostrados (no mínimo o histórico + 2; 0 = desativado).
+        :param pts_clock: Relógio de PTS para datar as amostras (None = horário da leitura).
+        :param reconnect_delay: Espera inicial entre reconexões (dobra a cada falha).
+        :param max_backoff: Espera máxima entre reconexões.
+        """
+        self.source = source
+        self.open_capture = open_capture
+        self.stop_event = stop_event
+        self.fps = max(0.1, float(fps))
+        self.pts_clock = pts_clock
+        self.reconnect_delay = max(0.1, float(reconnect_delay))
+        self.max_backoff = max(self.reconnect_delay, float(max_backoff))
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        history_len = max(2, int(round(self.fps * history_seconds)) + 1)
+        # O histórico mantém history_len slots referenciados o tempo todo
+        self.ring_slots = max(int(ring_slots), history_len + 2) if ring_slots > 0 else 0
+        self._history: Deque[Tuple[float, np.ndarray]] = deque(maxlen=history_len)
+        self._lock = threading.Lock()
+        self._ring: Optional[FrameRing] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self._samples = 0
+        self._hits = 0
+        self._misses = 0
+        self._reconnects = 0
+
+    def start(self, name: str = "SnapshotSampler") -> None:
+        """
+        Inicia a thread de amostragem.
+
+        :param name: Nome da thread.
+        """
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def nearest(self, timestamp: float, max_skew: float) -> Optional[np.ndarray]:
+        """
+        Frame amostrado mais próximo de um instante.
+
+        :param timestamp: Instante desejado (epoch, segundos).
+        :param max_skew: Diferença máxima aceita (s).
+        :return: Frame BGR (view do anel, somente leitura) ou None.
+        """
+        with self._lock:
+            best = min(self._history, key=lambda item: abs(item[0] - timestamp), default=None)
+            if best is None or abs(best[0] - timestamp) > max_skew:
+                self._misses += 1
+                return None
+            self._hits += 1
+            return best[1]
+
+    def _run(self):
+        """Mantém o stream aberto e amostra frames até stop_event."""
+        failures = 0
+        while not self.stop_event.is_set():
+            capture = None
+            started_at = time.monotonic()
+            try:
+                if self.pts_clock is not None:
+                    self.pts_clock.reset()
+                capture = self.open_capture(self.source, self.fps, self.ring_slots)
+                if not capture.isOpened():
+                    raise ConnectionError("não foi possível abrir o stream principal")
+                self._sample_loop(capture)
+            except Exception as e:
+                self.logger.warning(f"Stream principal {self.source} interrompido: {e}")
+            finally:
+                if capture is not None:
+                    try:
+                        capture.release()
+                    except Exception as e:
+                        self.logger.debug(f"Erro ao liberar o stream principal: {e}")
+                with self._lock:
+                    self._history.clear()
+
+            if self.stop_event.is_set():
+                break
+            failures = 1 if time.monotonic() - started_at >= self.max_backoff else failures + 1
+            self._reconnects += 1
+            self.stop_event.wait(min(self.max_backoff, self.reconnect_delay * (2 ** min(failures - 1, 16))))
+
+    def _sample_loop(self, capture: Any):
+        """
+        Lê o stream e guarda os frames amostrados.
+
+        :param capture: Captura aberta.
+        """
+        interval = 1.0 / self.fps
+        next_sample = 0.0
+        while not self.stop_event.is_set():
+            if isinstance(capture, FfmpegCapture):
+                ok, image = capture.read()
+            else:
+                # Todo pacote precisa ser decodificado; só o amostrado é convertido
+                if not capture.grab():
+                    raise ConnectionError("falha ao ler o stream principal")
+                now = time.monotonic()
+                if now < next_sample:
+                    continue
+                next_sample = now + interval
+                ring = self._ring
+                ok, image = capture.retrieve(ring.acquire()) if ring is not None else capture.retrieve()
+                if ok and image is not None and (
+                    ring is None or image.shape != ring.shape or image.dtype != ring.dtype
+                ):
+                    self._ring = FrameRing(self.ring_slots, image.shape, image.dtype)
+
+            if not ok or image is None:
+                raise ConnectionError("falha ao ler o stream principal")
+
+            image.flags.writeable = False
+            captured_at = self._sample_time(capture)
+            with self._lock:
+                self._history.append((captured_at, image))
+                self._samples += 1
+
+    def _sample_time(self, capture: Any) -> float:
+        """Horário (epoch) do frame amostrado, pelo PTS quando disponível."""
+        if self.pts_clock is None or isinstance(capture, FfmpegCapture):
+            return time.time()
+        captured_at, _ = self.pts_clock.map(capture.get(cv2.CAP_PROP_POS_MSEC))
+        return captured_at.timestamp()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da amostragem.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            return {
+                "samples": self._samples,
+                "history": len(self._history),
+                "hits": self._hits,
+                "misses": self._misses,
+                "reconnects": self._reconnects
+            }
@@ -2,7 +2,11 @@
 Clientes externos (Infrastructure Layer).
 """
 
-from .findface_multi import FindfaceMulti
-from .findface_async import FindfaceMultiAsync
+from .findface_multi import FindfaceMulti, FindfaceHTTPError, is_transient_error
+from .findface_async import FindfaceMultiAsync, FindfaceAsyncClient
+from .adaptive_limiter import AdaptiveConcurrencyLimiter
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .findface_balancer import FindfaceLoadBalancer, FindfaceNode
 
-__all__ = ['FindfaceMulti', 'FindfaceMultiAsync']
+__all__ = ['FindfaceMulti', 'FindfaceHTTPError', 'is_transient_error', 'FindfaceMultiAsync', 'FindfaceAsyncClient', 'AdaptiveConcurrencyLimiter',
+           'CircuitBreaker', 'CircuitOpenError', 'FindfaceLoadBalancer', 'FindfaceNode']
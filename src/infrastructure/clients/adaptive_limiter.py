@@ -0,0 +1,177 @@
+"""
+Limitador adaptativo de concorrência (AIMD) para requisições ao FindFace.
+
+Mede latência e erros de cada requisição e ajusta o número de requisições
+simultâneas permitidas: aumento aditivo (+1 a cada "janela" de respostas
+rápidas) e redução multiplicativa quando a latência passa do alvo ou a
+requisição falha. A vazão passa a acompanhar o que o servidor absorve.
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de concorrência AIMD thread-safe.
+
+    Uso (threads):
+        if limiter.acquire(timeout=0.5):
+            start = time.monotonic()
+            try:
+                ...
+                limiter.release(time.monotonic() - start, success=True)
+            except Exception:
+                limiter.release(time.monotonic() - start, success=False)
+
+    Uso (asyncio, releases no próprio loop): try_acquire() + release().
+    release() sem latência devolve a vaga sem registrar amostra.
+    """
+
+    # Suavização das médias exponenciais de latência e taxa de erro
+    EWMA_ALPHA = 0.1
+
+    def __init__(
+        self,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        initial_limit: int = 8,
+        latency_target: float = 2.0,
+        backoff_factor: float = 0.7
+    ):
+        """
+        Inicializa o limitador.
+
+        :param min_limit: Concorrência mínima.
+        :param max_limit: Concorrência máxima.
+        :param initial_limit: Concorrência inicial.
+        :param latency_target: Latência (s) acima da qual a concorrência é reduzida.
+        :param backoff_factor: Fator multiplicativo de redução (0-1).
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.latency_target = float(latency_target)
+        self.backoff_factor = min(max(float(backoff_factor), 0.1), 0.95)
+
+        self._limit = float(min(max(int(initial_limit), self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+        # Aumento aditivo: +1 após `limit` respostas boas (≈ uma janela)
+        self._good_since_change = 0
+        # Redução no máximo uma vez por janela (evita colapso em rajadas de erro)
+        self._last_decrease = 0.0
+
+        # Métricas
+        self._latency_ewma: Optional[float] = None
+        self._error_rate_ewma = 0.0
+        self._samples = 0
+        self._errors = 0
+        self._increases = 0
+        self._decreases = 0
+        self._peak_in_flight = 0
+
+    @property
+    def limit(self) -> int:
+        """Concorrência permitida no momento."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requisições em andamento."""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """
+        Tenta reservar uma vaga sem bloquear.
+
+        :return: True se a vaga foi reservada.
+        """
+        with self._condition:
+            return self._try_acquire_locked()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Reserva uma vaga, bloqueando até haver uma (ou timeout).
+
+        :param timeout: Tempo máximo de espera em segundos (None = infinito).
+        :return: True se a vaga foi reservada.
+        """
+        with self._condition:
+            if self._condition.wait_for(self._try_acquire_locked, timeout=timeout):
+                return True
+            return False
+
+    def _try_acquire_locked(self) -> bool:
+        """Reserva uma vaga (lock já adquirido)."""
+        if self._in_flight >= int(self._limit):
+            return False
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        return True
+
+    def release(self, latency: Optional[float] = None, success: bool = True) -> None:
+        """
+        Devolve uma vaga e registra o resultado da requisição.
+
+        :param latency: Duração da requisição em segundos (None = sem amostra).
+        :param success: Se a requisição foi bem-sucedida.
+        """
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            if latency is not None:
+                self._on_sample(latency, success)
+            self._condition.notify_all()
+
+    def _on_sample(self, latency: float, success: bool) -> None:
+        """Atualiza métricas e o limite a partir de uma amostra (lock já adquirido)."""
+        alpha = self.EWMA_ALPHA
+        self._samples += 1
+        self._latency_ewma = latency if self._latency_ewma is None else (
+            (1 - alpha) * self._latency_ewma + alpha * latency
+        )
+        self._error_rate_ewma = (1 - alpha) * self._error_rate_ewma + alpha * (0.0 if success else 1.0)
+
+        if not success:
+            self._errors += 1
+
+        if success and latency <= self.latency_target:
+            self._good_since_change += 1
+            if self._good_since_change >= int(self._limit) and self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1)
+                self._good_since_change = 0
+                self._increases += 1
+            return
+
+        # Falha ou resposta lenta: redução multiplicativa, uma vez por janela
+        now = time.monotonic()
+        if now - self._last_decrease < self.latency_target:
+            return
+        new_limit = max(self.min_limit, int(self._limit * self.backoff_factor))
+        if new_limit < self._limit:
+            self._limit = float(new_limit)
+            self._decreases += 1
+        self._last_decrease = now
+        self._good_since_change = 0
+
+    def get_stats(self) -> dict:
+        """
+        Retorna métricas do limitador.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "peak_in_flight": self._peak_in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "latency_ewma": self._latency_ewma or 0.0,
+                "error_rate_ewma": self._error_rate_ewma,
+                "samples": self._samples,
+                "errors": self._errors,
+                "increases": self._increases,
+                "decreases": self._decreases
+            }
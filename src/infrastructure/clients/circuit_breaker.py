@@ -0,0 +1,115 @@
+"""
+Circuit breaker para chamadas ao FindFace.
+
+Após N falhas consecutivas o circuito abre e as chamadas falham na hora
+(sem tocar a rede) durante reset_timeout segundos. Depois disso uma única
+chamada de teste passa (half-open): sucesso fecha o circuito, falha reabre.
+"""
+
+import threading
+import time
+
+
+class CircuitOpenError(ConnectionError):
+    """Chamada recusada localmente porque o circuito está aberto."""
+
+
+class CircuitBreaker:
+    """Circuit breaker thread-safe (closed -> open -> half-open -> closed)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Inicializa o circuit breaker.
+
+        :param failure_threshold: Falhas consecutivas para abrir o circuito.
+        :param reset_timeout: Segundos em aberto antes da chamada de teste.
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = float(reset_timeout)
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Estatísticas
+        self._times_opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Estado atual do circuito."""
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True enquanto chamadas seriam recusadas (não consome a chamada de teste)."""
+        with self._lock:
+            if self._state == self.OPEN:
+                return time.monotonic() - self._opened_at < self.reset_timeout
+            return self._state == self.HALF_OPEN and self._probe_in_flight
+
+    def retry_after(self) -> float:
+        """Segundos até a próxima chamada de teste (0 se o circuito não está aberto)."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow_request(self) -> bool:
+        """
+        Decide se uma chamada pode seguir para a rede.
+
+        :return: True se permitida; False se o circuito está aberto.
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Registra chamada bem-sucedida (fecha o circuito)."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._state = self.CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Registra falha (abre o circuito ao atingir o limite ou se falhar em half-open)."""
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._times_opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estado e estatísticas do circuito.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "times_opened": self._times_opened,
+                "rejected": self._rejected
+            }
@@ -14,13 +14,19 @@ de usar async/await em versões futuras.
 Por enquanto, mantém pool de conexões para reusar conexões TCP.
 """
 
+import asyncio
 import logging
-from typing import Optional, Any, Dict
+import time
+from typing import Optional, Any, Dict, List, Union
 try:
     import httpx
 except ImportError:
     httpx = None
 
+from .findface_multi import FindfaceMulti, FindfaceHTTPError, _PooledSession
+from .circuit_breaker import CircuitOpenError
+from .multipart_body import MultipartBody
+
 
 class FindfaceMultiAsync:
     """
@@ -155,11 +161,6 @@ class FindfaceMultiAsync:
                 "Authorization": f"Token {self.client.token}"
             }
             
-            # Monta multipart form data
-            files = {
-                "fullframe": ("image.jpg", fullframe, "image/jpeg")
-            }
-            
             data = {
                 "camera": camera,
                 "timestamp": timestamp,
@@ -167,12 +168,15 @@ class FindfaceMultiAsync:
                 "roi": str(roi)  # Converte dict para string
             }
             
+            # Monta multipart form data (imagem enviada do buffer, sem cópia)
+            body = MultipartBody(data, {"fullframe": ("image.jpg", fullframe, "image/jpeg")})
+            headers.update(body.headers)
+            
             # Usa client com pool de conexões
             response = self._http_client.post(
                 url,
                 headers=headers,
-                files=files,
-                data=data
+                content=body
             )
             
             if response.status_code == 200:
@@ -217,3 +221,220 @@ class FindfaceMultiAsync:
     def __del__(self) -> None:
         """Garante fechamento de pool ao destruir objeto."""
         self.close()
+
+
+class FindfaceAsyncClient:
+    """
+    Cliente assíncrono (httpx.AsyncClient) para envio de eventos de face.
+    
+    Diferente do FindfaceMultiAsync (pool síncrono), aqui cada upload é uma
+    corrotina: centenas de envios simultâneos compartilham um único event
+    loop e um pool de conexões, sem uma thread por requisição.
+    
+    Usa o cliente FindfaceMulti apenas para URL base e token de autenticação.
+    Deve ser aberto (open) e usado dentro de um único event loop.
+    """
+    
+    def __init__(
+        self,
+        findface_multi_client,
+        max_connections: int = 64,
+        timeout: float = 30.0,
+        http2: bool = False
+    ):
+        """
+        Inicializa o cliente (a conexão é criada em open()).
+        
+        :param findface_multi_client: Cliente FindfaceMulti (ou wrapper) autenticado.
+        :param max_connections: Máximo de conexões simultâneas no pool.
+        :param timeout: Timeout para requisições em segundos.
+        :param http2: Usa HTTP/2 (requer o pacote h2; cai para HTTP/1.1 se ausente).
+        """
+        if httpx is None:
+            raise ImportError("httpx é necessário para o envio assíncrono ao FindFace.")
+        
+        self.client = findface_multi_client
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.http2 = http2
+        self.logger = logging.getLogger(__name__)
+        
+        self._http_client: Optional[httpx.AsyncClient] = None
+    
+    async def open(self) -> None:
+        """Cria o httpx.AsyncClient no event loop corrente."""
+        if self._http_client is not None:
+            return
+        
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections
+        )
+        
+        try:
+            self._http_client = httpx.AsyncClient(
+                limits=limits,
+                timeout=self.timeout,
+                verify=False,  # Desabilita verificação SSL (igual ao original)
+                http2=self.http2
+            )
+        except ImportError:
+            # http2=True sem o pacote h2 instalado
+            self.logger.warning("Pacote 'h2' não instalado. Usando HTTP/1.1 no envio assíncrono.")
+            self.http2 = False
+            self._http_client = httpx.AsyncClient(limits=limits, timeout=self.timeout, verify=False)
+        
+        self.logger.info(
+            f"✓ Cliente assíncrono do FindFace configurado "
+            f"(max_connections={self.max_connections}, http2={self.http2}, timeout={self.timeout}s)"
+        )
+    
+    async def add_face_event(
+        self,
+        token: str,
+        fullframe: Union[bytes, memoryview],
+        camera: Optional[int] = None,
+        timestamp: Optional[str] = None,
+        roi: Optional[List[int]] = None,
+        mf_selector: str = "biggest"
+    ) -> Dict[str, Any]:
+        """
+        Envia evento de face ao FindFace (mesmos campos de FindfaceMulti.add_face_event).
+        
+        :param token: Token de criação de eventos da câmera.
+        :param fullframe: Imagem JPEG (bytes ou buffer, enviado sem cópia).
+        :param camera: ID da câmera.
+        :param timestamp: Timestamp do evento (ISO 8601).
+        :param roi: [left, top, right, bottom].
+        :param mf_selector: 'biggest' ou 'all'.
+        :return: Resposta da API.
+        :raises ConnectionError: Em caso de falha de rede.
+        :raises FindfaceHTTPError: Se a API responder com status inesperado.
+        :raises CircuitOpenError: Se o circuit breaker do cliente estiver aberto.
+        """
+        if self._http_client is None:
+            raise RuntimeError("Cliente assíncrono do FindFace não foi aberto (open).")
+        
+        data = FindfaceMulti.build_face_event_form(
+            token=token,
+            mf_selector=mf_selector,
+            camera=camera,
+            timestamp=timestamp,
+            roi=roi
+        )
+        # Corpo montado uma vez e transmitido do buffer da imagem (sem cópias)
+        body = MultipartBody(data, {"fullframe": ("fullframe.jpg", fullframe, "image/jpeg")})
+        
+        if not hasattr(self.client, "acquire_node"):
+            return await self._post_face_event(self.client, body)
+        
+        # Vários nós: nó da câmera, com uma repetição em outro nó se este
+        # comprovadamente não processou o evento
+        balancer = self.client
+        node = balancer.acquire_node(camera)
+        for attempt in range(2):
+            start = time.monotonic()
+            try:
+                response = await self._post_face_event(node.client, body)
+            except Exception as e:
+                balancer.release_node(node, time.monotonic() - start, success=False)
+                not_sent = balancer.should_failover(e) or self._not_sent(e.__cause__)
+                if attempt == 0 and not_sent:
+                    node = balancer.failover(camera, node, e)
+                    continue
+                raise
+            balancer.release_node(node, time.monotonic() - start, success=True)
+            return response
+    
+    async def _post_face_event(
+        self,
+        client: FindfaceMulti,
+        body: MultipartBody
+    ) -> Dict[str, Any]:
+        """
+        Envia o formulário de evento a um nó.
+        
+        Mesma política do envio síncrono (_PooledSession): circuit breaker,
+        renovação de token em 401 e até max_retries novas tentativas com
+        backoff exponencial e jitter (ou Retry-After) quando a requisição
+        comprovadamente não foi processada (falha ao conectar, 429, 503).
+        
+        :param client: Cliente síncrono do nó (URL, token, sessão e circuit breaker).
+        :param body: Corpo multipart do evento (reenviável).
+        :return: Resposta da API.
+        """
+        url = f"{client.url_base}/events/faces/add/"
+        breaker = getattr(client, "circuit_breaker", None)
+        session = getattr(client, "session", None)
+        max_retries = session.max_retries if isinstance(session, _PooledSession) else 0
+        stale_token = client.token
+        token_refreshed = False
+        attempt = 0
+        
+        while True:
+            if breaker is not None and not breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuito do FindFace aberto; nova tentativa em {breaker.retry_after():.1f}s"
+                )
+            
+            headers = {"Authorization": f"Token {stale_token}", **body.headers}
+            try:
+                response = await self._http_client.post(url, headers=headers, content=body.aiter_chunks())
+            except httpx.HTTPError as exc:
+                self._record(breaker, success=False)
+                if attempt < max_retries and self._not_sent(exc):
+                    await asyncio.sleep(session._backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                raise ConnectionError(f"Erro ao criar evento de face: {exc}") from exc
+            
+            if response.status_code == 401 and not token_refreshed and hasattr(client, "refresh_token"):
+                # Login síncrono fora do event loop
+                loop = asyncio.get_running_loop()
+                new_token = await loop.run_in_executor(None, client.refresh_token, stale_token)
+                if new_token:
+                    stale_token = new_token
+                    token_refreshed = True
+                    continue
+            
+            if response.status_code in _PooledSession.RETRY_STATUS_NON_IDEMPOTENT and attempt < max_retries:
+                self._record(breaker, success=False)
+                await asyncio.sleep(session._backoff_delay(attempt, response.headers.get("Retry-After")))
+                attempt += 1
+                continue
+            
+            self._record(breaker, success=response.status_code < 500)
+            break
+        
+        if response.status_code == 200:
+            return response.json()
+        raise FindfaceHTTPError(
+            f"Erro ao criar evento de face: {response.status_code} - {response.text}",
+            response.status_code
+        )
+    
+    @staticmethod
+    def _not_sent(exc: Optional[BaseException]) -> bool:
+        """Indica se a falha ocorreu antes de a requisição chegar ao servidor."""
+        return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+    
+    @staticmethod
+    def _record(breaker, success: bool) -> None:
+        """Registra o resultado no circuit breaker do nó (se houver)."""
+        if breaker is None:
+            return
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+    
+    async def aclose(self) -> None:
+        """Fecha o pool de conexões."""
+        if self._http_client is not None:
+            try:
+                await self._http_client.aclose()
+                self.logger.info("Cliente assíncrono do FindFace fechado")
+            except Exception as e:
+                self.logger.warning(f"Erro ao fechar cliente assíncrono: {e}")
+            finally:
+                self._http_client = None
@@ -0,0 +1,348 @@
+"""
+Balanceamento de carga entre vários nós do FindFace.
+
+Cada nó tem seu próprio FindfaceMulti (sessão, token e circuit breaker).
+Uploads vão para o nó saudável menos carregado, com afinidade por câmera;
+um health check em background tira de rota nós fora do ar e devolve os que
+se recuperam. As demais chamadas do SDK (câmeras, grupos, logout, ...) vão
+para o primeiro nó saudável.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .findface_multi import FindfaceMulti, FindfaceHTTPError, _PooledSession
+from .circuit_breaker import CircuitOpenError
+
+
+class FindfaceNode:
+    """Estado de roteamento de um nó do FindFace."""
+
+    # Suavização da média de latência dos uploads
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, url_base: str, client: Optional[FindfaceMulti] = None):
+        """
+        Inicializa o nó.
+
+        :param url_base: URL base do nó.
+        :param client: Cliente autenticado (None se o login ainda não foi possível).
+        """
+        self.url_base = url_base.rstrip("/")
+        self.client = client
+        self.healthy = client is not None
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+
+    @property
+    def available(self) -> bool:
+        """True se o nó pode receber requisições agora."""
+        if self.client is None or not self.healthy:
+            return False
+        breaker = self.client.circuit_breaker
+        return breaker is None or not breaker.is_open
+
+    def record(self, latency: float, success: bool) -> None:
+        """Registra o resultado de um upload (lock do balanceador já adquirido)."""
+        self.requests += 1
+        if not success:
+            self.failures += 1
+            return
+        alpha = self.EWMA_ALPHA
+        self.latency_ewma = latency if self.latency_ewma is None else (
+            (1 - alpha) * self.latency_ewma + alpha * latency
+        )
+
+    def get_stats(self) -> dict:
+        """Estatísticas do nó."""
+        return {
+            "healthy": self.healthy,
+            "available": self.available,
+            "in_flight": self.in_flight,
+            "latency_ewma": self.latency_ewma or 0.0,
+            "requests": self.requests,
+            "failures": self.failures
+        }
+
+
+class _BalancerBreakerView:
+    """
+    Visão agregada dos circuit breakers dos nós.
+
+    "Aberto" só quando nenhum nó está disponível: é o que os senders usam
+    para segurar os eventos na fila.
+    """
+
+    def __init__(self, balancer: "FindfaceLoadBalancer"):
+        self._balancer = balancer
+
+    @property
+    def is_open(self) -> bool:
+        return not any(node.available for node in self._balancer.nodes)
+
+    def retry_after(self) -> float:
+        waits = [
+            node.client.circuit_breaker.retry_after()
+            for node in self._balancer.nodes
+            if node.client is not None and node.client.circuit_breaker is not None
+        ]
+        return min(waits) if waits else 0.0
+
+    def get_stats(self) -> dict:
+        return {
+            node.url_base: node.client.circuit_breaker.get_stats()
+            for node in self._balancer.nodes
+            if node.client is not None and node.client.circuit_breaker is not None
+        }
+
+
+class FindfaceLoadBalancer:
+    """
+    Cliente FindFace sobre vários nós, com a mesma interface de FindfaceMulti.
+
+    Roteamento de add_face_event:
+    - cada câmera fica presa ao nó escolhido no primeiro envio (afinidade);
+    - se esse nó ficar indisponível ou passar de sticky_max_in_flight envios
+      simultâneos, a câmera é remanejada para o nó disponível com menos
+      envios em andamento (empate: menor latência média);
+    - falhas que garantem que o evento não foi processado (circuito aberto,
+      falha ao conectar, 429/503) são repetidas uma vez em outro nó.
+    """
+
+    FAILOVER_STATUS = _PooledSession.RETRY_STATUS_NON_IDEMPOTENT
+
+    def __init__(
+        self,
+        nodes: List[FindfaceNode],
+        client_factory: Callable[[str], FindfaceMulti],
+        health_check_interval: float = 10.0,
+        sticky_max_in_flight: int = 16
+    ):
+        """
+        Inicializa o balanceador.
+
+        :param nodes: Nós do FindFace (na ordem de preferência para chamadas não balanceadas).
+        :param client_factory: Cria um cliente autenticado para uma URL (usado para
+                               nós que falharam no login inicial).
+        :param health_check_interval: Intervalo (s) do health check (0 = desativado).
+        :param sticky_max_in_flight: Envios simultâneos acima dos quais a câmera troca de nó.
+        :raises ValueError: Se nenhum nó estiver disponível.
+        """
+        if not nodes:
+            raise ValueError("É necessário ao menos um nó do FindFace.")
+        if not any(node.client is not None for node in nodes):
+            raise ConnectionError("Nenhum nó do FindFace respondeu ao login.")
+
+        self.nodes = nodes
+        self.client_factory = client_factory
+        self.health_check_interval = health_check_interval
+        self.sticky_max_in_flight = max(1, int(sticky_max_in_flight))
+        self.circuit_breaker = _BalancerBreakerView(self)
+
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._camera_nodes: Dict[Any, FindfaceNode] = {}
+        self._reassignments = 0
+        self._failovers = 0
+
+        self._stop_event = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        if health_check_interval > 0:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                name="FindfaceHealthCheck",
+                daemon=True
+            )
+            self._health_thread.start()
+
+    @property
+    def primary(self) -> FindfaceMulti:
+        """Cliente do primeiro nó disponível (chamadas não balanceadas)."""
+        for node in self.nodes:
+            if node.available:
+                return node.client
+        for node in self.nodes:
+            if node.client is not None:
+                return node.client
+        raise ConnectionError("Nenhum nó do FindFace disponível.")
+
+    def __getattr__(self, name: str) -> Any:
+        # Demais métodos e atributos do SDK (get_cameras, token, url_base, ...)
+        if name.startswith("_") or name in ("nodes",):
+            raise AttributeError(name)
+        return getattr(self.primary, name)
+
+    # ------------------------------------------------------------------
+    # Roteamento
+    # ------------------------------------------------------------------
+
+    def acquire_node(self, camera: Any = None, exclude: Optional[FindfaceNode] = None) -> FindfaceNode:
+        """
+        Escolhe o nó de um upload e contabiliza o envio em andamento.
+
+        Deve ser pareado com release_node().
+
+        :param camera: ID da câmera (afinidade).
+        :param exclude: Nó a evitar (failover).
+        :return: Nó escolhido.
+        :raises CircuitOpenError: Se nenhum nó estiver disponível.
+        """
+        with self._lock:
+            node = self._camera_nodes.get(camera)
+            if (
+                node is None or node is exclude or not node.available
+                or node.in_flight >= self.sticky_max_in_flight
+            ):
+                candidates = [n for n in self.nodes if n.available and n is not exclude]
+                if not candidates:
+                    raise CircuitOpenError("Nenhum nó do FindFace disponível")
+                previous = node
+                node = min(candidates, key=lambda n: (n.in_flight, n.latency_ewma or 0.0))
+                if camera is not None:
+                    if previous is not None and previous is not node:
+                        self._reassignments += 1
+                    self._camera_nodes[camera] = node
+            node.in_flight += 1
+            return node
+
+    def release_node(self, node: FindfaceNode, latency: Optional[float] = None, success: bool = True) -> None:
+        """
+        Encerra um envio iniciado com acquire_node().
+
+        :param node: Nó usado.
+        :param latency: Duração do envio (None = sem amostra).
+        :param success: Se o envio foi bem-sucedido.
+        """
+        with self._lock:
+            node.in_flight = max(0, node.in_flight - 1)
+            if latency is not None:
+                node.record(latency, success)
+
+    @classmethod
+    def should_failover(cls, error: Exception) -> bool:
+        """
+        Indica se o envio pode ser repetido em outro nó sem risco de duplicar.
+
+        :param error: Erro do envio.
+        :return: True se o nó comprovadamente não processou o evento.
+        """
+        if isinstance(error, CircuitOpenError):
+            return True
+        if isinstance(error, FindfaceHTTPError):
+            return error.status_code in cls.FAILOVER_STATUS
+        cause = error.__cause__
+        return isinstance(error, ConnectionError) and cause is not None and _PooledSession._not_sent(cause)
+
+    def failover(self, camera: Any, failed: FindfaceNode, error: Exception) -> FindfaceNode:
+        """
+        Escolhe outro nó para repetir um envio que falhou sem ser processado.
+
+        :param camera: ID da câmera.
+        :param failed: Nó que falhou (já liberado com release_node).
+        :param error: Erro do envio (relançado se não houver outro nó).
+        :return: Novo nó (adquirido; pareie com release_node).
+        """
+        try:
+            node = self.acquire_node(camera, exclude=failed)
+        except CircuitOpenError:
+            raise error
+        with self._lock:
+            self._failovers += 1
+        self.logger.warning(f"Envio ao FindFace falhou ({error}); repetindo em {node.url_base}")
+        return node
+
+    def add_face_event(self, **kwargs) -> Dict[str, Any]:
+        """
+        Cria um evento de face no nó escolhido para a câmera.
+
+        Mesmos parâmetros de FindfaceMulti.add_face_event.
+
+        :return: Resposta da API.
+        :raises ConnectionError: Se o envio falhar em todos os nós tentados.
+        """
+        camera = kwargs.get("camera")
+        node = self.acquire_node(camera)
+        for attempt in range(2):
+            start = time.monotonic()
+            try:
+                response = node.client.add_face_event(**kwargs)
+            except Exception as e:
+                self.release_node(node, time.monotonic() - start, success=False)
+                if attempt == 0 and self.should_failover(e):
+                    node = self.failover(camera, node, e)
+                    continue
+                raise
+            self.release_node(node, time.monotonic() - start, success=True)
+            return response
+
+    # ------------------------------------------------------------------
+    # Health check
+    # ------------------------------------------------------------------
+
+    def _health_loop(self):
+        """Verifica periodicamente cada nó."""
+        while not self._stop_event.wait(self.health_check_interval):
+            for node in self.nodes:
+                if self._stop_event.is_set():
+                    break
+                self._check_node(node)
+
+    def _check_node(self, node: FindfaceNode):
+        """
+        Verifica um nó (login, se necessário, e uma consulta leve autenticada).
+
+        :param node: Nó a verificar.
+        """
+        try:
+            if node.client is None:
+                node.client = self.client_factory(node.url_base)
+            node.client.count_camera_groups()
+            healthy = True
+        except Exception as e:
+            healthy = False
+            if node.healthy:
+                self.logger.warning(f"Nó do FindFace {node.url_base} fora de rota: {e}")
+
+        if healthy and not node.healthy:
+            self.logger.info(f"Nó do FindFace {node.url_base} disponível novamente")
+        node.healthy = healthy
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def logout(self) -> None:
+        """Realiza logout em todos os nós autenticados."""
+        for node in self.nodes:
+            if node.client is not None:
+                try:
+                    node.client.logout()
+                except Exception as e:
+                    self.logger.warning(f"Erro no logout de {node.url_base}: {e}")
+
+    def close(self) -> None:
+        """Para o health check e fecha as sessões de todos os nós."""
+        self._stop_event.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=5.0)
+        for node in self.nodes:
+            if node.client is not None:
+                node.client.close()
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas de roteamento por nó.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            return {
+                "nodes": {node.url_base: node.get_stats() for node in self.nodes},
+                "cameras": len(self._camera_nodes),
+                "reassignments": self._reassignments,
+                "failovers": self._failovers
+            }
@@ -1,5 +1,9 @@
+import random
+import threading
+import time
 import requests
-from typing import Optional, List, Dict, Any, Union
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Dict, Any, Union, Tuple, Callable
 try:
     import urllib3
 except ModuleNotFoundError:  # pragma: no cover - library may be absent in tests
@@ -9,17 +13,199 @@ import io
 from pathlib import Path
 import json
 
+from .multipart_body import MultipartBody
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
 
 if urllib3 is not None:
     urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
+class _PooledSession(requests.Session):
+    """
+    Sessão HTTP keep-alive com pool de conexões e timeout padrão.
+
+    Todas as chamadas do SDK passam por aqui e reutilizam conexões TCP/TLS.
+    Também concentra a resiliência comum a todos os métodos:
+
+    - 401 com header Authorization: renova o token (callback) e repete uma vez;
+    - falhas transitórias: até max_retries novas tentativas com backoff
+      exponencial e jitter. Métodos idempotentes repetem em erro de rede,
+      timeout e 429/502/503/504; POST/PATCH só quando a requisição
+      comprovadamente não foi processada (falha ao conectar, 429, 503);
+    - circuit breaker: com o circuito aberto a chamada falha na hora com
+      CircuitOpenError, sem tocar a rede.
+    """
+
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+    RETRY_STATUS = {429, 502, 503, 504}
+    RETRY_STATUS_NON_IDEMPOTENT = {429, 503}
+
+    def __init__(
+        self,
+        pool_connections: int,
+        pool_maxsize: int,
+        timeout: Tuple[float, float],
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        on_unauthorized: Optional[Callable[[Optional[str]], Optional[str]]] = None
+    ) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker
+        self.on_unauthorized = on_unauthorized
+        # A verificação SSL está desativada por padrão (igual às chamadas originais)
+        self.verify = False
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        """Executa a requisição com timeout padrão, renovação de token, retries e circuit breaker."""
+        kwargs.setdefault("timeout", self.timeout)
+        method = method.upper()
+        idempotent = method in self.IDEMPOTENT_METHODS
+        retry_status = self.RETRY_STATUS if idempotent else self.RETRY_STATUS_NON_IDEMPOTENT
+        token_refreshed = False
+        attempt = 0
+
+        while True:
+            if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+                raise CircuitOpenError(
+                    f"Circuito do FindFace aberto; nova tentativa em "
+                    f"{self.circuit_breaker.retry_after():.1f}s"
+                )
+
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                self._record(success=False)
+                if attempt < self.max_retries and (idempotent or self._not_sent(exc)):
+                    self._sleep_backoff(attempt)
+                    attempt += 1
+                    continue
+                raise
+
+            if response.status_code == 401 and not token_refreshed and self._refresh_authorization(kwargs):
+                token_refreshed = True
+                continue
+
+            if response.status_code in retry_status and attempt < self.max_retries:
+                self._record(success=False)
+                self._sleep_backoff(attempt, response.headers.get("Retry-After"))
+                attempt += 1
+                continue
+
+            self._record(success=response.status_code < 500)
+            return response
+
+    def _refresh_authorization(self, kwargs: Dict[str, Any]) -> bool:
+        """Renova o token após 401 e atualiza o header da requisição."""
+        headers = kwargs.get("headers") or {}
+        authorization = headers.get("Authorization", "")
+        if self.on_unauthorized is None or not authorization.startswith("Token "):
+            return False
+
+        new_token = self.on_unauthorized(authorization[len("Token "):])
+        if not new_token:
+            return False
+        headers["Authorization"] = f"Token {new_token}"
+        kwargs["headers"] = headers
+        return True
+
+    @staticmethod
+    def _not_sent(exc: Exception) -> bool:
+        """Indica se a falha ocorreu antes de a requisição chegar ao servidor."""
+        if isinstance(exc, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(exc.args[0], "reason", None) if exc.args else None
+        return urllib3 is not None and isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Backoff exponencial com jitter ("full jitter"), respeitando Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(self.backoff_max, float(retry_after)))
+            except ValueError:
+                pass
+        return delay
+
+    def _sleep_backoff(self, attempt: int, retry_after: Optional[str] = None) -> None:
+        """Aguarda o backoff da tentativa (ver _backoff_delay)."""
+        time.sleep(self._backoff_delay(attempt, retry_after))
+
+    def _record(self, success: bool) -> None:
+        """Registra o resultado no circuit breaker."""
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+
+class FindfaceHTTPError(Exception):
+    """
+    Resposta HTTP inesperada da API do FindFace (preserva o status).
+
+    Não herda de ConnectionError: o servidor respondeu, então só 5xx e 429
+    indicam falha passageira; os demais 4xx são rejeições definitivas.
+    """
+
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code: int = status_code
+
+    @property
+    def transient(self) -> bool:
+        """True se o mesmo envio pode dar certo mais tarde (5xx ou 429)."""
+        return self.status_code >= 500 or self.status_code == 429
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Indica se uma falha de envio ao FindFace é passageira.
+
+    Passageiras: erros de rede (ConnectionError/TimeoutError, inclusive
+    CircuitOpenError) e respostas 5xx/429. Eventos que falham assim podem
+    ir para a outbox; rejeições 4xx não seriam aceitas no replay.
+
+    :param error: Exceção do envio.
+    :return: True se vale guardar o evento para nova tentativa.
+    """
+    if isinstance(error, FindfaceHTTPError):
+        return error.transient
+    return isinstance(error, (ConnectionError, TimeoutError))
+
+
 class FindfaceMulti:
     """
     Classe responsável por autenticar e interagir com a API do FindFace Multi.
     """
 
-    def __init__(self, url_base: str, user: str, password: str, uuid: str) -> None:
+    def __init__(
+        self,
+        url_base: str,
+        user: str,
+        password: str,
+        uuid: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0
+    ) -> None:
         """
         Inicializa a instância da classe e realiza o login automaticamente.
 
@@ -27,6 +213,15 @@ class FindfaceMulti:
         :param user: Nome de usuário da API
         :param password: Senha do usuário
         :param uuid: Identificador único do dispositivo
+        :param pool_connections: Número de pools de conexão (um por host).
+        :param pool_maxsize: Máximo de conexões keep-alive por host.
+        :param connect_timeout: Timeout de conexão em segundos.
+        :param read_timeout: Timeout de leitura em segundos.
+        :param max_retries: Novas tentativas em falhas transitórias.
+        :param backoff_base: Base (s) do backoff exponencial entre tentativas.
+        :param backoff_max: Espera máxima (s) entre tentativas.
+        :param breaker_failure_threshold: Falhas consecutivas para abrir o circuito (0 = sem circuit breaker).
+        :param breaker_reset_timeout: Segundos com o circuito aberto antes de testar o servidor.
         """
         # Verificações de tipo
         if not isinstance(url_base, str):
@@ -44,6 +239,26 @@ class FindfaceMulti:
         self.password: str = password
         self.uuid: str = uuid
         self.token: Optional[str] = None
+        self._token_lock = threading.Lock()
+
+        self.circuit_breaker: Optional[CircuitBreaker] = None
+        if breaker_failure_threshold > 0:
+            self.circuit_breaker = CircuitBreaker(
+                failure_threshold=breaker_failure_threshold,
+                reset_timeout=breaker_reset_timeout
+            )
+
+        # Sessão keep-alive compartilhada por todos os métodos (thread-safe para requisições)
+        self.session: requests.Session = _PooledSession(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            timeout=(connect_timeout, read_timeout),
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+            circuit_breaker=self.circuit_breaker,
+            on_unauthorized=self.refresh_token
+        )
 
         # Realiza login automaticamente
         self.login()
@@ -68,7 +283,7 @@ class FindfaceMulti:
 
         # Requisição com autenticação básica (usuário + senha)
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 auth=(self.user, self.password),
                 json=payload,
@@ -90,6 +305,26 @@ class FindfaceMulti:
         else:
             raise ConnectionError(f"Falha no login. Código HTTP: {response.status_code} - {response.text}")
 
+    def refresh_token(self, stale_token: Optional[str] = None) -> Optional[str]:
+        """
+        Renova o token de autenticação após um 401.
+
+        Várias threads podem receber 401 ao mesmo tempo: só a primeira refaz
+        o login; as demais recebem o token já renovado.
+
+        :param stale_token: Token que foi recusado.
+        :return: Token válido ou None se o login falhar.
+        """
+        with self._token_lock:
+            if self.token and self.token != stale_token:
+                return self.token
+            try:
+                self.login()
+            except Exception as exc:
+                print(f"Falha ao renovar token: {exc}")
+                return None
+            return self.token
+
     def logout(self) -> None:
         """
         Realiza o logout da API, invalidando o token atual.
@@ -105,7 +340,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=headers,
                 verify=False
@@ -120,6 +355,12 @@ class FindfaceMulti:
             raise ConnectionError(f"Falha ao realizar logout. Código HTTP: {response.status_code} - {response.text}")
 
 
+    def close(self) -> None:
+        """
+        Fecha a sessão HTTP e as conexões do pool.
+        """
+        self.session.close()
+
     def _request(self, method: str, path: str, expected: int = 200, **kwargs) -> Any:
         """Helper for authenticated HTTP requests."""
 
@@ -131,7 +372,7 @@ class FindfaceMulti:
         headers["Authorization"] = f"Token {self.token}"
 
         try:
-            resp = requests.request(method, url, headers=headers, verify=False, **kwargs)
+            resp = self.session.request(method, url, headers=headers, verify=False, **kwargs)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro de conexão: {exc}") from exc
 
@@ -142,7 +383,7 @@ class FindfaceMulti:
         elif resp.status_code == 404:
             raise ValueError("Recurso não encontrado")
         else:
-            raise ConnectionError(f"Erro {resp.status_code} - {resp.text}")
+            raise FindfaceHTTPError(f"Erro {resp.status_code} - {resp.text}", resp.status_code)
 
 
     def get_human_cards(
@@ -227,7 +468,7 @@ class FindfaceMulti:
                 else:
                     params[key] = value
 
-        response = requests.get(url, headers=headers, params=params, verify=False)
+        response = self.session.get(url, headers=headers, params=params, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -301,7 +542,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.post(url, headers=headers, json=data, verify=False)
+        response = self.session.post(url, headers=headers, json=data, verify=False)
 
         if response.status_code in (200, 201):
             return response.json()
@@ -377,7 +618,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.patch(url, headers=headers, json=data, verify=False)
+        response = self.session.patch(url, headers=headers, json=data, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -408,7 +649,7 @@ class FindfaceMulti:
             "Authorization": f"Token {self.token}"
         }
 
-        response = requests.delete(url, headers=headers, verify=False)
+        response = self.session.delete(url, headers=headers, verify=False)
 
         if response.status_code == 204:
             return  # Sucesso silencioso
@@ -443,7 +684,7 @@ class FindfaceMulti:
             "Content-Type": "application/json"
         }
 
-        response = requests.get(url, headers=headers, verify=False)
+        response = self.session.get(url, headers=headers, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -523,7 +764,7 @@ class FindfaceMulti:
             "attributes": (None, json.dumps(attributes), "application/json")
         }
 
-        response = requests.post(url, headers=headers, files=files, verify=False)
+        response = self.session.post(url, headers=headers, files=files, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -634,7 +875,7 @@ class FindfaceMulti:
         if frame_coords_bottom is not None:
             data["frame_coords_bottom"] = str(frame_coords_bottom)
 
-        response = requests.post(url, headers=headers, files=files, data=data, verify=False)
+        response = self.session.post(url, headers=headers, files=files, data=data, verify=False)
 
         if response.status_code == 201:
             return response.json()
@@ -780,7 +1021,7 @@ class FindfaceMulti:
                 else:
                     params[chave] = valor
 
-        response = requests.get(url, headers=headers, params=params, verify=False)
+        response = self.session.get(url, headers=headers, params=params, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -862,7 +1103,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.post(url, headers=headers, json=data, verify=False)
+        response = self.session.post(url, headers=headers, json=data, verify=False)
 
         if response.status_code in (200, 201):
             return response.json()
@@ -894,7 +1135,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.get(url, headers=headers, verify=False)
+        response = self.session.get(url, headers=headers, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -924,7 +1165,7 @@ class FindfaceMulti:
         url: str = f"{self.url_base}/cards/cars/{card_id}/"
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
-        response = requests.delete(url, headers=headers, verify=False)
+        response = self.session.delete(url, headers=headers, verify=False)
 
         if response.status_code == 204:
             return
@@ -1009,7 +1250,7 @@ class FindfaceMulti:
             "Content-Type": "application/json",
         }
 
-        response = requests.patch(url, headers=headers, json=data, verify=False)
+        response = self.session.patch(url, headers=headers, json=data, verify=False)
 
         if response.status_code == 200:
             return response.json()
@@ -1087,7 +1328,7 @@ class FindfaceMulti:
                     params[chave] = valor
 
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False)
+            response = self.session.get(url, headers=headers, params=params, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao buscar watch lists: {exc}") from exc
 
@@ -1140,7 +1381,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=data, verify=False)
+            response = self.session.post(url, headers=headers, json=data, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao criar watch list: {exc}") from exc
 
@@ -1175,7 +1416,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.get(url, headers=headers, verify=False)
+            response = self.session.get(url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao buscar watch list {list_id}: {exc}") from exc
 
@@ -1208,7 +1449,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.delete(url, headers=headers, verify=False)
+            response = self.session.delete(url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao deletar watch list {list_id}: {exc}") from exc
 
@@ -1265,7 +1506,7 @@ class FindfaceMulti:
         }
 
         try:
-            response = requests.patch(url, headers=headers, json=data, verify=False)
+            response = self.session.patch(url, headers=headers, json=data, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao atualizar watch list {list_id}: {exc}") from exc
 
@@ -1296,7 +1537,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.post(url, headers=headers, verify=False)
+            response = self.session.post(url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao limpar watch list {list_id}: {exc}") from exc
 
@@ -1368,7 +1609,7 @@ class FindfaceMulti:
                     params[chave] = valor
 
         try:
-            response = requests.get(url, headers=headers, params=params, verify=False)
+            response = self.session.get(url, headers=headers, params=params, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao contar watch lists: {exc}") from exc
 
@@ -1390,7 +1631,7 @@ class FindfaceMulti:
         headers: Dict[str, str] = {"Authorization": f"Token {self.token}"}
 
         try:
-            response = requests.post(url, headers=headers, verify=False)
+            response = self.session.post(url, headers=headers, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao purgar todas as watch lists: {exc}") from exc
 
@@ -1694,6 +1935,7 @@ class FindfaceMulti:
         id_in: Optional[List[int]] = None,
         limit: Optional[int] = None,
         ordering: Optional[str] = None,
+        page: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Lista grupos de câmeras com filtros opcionais.
 
@@ -1712,7 +1954,7 @@ class FindfaceMulti:
             elif nome in {"id_in"}:
                 if not (isinstance(valor, list) and all(isinstance(x, int) for x in valor)):
                     raise TypeError("O parâmetro 'id_in' deve ser uma lista de inteiros.")
-            elif nome in {"ordering", "created_date_gt", "created_date_gte", "created_date_lt", "created_date_lte"}:
+            elif nome in {"ordering", "page", "created_date_gt", "created_date_gte", "created_date_lt", "created_date_lte"}:
                 if not isinstance(valor, str):
                     raise TypeError(f"O parâmetro '{nome}' deve ser str.")
             elif nome in {
@@ -1987,10 +2229,53 @@ class FindfaceMulti:
     def acknowledge_face_events(self) -> None:
         self._request("POST", "/events/faces/acknowledge/", expected=200)
 
+    @staticmethod
+    def build_face_event_form(
+        token: str,
+        mf_selector: str = "all",
+        camera: Optional[int] = None,
+        rotate: Optional[bool] = None,
+        timestamp: Optional[str] = None,
+        roi: Optional[List[int]] = None,
+        temperature: Optional[float] = None,
+        liveness: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Monta os campos de formulário (multipart) de ``/events/faces/add/``.
+
+        Compartilhado entre o SDK síncrono e os clientes httpx, para que todos
+        enviem exatamente os mesmos campos.
+
+        :return: Dicionário campo -> valor (``roi`` é uma lista, enviada como
+                 múltiplos campos com o mesmo nome).
+        """
+        data: Dict[str, Any] = {
+            "token": token,
+            "mf_selector": mf_selector
+        }
+
+        if camera is not None:
+            data["camera"] = str(camera)
+        if rotate is not None:
+            data["rotate"] = "true" if rotate else "false"
+        if timestamp is not None:
+            data["timestamp"] = timestamp
+        if temperature is not None:
+            data["temperature"] = str(temperature)
+        if liveness is not None:
+            data["liveness"] = str(liveness)
+
+        # ROI deve ser enviado como múltiplos campos com o mesmo nome
+        # Similar ao curl: -F "roi=348" -F "roi=243" -F "roi=460" -F "roi=382"
+        if roi is not None:
+            data["roi"] = [str(valor) for valor in roi]
+
+        return data
+
     def add_face_event(
         self,
         token: str,
-        fullframe: Union[str, bytes, io.BytesIO],
+        fullframe: Union[str, bytes, bytearray, memoryview, io.BytesIO],
         camera: Optional[int] = None,
         rotate: Optional[bool] = None,
         timestamp: Optional[str] = None,
@@ -2003,7 +2288,8 @@ class FindfaceMulti:
         Cria novos eventos de face a partir de uma imagem fornecida.
 
         :param token: Token da API para criação de eventos (obrigatório, min 1 char).
-        :param fullframe: Frame completo do evento - caminho do arquivo, bytes ou BytesIO (obrigatório).
+        :param fullframe: Frame completo do evento - caminho do arquivo, bytes, buffer
+                          (bytearray/memoryview, enviado sem cópia) ou BytesIO (obrigatório).
         :param camera: ID da câmera relacionada (opcional).
         :param rotate: Tenta rotacionar a imagem fonte (opcional).
         :param timestamp: Timestamp do evento no formato ISO 8601 (opcional).
@@ -2019,6 +2305,7 @@ class FindfaceMulti:
         :raises ValueError: Se algum parâmetro estiver fora do padrão esperado.
         :raises RuntimeError: Se o token de autenticação for inválido.
         :raises ConnectionError: Em caso de falha na comunicação com a API.
+        :raises FindfaceHTTPError: Se a API responder com status inesperado.
         """
 
         # --- Validação do token ---
@@ -2062,14 +2349,14 @@ class FindfaceMulti:
                 raise FileNotFoundError(f"Arquivo '{fullframe}' não encontrado.")
             file_data = caminho.read_bytes()
             file_name = caminho.name
-        elif isinstance(fullframe, bytes):
+        elif isinstance(fullframe, (bytes, bytearray, memoryview)):
             file_data = fullframe
             file_name = "fullframe.jpg"
         elif isinstance(fullframe, io.BytesIO):
-            file_data = fullframe.getvalue()
+            file_data = fullframe.getbuffer()
             file_name = "fullframe.jpg"
         else:
-            raise TypeError("O parâmetro 'fullframe' deve ser str, bytes ou io.BytesIO.")
+            raise TypeError("O parâmetro 'fullframe' deve ser str, bytes, bytearray, memoryview ou io.BytesIO.")
 
         mime_type, _ = mimetypes.guess_type(file_name)
         if mime_type is None:
@@ -2081,47 +2368,33 @@ class FindfaceMulti:
             "Authorization": f"Token {self.token}"
         }
 
-        # Preparação dos arquivos
-        files: Dict[str, Any] = {
-            "fullframe": (file_name, file_data, mime_type)
-        }
-
         # Preparação dos dados do formulário
-        data: Dict[str, Any] = {
-            "token": token,
-            "mf_selector": mf_selector
-        }
-
-        if camera is not None:
-            data["camera"] = str(camera)
-        if rotate is not None:
-            data["rotate"] = "true" if rotate else "false"
-        if timestamp is not None:
-            data["timestamp"] = timestamp
-        if temperature is not None:
-            data["temperature"] = str(temperature)
-        if liveness is not None:
-            data["liveness"] = str(liveness)
+        data = self.build_face_event_form(
+            token=token,
+            mf_selector=mf_selector,
+            camera=camera,
+            rotate=rotate,
+            timestamp=timestamp,
+            roi=roi,
+            temperature=temperature,
+            liveness=liveness
+        )
 
-        # ROI deve ser enviado como múltiplos campos com o mesmo nome
-        # Similar ao curl: -F "roi=348" -F "roi=243" -F "roi=460" -F "roi=382"
-        if roi is not None:
-            # Cria uma lista de tuplas para enviar múltiplos valores com a mesma chave
-            data_list = [(k, v) for k, v in data.items()]
-            for valor in roi:
-                data_list.append(("roi", str(valor)))
-            data = data_list
+        # Corpo multipart transmitido direto do buffer da imagem (sem cópias)
+        body = MultipartBody(data, {"fullframe": (file_name, file_data, mime_type)})
+        headers["Content-Type"] = body.content_type
 
         try:
-            response = requests.post(url, headers=headers, files=files, data=data, verify=False)
+            response = self.session.post(url, headers=headers, data=body, verify=False)
         except requests.exceptions.RequestException as exc:
             raise ConnectionError(f"Erro ao criar evento de face: {exc}") from exc
 
         if response.status_code == 200:
             return response.json()
         else:
-            raise ConnectionError(
-                f"Erro ao criar evento de face: {response.status_code} - {response.text}"
+            raise FindfaceHTTPError(
+                f"Erro ao criar evento de face: {response.status_code} - {response.text}",
+                response.status_code
             )
 
     # ------------------------------------------------------------------
@@ -0,0 +1,84 @@
+"""
+Corpo multipart/form-data transmitido a partir dos buffers originais.
+
+requests/httpx com ``files=`` copiam a imagem para montar o corpo (e o
+chamador normalmente já copiou o JPEG com ``tobytes()``). MultipartBody
+monta só os cabeçalhos das partes e entrega a imagem como memoryview do
+buffer original: o socket envia direto dele, sem cópias intermediárias.
+"""
+
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Tuple, Union
+
+# Tipos aceitos como conteúdo de arquivo (protocolo de buffer)
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class MultipartBody:
+    """
+    Corpo multipart/form-data reiterável e de tamanho conhecido.
+
+    Cada iteração recomeça do início, então o mesmo corpo pode ser reenviado
+    em retries e renovações de token. Como tem ``__len__``, requests envia
+    Content-Length em vez de chunked (com httpx, use ``headers``).
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Union[str, List[str]]],
+        files: Dict[str, Tuple[str, Buffer, str]]
+    ):
+        """
+        Monta o corpo.
+
+        :param fields: Campos de formulário (listas viram campos repetidos, ex. roi).
+        :param files: Arquivos: nome do campo -> (nome do arquivo, conteúdo, content-type).
+                      O conteúdo é referenciado, não copiado; não deve mudar até o envio.
+        """
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        chunks: List[Any] = []
+        for name, value in fields.items():
+            for item in value if isinstance(value, list) else [value]:
+                chunks.append(
+                    f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{item}\r\n'.encode()
+                )
+        for name, (filename, content, mime_type) in files.items():
+            chunks.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                f'Content-Type: {mime_type}\r\n\r\n'.encode()
+            )
+            chunks.append(memoryview(content).cast("B"))
+            chunks.append(b"\r\n")
+        chunks.append(f"--{boundary}--\r\n".encode())
+
+        # Cabeçalhos adjacentes viram um único bloco (menos chamadas ao socket)
+        self._chunks: List[Any] = []
+        for chunk in chunks:
+            if isinstance(chunk, bytes) and self._chunks and isinstance(self._chunks[-1], bytes):
+                self._chunks[-1] += chunk
+            else:
+                self._chunks.append(chunk)
+        self._length = sum(len(chunk) for chunk in self._chunks)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Cabeçalhos Content-Type e Content-Length do corpo."""
+        return {"Content-Type": self.content_type, "Content-Length": str(self._length)}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._chunks)
+
+    async def aiter_chunks(self) -> AsyncIterator[Any]:
+        """
+        Partes do corpo para clientes assíncronos (httpx.AsyncClient).
+
+        httpx trata qualquer iterável síncrono como stream síncrono, então o
+        AsyncClient recebe este gerador (um novo a cada envio).
+        """
+        for chunk in self._chunks:
+            yield chunk
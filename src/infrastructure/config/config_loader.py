@@ -24,7 +24,12 @@ from .settings import (
     LoggingConfig,
     PerformanceConfig,
     WorkersConfig,
-    DisplayConfig
+    DisplayConfig,
+    RoiDetectionConfig,
+    MotionGateConfig,
+    FindfaceSenderConfig,
+    OutboxConfig,
+    FindfaceClientConfig
 )
 
 
@@ -62,8 +67,12 @@ class ConfigLoader:
         if missing_vars:
             raise ValueError(f"Variáveis de ambiente obrigatórias não definidas: {', '.join(missing_vars)}")
         
+        # FINDFACE_URL aceita vários nós separados por vírgula (balanceamento)
+        url_bases = [url.strip() for url in os.getenv("FINDFACE_URL", "").split(",") if url.strip()]
+        
         return FindFaceConfig(
-            url_base=os.getenv("FINDFACE_URL", ""),
+            url_base=url_bases[0] if url_bases else "",
+            url_bases=url_bases,
             user=os.getenv("FINDFACE_USER", ""),
             password=os.getenv("FINDFACE_PASSWORD", ""),
             uuid=os.getenv("FINDFACE_UUID", "")
@@ -121,7 +130,10 @@ class ConfigLoader:
         filter_data = yaml_config.get("filter", {})
         filter_config = FilterConfig(
             min_bbox_width=filter_data.get("min_bbox_width", 30),
-            min_confidence=filter_data.get("min_confidence", 0.5)
+            min_confidence=filter_data.get("min_confidence", 0.5),
+            min_bbox_height=filter_data.get("min_bbox_height", 0),
+            discard_border_clipped=filter_data.get("discard_border_clipped", False),
+            border_margin=filter_data.get("border_margin", 2)
         )
         
         # Track Config
@@ -136,14 +148,23 @@ class ConfigLoader:
         queue_config = QueueConfig(
             frame_queue_max_size=queue_data.get("frame_queue_max_size", 100),
             event_queue_max_size=queue_data.get("event_queue_max_size", 1000),
-            findface_queue_max_size=queue_data.get("findface_queue_max_size", 100)
+            findface_queue_max_size=queue_data.get("findface_queue_max_size", 100),
+            findface_priority=queue_data.get("findface_priority", False),
+            findface_quality_weight=queue_data.get("findface_quality_weight", 1.0),
+            findface_age_weight=queue_data.get("findface_age_weight", 0.02),
+            findface_max_age_seconds=queue_data.get("findface_max_age_seconds", 0.0)
         )
         
         # Performance Config
         performance_data = yaml_config.get("performance", {})
         performance_config = PerformanceConfig(
             detection_skip_frames=performance_data.get("detection_skip_frames", 2),
-            inference_size=performance_data.get("inference_size", 640)
+            inference_size=performance_data.get("inference_size", 640),
+            camera_inference_sizes=performance_data.get("camera_inference_sizes") or {},
+            auto_inference_size=performance_data.get("auto_inference_size", False),
+            low_res_max_side=performance_data.get("low_res_max_side", 1280),
+            low_res_inference_size=performance_data.get("low_res_inference_size", 640),
+            pipelined_detection=performance_data.get("pipelined_detection", False)
         )
         
         # Camera Settings Config
@@ -151,7 +172,30 @@ class ConfigLoader:
         camera_config = CameraSettingsConfig(
             prefix=camera_data.get("prefix", "TESTE"),
             rtsp_reconnect_delay=camera_data.get("rtsp_reconnect_delay", 5),
-            rtsp_max_retries=camera_data.get("rtsp_max_retries", 3)
+            rtsp_max_retries=camera_data.get("rtsp_max_retries", 3),
+            rtsp_max_backoff=camera_data.get("rtsp_max_backoff", 60.0),
+            rtsp_open_timeout=camera_data.get("rtsp_open_timeout", 10.0),
+            rtsp_read_timeout=camera_data.get("rtsp_read_timeout", 10.0),
+            stall_timeout=camera_data.get("stall_timeout", 30.0),
+            cache_file=camera_data.get("cache_file", ""),
+            discovery_workers=camera_data.get("discovery_workers", 4),
+            discovery_page_size=camera_data.get("discovery_page_size", 100),
+            reconcile_interval=camera_data.get("reconcile_interval", 0.0),
+            capture_backend=str(camera_data.get("capture_backend", "opencv")).lower(),
+            ffmpeg_path=camera_data.get("ffmpeg_path", "ffmpeg"),
+            ffmpeg_rtsp_transport=camera_data.get("ffmpeg_rtsp_transport", "tcp"),
+            ffmpeg_threads=camera_data.get("ffmpeg_threads", 0),
+            ffmpeg_hwaccel=camera_data.get("ffmpeg_hwaccel", ""),
+            ffmpeg_low_latency=camera_data.get("ffmpeg_low_latency", True),
+            ffmpeg_output_width=camera_data.get("ffmpeg_output_width", 0),
+            ffmpeg_output_height=camera_data.get("ffmpeg_output_height", 0),
+            frame_ring_slots=camera_data.get("frame_ring_slots", 8),
+            dual_stream=camera_data.get("dual_stream", False),
+            snapshot_fps=camera_data.get("snapshot_fps", 5.0),
+            snapshot_history=camera_data.get("snapshot_history", 2.0),
+            snapshot_max_skew=camera_data.get("snapshot_max_skew", 0.5),
+            pts_timestamps=camera_data.get("pts_timestamps", True),
+            pts_max_drift=camera_data.get("pts_max_drift", 2.0)
         )
         
         # Logging Config
@@ -180,6 +224,84 @@ class ConfigLoader:
             fps_limit=display_data.get("fps_limit", 30)
         )
         
+        # ROI Detection Config
+        roi_data = yaml_config.get("roi_detection", {})
+        roi_detection_config = RoiDetectionConfig(
+            enabled=roi_data.get("enabled", False),
+            full_frame_interval=roi_data.get("full_frame_interval", 10),
+            padding=roi_data.get("padding", 0.6),
+            inference_size=roi_data.get("inference_size", 320),
+            max_regions=roi_data.get("max_regions", 4),
+            max_area_ratio=roi_data.get("max_area_ratio", 0.5),
+            max_track_age_seconds=roi_data.get("max_track_age_seconds", 1.0),
+            merge_iou_threshold=roi_data.get("merge_iou_threshold", 0.5)
+        )
+        
+        # Motion Gate Config
+        motion_data = yaml_config.get("motion_gate", {})
+        motion_gate_config = MotionGateConfig(
+            enabled=motion_data.get("enabled", False),
+            thumbnail_width=motion_data.get("thumbnail_width", 64),
+            background_alpha=motion_data.get("background_alpha", 0.05),
+            pixel_threshold=motion_data.get("pixel_threshold", 25.0),
+            min_changed_ratio=motion_data.get("min_changed_ratio", 0.01),
+            hold_seconds=motion_data.get("hold_seconds", 1.0),
+            keepalive_seconds=motion_data.get("keepalive_seconds", 2.0),
+            cameras=motion_data.get("cameras") or {}
+        )
+        
+        # FindFace Sender Config
+        sender_data = yaml_config.get("findface_sender", {})
+        findface_sender_config = FindfaceSenderConfig(
+            mode=sender_data.get("mode", "threads"),
+            max_in_flight=sender_data.get("max_in_flight", 64),
+            http2=sender_data.get("http2", False),
+            timeout=sender_data.get("timeout", 30.0),
+            encode_workers=sender_data.get("encode_workers", 4),
+            jpeg_quality=sender_data.get("jpeg_quality", 95),
+            jpeg_backend=sender_data.get("jpeg_backend", "auto"),
+            upload_mode=sender_data.get("upload_mode", "full"),
+            crop_margin=sender_data.get("crop_margin", 1.0),
+            downscale_max_side=sender_data.get("downscale_max_side", 1280),
+            jpeg_cache_mb=sender_data.get("jpeg_cache_mb", 32),
+            coalesce_window=sender_data.get("coalesce_window", 0.0),
+            coalesce_max_faces=sender_data.get("coalesce_max_faces", 16),
+            adaptive_concurrency=sender_data.get("adaptive_concurrency", False),
+            min_concurrency=sender_data.get("min_concurrency", 2),
+            initial_concurrency=sender_data.get("initial_concurrency", 8),
+            latency_target=sender_data.get("latency_target", 2.0),
+            backoff_factor=sender_data.get("backoff_factor", 0.7)
+        )
+        
+        # FindFace Client Config
+        client_data = yaml_config.get("findface_client", {})
+        findface_client_config = FindfaceClientConfig(
+            pool_connections=client_data.get("pool_connections", 10),
+            pool_maxsize=client_data.get("pool_maxsize", 20),
+            connect_timeout=client_data.get("connect_timeout", 5.0),
+            read_timeout=client_data.get("read_timeout", 30.0),
+            max_retries=client_data.get("max_retries", 3),
+            backoff_base=client_data.get("backoff_base", 0.5),
+            backoff_max=client_data.get("backoff_max", 10.0),
+            breaker_failure_threshold=client_data.get("breaker_failure_threshold", 5),
+            breaker_reset_timeout=client_data.get("breaker_reset_timeout", 30.0),
+            health_check_interval=client_data.get("health_check_interval", 10.0),
+            sticky_max_in_flight=client_data.get("sticky_max_in_flight", 16)
+        )
+        
+        # Outbox Config
+        outbox_data = yaml_config.get("outbox", {})
+        outbox_config = OutboxConfig(
+            enabled=outbox_data.get("enabled", False),
+            directory=outbox_data.get("directory", "./outbox"),
+            segment_max_mb=outbox_data.get("segment_max_mb", 16),
+            max_disk_mb=outbox_data.get("max_disk_mb", 1024),
+            max_age_seconds=outbox_data.get("max_age_seconds", 86400.0),
+            fsync=outbox_data.get("fsync", False),
+            replay_idle_interval=outbox_data.get("replay_idle_interval", 1.0),
+            replay_max_backoff=outbox_data.get("replay_max_backoff", 30.0)
+        )
+        
         return AppSettings(
             findface=findface_config,
             modelo_deteccao=modelo_deteccao_config,
@@ -193,5 +315,10 @@ class ConfigLoader:
             camera=camera_config,
             logging=logging_config,
             workers=workers_config,
-            display=display_config
+            display=display_config,
+            roi_detection=roi_detection_config,
+            motion_gate=motion_gate_config,
+            findface_sender=findface_sender_config,
+            outbox=outbox_config,
+            findface_client=findface_client_config
         )
\ No newline at end of file
@@ -3,7 +3,7 @@ Objeto de configuração centralizado.
 Fornece acesso type-safe às configurações.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
 from typing import Optional, List, Dict, Any
 
 
@@ -48,6 +48,7 @@ class FindFaceConfig:
     user: str
     password: str
     uuid: str
+    url_bases: List[str] = field(default_factory=list)  # Todos os nós (FINDFACE_URL separado por vírgula)
 
 
 @dataclass
@@ -83,6 +84,9 @@ class FilterConfig:
     """Configuração de filtros de detecção."""
     min_bbox_width: int = 30
     min_confidence: float = 0.5
+    min_bbox_height: int = 0             # Altura mínima da bbox (0 = sem filtro)
+    discard_border_clipped: bool = False  # Descarta faces cortadas pela borda do frame
+    border_margin: int = 2               # Distância (pixels) da borda para considerar o bbox cortado
 
 
 @dataclass
@@ -90,6 +94,122 @@ class PerformanceConfig:
     """Configuração de otimizações de performance."""
     detection_skip_frames: int = 2
     inference_size: int = 640
+    camera_inference_sizes: Dict[str, int] = field(default_factory=dict)  # imgsz por nome de câmera
+    auto_inference_size: bool = False    # Escolhe imgsz pela resolução do frame
+    low_res_max_side: int = 1280         # Frames com maior lado <= isto são "baixa resolução"
+    low_res_inference_size: int = 640    # imgsz usado para frames de baixa resolução (modo automático)
+    pipelined_detection: bool = False    # Prefetch / inferência / pós-processamento em threads sobrepostas
+    
+    def inference_size_for(self, camera_name: str, frame_width: int, frame_height: int) -> int:
+        """
+        Resolve o tamanho de inferência de um frame.
+        
+        Prioridade: override por câmera > modo automático por resolução > valor global.
+        
+        :param camera_name: Nome da câmera.
+        :param frame_width: Largura do frame.
+        :param frame_height: Altura do frame.
+        :return: imgsz a ser usado no predict.
+        """
+        size = self.camera_inference_sizes.get(camera_name)
+        if size:
+            return int(size)
+        if self.auto_inference_size and max(frame_width, frame_height) <= self.low_res_max_side:
+            return min(self.low_res_inference_size, self.inference_size)
+        return self.inference_size
+
+
+@dataclass
+class RoiDetectionConfig:
+    """Configuração da re-detecção guiada por tracks (ROI) entre passadas completas."""
+    enabled: bool = False
+    full_frame_interval: int = 10        # Detecção no frame completo a cada N frames por câmera
+    padding: float = 0.6                 # Margem em torno do bbox previsto (fração da largura/altura)
+    inference_size: int = 320            # imgsz usado na inferência dos crops
+    max_regions: int = 4                 # Acima disso, volta para o frame completo
+    max_area_ratio: float = 0.5          # Se os crops cobrirem mais que isso do frame, usa frame completo
+    max_track_age_seconds: float = 1.0   # Tracks sem atualização há mais tempo não geram ROI
+    merge_iou_threshold: float = 0.5     # IoU para descartar detecções duplicadas entre crops
+
+
+@dataclass
+class MotionGateConfig:
+    """Configuração do portão de movimento por câmera (diferença de frames)."""
+    enabled: bool = False
+    thumbnail_width: int = 64            # Largura da miniatura em tons de cinza
+    background_alpha: float = 0.05       # Taxa de atualização do fundo (média móvel)
+    pixel_threshold: float = 25.0        # Diferença mínima (0-255) para um pixel contar como mudança
+    min_changed_ratio: float = 0.01      # Fração mínima de pixels alterados para liberar o frame
+    hold_seconds: float = 1.0            # Mantém liberado por N segundos após movimento
+    keepalive_seconds: float = 2.0       # Libera um frame a cada N segundos mesmo sem movimento
+    cameras: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # Overrides por nome de câmera
+    
+    def for_camera(self, camera_name: str) -> 'MotionGateConfig':
+        """
+        Retorna a configuração efetiva de uma câmera (aplica overrides).
+        
+        :param camera_name: Nome da câmera.
+        :return: Nova configuração com os overrides da câmera aplicados.
+        """
+        overrides = self.cameras.get(camera_name) or {}
+        valid = {f.name for f in fields(self)} - {"cameras"}
+        return replace(
+            self,
+            cameras={},
+            **{k: v for k, v in overrides.items() if k in valid}
+        )
+
+
+@dataclass
+class FindfaceClientConfig:
+    """Configuração da conexão HTTP do SDK do FindFace."""
+    pool_connections: int = 10           # Pools de conexão (um por host)
+    pool_maxsize: int = 20               # Conexões keep-alive por host
+    connect_timeout: float = 5.0         # Timeout de conexão (s)
+    read_timeout: float = 30.0           # Timeout de leitura (s)
+    max_retries: int = 3                 # Novas tentativas em falhas transitórias
+    backoff_base: float = 0.5            # Base (s) do backoff exponencial com jitter
+    backoff_max: float = 10.0            # Espera máxima (s) entre tentativas
+    breaker_failure_threshold: int = 5   # Falhas consecutivas para abrir o circuito (0 = desativado)
+    breaker_reset_timeout: float = 30.0  # Segundos com o circuito aberto antes de testar de novo
+    health_check_interval: float = 10.0  # Health check dos nós (vários FINDFACE_URL); 0 = desativado
+    sticky_max_in_flight: int = 16       # Envios simultâneos no nó da câmera antes de remanejá-la
+
+
+@dataclass
+class FindfaceSenderConfig:
+    """Configuração do envio de eventos ao FindFace."""
+    mode: str = "threads"                # "threads" (workers bloqueantes) ou "asyncio" (um event loop)
+    max_in_flight: int = 64              # Uploads simultâneos no modo asyncio
+    http2: bool = False                  # Usa HTTP/2 no modo asyncio (requer pacote h2)
+    timeout: float = 30.0                # Timeout (s) de cada upload no modo asyncio
+    encode_workers: int = 4              # Threads de codificação JPEG (independentes dos uploads)
+    jpeg_quality: int = 95               # Qualidade JPEG do frame enviado (1-100)
+    jpeg_backend: str = "auto"           # "auto" (libjpeg-turbo se instalado), "opencv" ou "turbojpeg"
+    upload_mode: str = "full"            # "full", "crop" (face + margem) ou "downscale" (frame reduzido)
+    crop_margin: float = 1.0             # Margem do recorte em múltiplos da bbox (modo crop)
+    downscale_max_side: int = 1280       # Maior lado (px) do frame no modo downscale
+    jpeg_cache_mb: int = 32              # Cache LRU de frames codificados (0 = desativado)
+    coalesce_window: float = 0.0         # Janela (s) para juntar faces do mesmo frame (0 = desativado)
+    coalesce_max_faces: int = 16         # Máximo de faces por requisição agrupada
+    adaptive_concurrency: bool = False   # Ajusta uploads simultâneos por latência/erros (AIMD)
+    min_concurrency: int = 2             # Limite inferior do AIMD
+    initial_concurrency: int = 8         # Limite inicial do AIMD
+    latency_target: float = 2.0          # Latência (s) acima da qual a concorrência é reduzida
+    backoff_factor: float = 0.7          # Redução multiplicativa em erro/lentidão
+
+
+@dataclass
+class OutboxConfig:
+    """Configuração da outbox em disco (eventos não enviados ao FindFace)."""
+    enabled: bool = False
+    directory: str = "./outbox"
+    segment_max_mb: int = 16             # Tamanho de cada segmento append-only
+    max_disk_mb: int = 1024              # Cota total; segmentos mais antigos são descartados
+    max_age_seconds: float = 86400.0     # Eventos mais antigos que isso não são reenviados
+    fsync: bool = False                  # fsync a cada gravação
+    replay_idle_interval: float = 1.0    # Espera (s) do reenvio com a outbox vazia
+    replay_max_backoff: float = 30.0     # Espera máxima (s) entre tentativas com o FindFace fora
 
 
 @dataclass
@@ -98,14 +218,41 @@ class QueueConfig:
     frame_queue_max_size: int = 32      # Reduzido: 32 * 7MB = 224MB (era 128 = 896MB)
     event_queue_max_size: int = 64      # Reduzido
     findface_queue_max_size: int = 64   # Reduzido
+    findface_priority: bool = False     # Fila do FindFace por prioridade (qualidade e idade) em vez de FIFO
+    findface_quality_weight: float = 1.0   # Peso da qualidade da face (0-1)
+    findface_age_weight: float = 0.02      # Penalidade por segundo de idade do evento
+    findface_max_age_seconds: float = 0.0  # Eventos mais velhos são descartados (0 = sem limite)
 
 
 @dataclass
 class CameraSettingsConfig:
     """Configuração de câmeras."""
     prefix: str = "TESTE"
-    rtsp_reconnect_delay: int = 5
-    rtsp_max_retries: int = 3
+    rtsp_reconnect_delay: int = 5  # Espera inicial entre reconexões (dobra a cada falha)
+    rtsp_max_retries: int = 3  # Falhas consecutivas a partir das quais o log vira erro (nunca desiste)
+    rtsp_max_backoff: float = 60.0
+    rtsp_open_timeout: float = 10.0  # Timeout de abertura do stream (0 = padrão do backend)
+    rtsp_read_timeout: float = 10.0  # Timeout de leitura de frame (0 = padrão do backend)
+    stall_timeout: float = 30.0  # Watchdog: leitura bloqueada além disso recria o stream (0 = desativado)
+    cache_file: str = ""  # Cache da lista de câmeras ("" = desativado)
+    discovery_workers: int = 4
+    discovery_page_size: int = 100
+    reconcile_interval: float = 0.0  # Segundos entre reconciliações de câmeras (0 = desativado)
+    capture_backend: str = "opencv"  # "opencv" (cv2.VideoCapture) ou "ffmpeg" (processo por câmera)
+    ffmpeg_path: str = "ffmpeg"
+    ffmpeg_rtsp_transport: str = "tcp"
+    ffmpeg_threads: int = 0  # Threads do decodificador (0 = automático)
+    ffmpeg_hwaccel: str = ""  # Ex.: "cuda" ("" = decodificação em CPU)
+    ffmpeg_low_latency: bool = True
+    ffmpeg_output_width: int = 0  # 0 = resolução nativa
+    ffmpeg_output_height: int = 0  # 0 = nativa ou proporcional à largura
+    frame_ring_slots: int = 8  # Teto de buffers de frame reaproveitados por câmera (0 = array novo por frame)
+    dual_stream: bool = False  # Detecta no sub-stream e envia o frame do stream principal (2ª URL do comment)
+    snapshot_fps: float = 5.0  # Frames do stream principal convertidos por segundo
+    snapshot_history: float = 2.0  # Janela (s) de frames amostrados mantida por câmera
+    snapshot_max_skew: float = 0.5  # Diferença máxima (s) entre o melhor evento e o frame amostrado
+    pts_timestamps: bool = True  # Horário do frame pelo PTS do stream (False = horário da leitura)
+    pts_max_drift: float = 2.0  # Atraso (s) além da âncora que força reancorar o PTS
 
 
 @dataclass
@@ -187,6 +334,11 @@ class AppSettings:
     logging: LoggingConfig
     workers: WorkersConfig
     display: DisplayConfig
+    roi_detection: RoiDetectionConfig = field(default_factory=RoiDetectionConfig)
+    motion_gate: MotionGateConfig = field(default_factory=MotionGateConfig)
+    findface_sender: FindfaceSenderConfig = field(default_factory=FindfaceSenderConfig)
+    findface_client: FindfaceClientConfig = field(default_factory=FindfaceClientConfig)
+    outbox: OutboxConfig = field(default_factory=OutboxConfig)
     
     @property
     def device(self) -> str:
@@ -2,20 +2,63 @@
 Factory para criar cliente FindFace Multi.
 """
 
-from src.infrastructure.clients import FindfaceMulti
-from src.infrastructure.config.settings import FindFaceConfig
+import logging
+from typing import Optional, Union
 
+from src.infrastructure.clients import FindfaceMulti, FindfaceLoadBalancer, FindfaceNode
+from src.infrastructure.config.settings import FindFaceConfig, FindfaceClientConfig
 
-def create_findface_client(config: FindFaceConfig) -> FindfaceMulti:
+
+def create_findface_client(
+    config: FindFaceConfig,
+    client_config: Optional[FindfaceClientConfig] = None
+) -> Union[FindfaceMulti, FindfaceLoadBalancer]:
     """
     Cria e retorna uma instância configurada do cliente FindFace Multi.
     
+    Com mais de uma URL em config.url_bases, retorna um FindfaceLoadBalancer
+    (mesma interface) com um cliente por nó.
+    
     :param config: Configuração do FindFace.
-    :return: Cliente FindfaceMulti autenticado.
+    :param client_config: Configuração da conexão HTTP (pool e timeouts), opcional.
+    :return: Cliente FindfaceMulti autenticado (ou balanceador).
     """
-    return FindfaceMulti(
-        url_base=config.url_base,
-        user=config.user,
-        password=config.password,
-        uuid=config.uuid
+    client_config = client_config or FindfaceClientConfig()
+    url_bases = config.url_bases or [config.url_base]
+    
+    def create_node_client(url_base: str) -> FindfaceMulti:
+        return FindfaceMulti(
+            url_base=url_base,
+            user=config.user,
+            password=config.password,
+            uuid=config.uuid,
+            pool_connections=client_config.pool_connections,
+            pool_maxsize=client_config.pool_maxsize,
+            connect_timeout=client_config.connect_timeout,
+            read_timeout=client_config.read_timeout,
+            max_retries=client_config.max_retries,
+            backoff_base=client_config.backoff_base,
+            backoff_max=client_config.backoff_max,
+            breaker_failure_threshold=client_config.breaker_failure_threshold,
+            breaker_reset_timeout=client_config.breaker_reset_timeout
+        )
+    
+    if len(url_bases) == 1:
+        return create_node_client(url_bases[0])
+    
+    logger = logging.getLogger(__name__)
+    nodes = []
+    for url_base in url_bases:
+        try:
+            nodes.append(FindfaceNode(url_base, create_node_client(url_base)))
+        except Exception as e:
+            # Nó fora do ar no início: o health check tenta o login depois
+            logger.warning(f"Nó do FindFace {url_base} indisponível no início: {e}")
+            nodes.append(FindfaceNode(url_base))
+    
+    return FindfaceLoadBalancer(
+        nodes=nodes,
+        client_factory=create_node_client,
+        health_check_interval=client_config.health_check_interval,
+        sticky_max_in_flight=client_config.sticky_max_in_flight
     )
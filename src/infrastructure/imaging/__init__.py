@@ -0,0 +1,8 @@
+"""
+Codificação de imagens.
+"""
+
+from src.infrastructure.imaging.jpeg_encoder import JpegEncoder, JpegEncoderPool
+from src.infrastructure.imaging.encoded_frame_cache import EncodedFrameCache
+
+__all__ = ['JpegEncoder', 'JpegEncoderPool', 'EncodedFrameCache']
@@ -0,0 +1,113 @@
+"""
+Cache LRU de frames já codificados em JPEG.
+
+Quando várias faces do mesmo frame viram o melhor evento de seus tracks,
+cada envio codificaria o mesmo frame de novo. O cache guarda os bytes do
+JPEG por chave de frame, com limite de memória, e garante que frames
+pedidos ao mesmo tempo por vários workers sejam codificados uma única vez.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+
+class EncodedFrameCache:
+    """Cache LRU thread-safe de JPEGs, limitado em bytes."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Inicializa o cache.
+
+        :param max_bytes: Memória máxima ocupada pelos JPEGs em cache.
+        """
+        self.max_bytes = max(0, int(max_bytes))
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, memoryview]" = OrderedDict()
+        self._bytes = 0
+        # Codificações em andamento: outros workers aguardam em vez de repetir
+        self._pending: Dict[Hashable, threading.Event] = {}
+
+        # Estatísticas
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_encode(self, key: Hashable, encode: Callable[[], memoryview]) -> memoryview:
+        """
+        Retorna o JPEG em cache ou codifica (uma vez por chave) e guarda.
+
+        :param key: Chave do frame.
+        :param encode: Função que codifica o frame na thread atual (não pode
+                       depender de threads que também aguardam o cache).
+        :return: Bytes do JPEG.
+        """
+        while True:
+            with self._lock:
+                data = self._entries.get(key)
+                if data is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return data
+
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._pending[key] = pending
+                    self._misses += 1
+                    break
+
+            # Outro worker está codificando este frame
+            pending.wait()
+
+        try:
+            data = encode()
+            self._store(key, data)
+            return data
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending.set()
+
+    def _store(self, key: Hashable, data: memoryview) -> None:
+        """Guarda um JPEG, descartando os menos usados acima do limite."""
+        size = len(data)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._entries[key] = data
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Esvazia o cache."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        """Número de frames em cache."""
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas do cache.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions
+            }
@@ -0,0 +1,191 @@
+"""
+Codificação JPEG dos frames enviados ao FindFace.
+
+JpegEncoder usa libjpeg-turbo (PyTurboJPEG) quando disponível e cai para
+cv2.imencode. JpegEncoderPool executa as codificações em um pool de threads
+próprio, dimensionado independentemente dos workers HTTP: os senders podem
+ser muitos (I/O) sem que mais de N frames sejam codificados ao mesmo tempo
+(CPU). As duas bibliotecas liberam o GIL durante a codificação.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+
+class JpegEncoder:
+    """Codificador JPEG com qualidade configurável e backend selecionável."""
+
+    BACKENDS = ("auto", "opencv", "turbojpeg")
+
+    def __init__(self, quality: int = 95, backend: str = "auto"):
+        """
+        Inicializa o codificador.
+
+        :param quality: Qualidade JPEG (1-100).
+        :param backend: "auto" (turbojpeg se instalado), "opencv" ou "turbojpeg".
+        :raises ValueError: Se a qualidade ou o backend forem inválidos.
+        """
+        if not 1 <= int(quality) <= 100:
+            raise ValueError(f"Qualidade JPEG deve estar entre 1 e 100, recebido: {quality}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend JPEG inválido: {backend} (use {', '.join(self.BACKENDS)})")
+
+        self.logger = logging.getLogger(__name__)
+        self.quality = int(quality)
+        self._turbo = None
+
+        if backend in ("auto", "turbojpeg") and TurboJPEG is not None:
+            try:
+                self._turbo = TurboJPEG()
+            except Exception as e:
+                # Pacote instalado sem a biblioteca nativa libturbojpeg
+                self.logger.warning(f"libjpeg-turbo indisponível ({e}). Usando OpenCV para JPEG.")
+        elif backend == "turbojpeg":
+            self.logger.warning("Pacote 'PyTurboJPEG' não instalado. Usando OpenCV para JPEG.")
+
+        self.backend = "turbojpeg" if self._turbo is not None else "opencv"
+        self._cv2_params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+
+    def encode(self, image: np.ndarray) -> memoryview:
+        """
+        Codifica uma imagem BGR em JPEG.
+
+        A imagem não é modificada nem copiada (exceto se não for contígua).
+        O JPEG é devolvido como memoryview do buffer do codificador, sem a
+        cópia de ``tobytes()``; o cliente do FindFace envia direto dele.
+
+        :param image: Imagem BGR (H, W, 3).
+        :return: JPEG (memoryview de bytes).
+        :raises ValueError: Se a codificação falhar.
+        """
+        if self._turbo is not None:
+            return memoryview(self._turbo.encode(
+                np.ascontiguousarray(image),
+                quality=self.quality,
+                pixel_format=TJPF_BGR,
+                jpeg_subsample=TJSAMP_420
+            ))
+
+        ok, buffer = cv2.imencode('.jpg', image, self._cv2_params)
+        if not ok:
+            raise ValueError("Falha ao codificar frame para JPEG")
+        return memoryview(buffer.reshape(-1))
+
+
+class JpegEncoderPool:
+    """
+    Pool de threads dedicado à codificação JPEG.
+
+    encode() pode ser chamado de qualquer thread: fora do pool, a codificação
+    é enviada ao pool e a chamada aguarda o resultado; dentro do pool (tarefas
+    submetidas via executor), codifica direto, sem reentrar na fila.
+    """
+
+    def __init__(self, workers: int = 4, quality: int = 95, backend: str = "auto"):
+        """
+        Inicializa o pool.
+
+        :param workers: Número de threads de codificação.
+        :param quality: Qualidade JPEG (1-100).
+        :param backend: Backend do codificador (ver JpegEncoder).
+        """
+        self.encoder = JpegEncoder(quality=quality, backend=backend)
+        self.workers = max(1, int(workers))
+
+        self._local = threading.local()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="JpegEncode",
+            initializer=self._mark_pool_thread
+        )
+
+        self._lock = threading.Lock()
+        self._encoded = 0
+        self._encode_seconds = 0.0
+        self._bytes_out = 0
+
+    @property
+    def quality(self) -> int:
+        """Qualidade JPEG configurada."""
+        return self.encoder.quality
+
+    @property
+    def backend(self) -> str:
+        """Backend efetivo ("turbojpeg" ou "opencv")."""
+        return self.encoder.backend
+
+    def _mark_pool_thread(self):
+        """Marca a thread atual como thread do pool."""
+        self._local.in_pool = True
+
+    def encode(self, image: np.ndarray) -> memoryview:
+        """
+        Codifica uma imagem em JPEG usando o pool.
+
+        :param image: Imagem BGR (H, W, 3).
+        :return: JPEG (memoryview de bytes).
+        :raises ValueError: Se a codificação falhar.
+        """
+        if getattr(self._local, "in_pool", False):
+            return self._encode_timed(image)
+        return self.executor.submit(self._encode_timed, image).result()
+
+    def encode_inline(self, image: np.ndarray) -> memoryview:
+        """
+        Codifica na thread atual, sem passar pela fila do pool (mesmas métricas).
+
+        Para quem detém uma chave do EncodedFrameCache: as threads do pool
+        podem estar todas aguardando essa chave, e uma tarefa enviada ao
+        pool nunca rodaria.
+
+        :param image: Imagem BGR (H, W, 3).
+        :return: JPEG (memoryview de bytes).
+        :raises ValueError: Se a codificação falhar.
+        """
+        return self._encode_timed(image)
+
+    def _encode_timed(self, image: np.ndarray) -> memoryview:
+        """Codifica e acumula métricas."""
+        start = time.perf_counter()
+        data = self.encoder.encode(image)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._encoded += 1
+            self._encode_seconds += elapsed
+            self._bytes_out += len(data)
+        return data
+
+    def shutdown(self, wait: bool = True):
+        """
+        Encerra o pool.
+
+        :param wait: Aguarda as codificações pendentes.
+        """
+        self.executor.shutdown(wait=wait)
+
+    def get_stats(self) -> dict:
+        """
+        Retorna métricas de codificação.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            encoded = self._encoded
+            return {
+                "backend": self.backend,
+                "quality": self.quality,
+                "workers": self.workers,
+                "encoded": encoded,
+                "avg_encode_ms": (self._encode_seconds / encoded * 1000.0) if encoded else 0.0,
+                "avg_jpeg_kb": (self._bytes_out / encoded / 1024.0) if encoded else 0.0
+            }
@@ -0,0 +1,7 @@
+"""
+Outbox persistente em disco.
+"""
+
+from src.infrastructure.outbox.disk_outbox import DiskOutbox
+
+__all__ = ['DiskOutbox']
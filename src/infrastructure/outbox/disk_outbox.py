@@ -0,0 +1,479 @@
+"""
+Outbox persistente em disco (segmentos append-only + índice).
+
+Cada registro guarda metadados (JSON) e um payload binário (ex.: JPEG).
+Registros são lidos na ordem de gravação; o cursor de leitura fica em um
+índice gravado atomicamente. Segmentos totalmente consumidos, expirados ou
+acima da cota de disco são apagados inteiros.
+
+Formato de um registro:
+    magic (4 bytes) | tamanho meta (u32) | tamanho dados (u32) | crc32 (u32)
+    | meta JSON (UTF-8) | dados
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+_MAGIC = b"FFOB"
+_HEADER = struct.Struct("<4sIII")
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".log"
+_INDEX_FILE = "index.json"
+
+
+@dataclass
+class _SegmentInfo:
+    """Estado em memória de um segmento."""
+    size: int = 0
+    records: int = 0
+    newest_created_at: float = 0.0
+
+
+class DiskOutbox:
+    """
+    Fila FIFO persistente e thread-safe.
+
+    Uso típico (um consumidor):
+        record = outbox.peek()
+        if record is not None:
+            metadata, data = record
+            ... envia ...
+            outbox.ack()   # só após sucesso
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_max_bytes: int = 16 * 1024 * 1024,
+        max_bytes: int = 1024 * 1024 * 1024,
+        max_age_seconds: float = 24 * 3600,
+        fsync: bool = False
+    ):
+        """
+        Abre (ou cria) a outbox no diretório informado.
+
+        :param directory: Diretório dos segmentos e do índice.
+        :param segment_max_bytes: Tamanho a partir do qual um novo segmento é aberto.
+        :param max_bytes: Cota total em disco; segmentos mais antigos são descartados.
+        :param max_age_seconds: Registros mais antigos que isso são descartados (0 = sem limite).
+        :param fsync: Força fsync a cada gravação (mais lento, sobrevive a queda de energia).
+        """
+        self.directory = Path(directory)
+        self.segment_max_bytes = max(_HEADER.size + 1, int(segment_max_bytes))
+        self.max_bytes = int(max_bytes)
+        self.max_age_seconds = float(max_age_seconds)
+        self.fsync = fsync
+
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        self._segments: Dict[int, _SegmentInfo] = {}
+        self._read_segment = 0
+        self._read_offset = 0
+        self._pending = 0
+
+        self._writer = None
+        self._write_segment = 0
+        self._reader = None
+        self._reader_segment = -1
+
+        # Registro devolvido pelo último peek (consumido por ack)
+        self._peeked_end: Optional[Tuple[int, int]] = None
+
+        # Estatísticas
+        self._appended = 0
+        self._acked = 0
+        self._dropped_quota = 0
+        self._dropped_expired = 0
+        self._dropped_corrupt = 0
+        self._rejected = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    # ------------------------------------------------------------------
+    # Inicialização
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, seq: int) -> Path:
+        """Caminho do segmento de número seq."""
+        return self.directory / f"{_SEGMENT_PREFIX}{seq:08d}{_SEGMENT_SUFFIX}"
+
+    def _recover(self) -> None:
+        """Reconstrói o estado a partir dos segmentos e do índice."""
+        sequences = sorted(
+            int(p.name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+            for p in self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}")
+        )
+
+        for seq in sequences:
+            self._segments[seq] = self._scan_segment(seq)
+
+        index = self._load_index()
+        if sequences:
+            self._read_segment = max(index.get("read_segment", sequences[0]), sequences[0])
+            self._read_offset = index.get("read_offset", 0) if self._read_segment in self._segments else 0
+            # Segmentos anteriores ao cursor já foram consumidos
+            for seq in [s for s in sequences if s < self._read_segment]:
+                self._delete_segment(seq)
+            self._write_segment = sequences[-1]
+        else:
+            self._read_segment = self._write_segment = index.get("read_segment", 0) + 1
+            self._read_offset = 0
+
+        self._pending = self._count_pending()
+        self._open_writer(self._write_segment)
+
+        if self._pending:
+            self.logger.info(
+                f"Outbox '{self.directory}': {self._pending} eventos pendentes em "
+                f"{len(self._segments)} segmentos"
+            )
+
+    def _scan_segment(self, seq: int) -> _SegmentInfo:
+        """
+        Lê os cabeçalhos de um segmento; trunca registro final incompleto.
+
+        :return: Estado do segmento.
+        """
+        path = self._segment_path(seq)
+        info = _SegmentInfo()
+        offset = 0
+
+        with open(path, "r+b") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            while True:
+                # Só cabeçalhos + metadados (o CRC dos dados é verificado no peek)
+                record = self._read_record(f, with_data=False)
+                if record is None:
+                    break
+                metadata, _, end = record
+                if end > file_size:
+                    break
+                info.records += 1
+                info.newest_created_at = max(info.newest_created_at, float(metadata.get("created_at", 0.0)))
+                offset = end
+
+            if offset != file_size:
+                self.logger.warning(f"Outbox: registro incompleto no fim de {path.name}, truncando")
+                f.truncate(offset)
+
+        info.size = offset
+        return info
+
+    def _count_pending(self) -> int:
+        """Conta registros a partir do cursor de leitura."""
+        pending = 0
+        for seq, info in self._segments.items():
+            if seq > self._read_segment:
+                pending += info.records
+            elif seq == self._read_segment:
+                with open(self._segment_path(seq), "rb") as f:
+                    f.seek(self._read_offset)
+                    while self._read_record(f, with_data=False) is not None:
+                        pending += 1
+        return pending
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Lê o índice (cursor de leitura)."""
+        path = self.directory / _INDEX_FILE
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Outbox: índice ilegível ({e}), relendo desde o início")
+            return {}
+
+    def _save_index(self) -> None:
+        """Grava o índice atomicamente (arquivo temporário + rename)."""
+        path = self.directory / _INDEX_FILE
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"read_segment": self._read_segment, "read_offset": self._read_offset}, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    # ------------------------------------------------------------------
+    # Leitura/gravação de registros
+    # ------------------------------------------------------------------
+
+    def _read_record(self, f, with_data: bool = True) -> Optional[Tuple[Dict[str, Any], Optional[bytes], int]]:
+        """
+        Lê um registro na posição atual do arquivo.
+
+        :return: (metadados, dados, offset final) ou None se não houver
+                 registro completo e válido.
+        """
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+
+        magic, meta_len, data_len, crc = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            return None
+
+        meta_bytes = f.read(meta_len)
+        if len(meta_bytes) < meta_len:
+            return None
+
+        if with_data:
+            data = f.read(data_len)
+            if len(data) < data_len or zlib.crc32(data, zlib.crc32(meta_bytes)) != crc:
+                return None
+        else:
+            data = None
+            f.seek(data_len, os.SEEK_CUR)
+
+        try:
+            metadata = json.loads(meta_bytes.decode("utf-8"))
+        except ValueError:
+            return None
+
+        return metadata, data, f.tell()
+
+    def _open_writer(self, seq: int) -> None:
+        """Abre (em append) o segmento de escrita."""
+        if self._writer is not None:
+            self._writer.close()
+        self._write_segment = seq
+        self._segments.setdefault(seq, _SegmentInfo())
+        self._writer = open(self._segment_path(seq), "ab")
+
+    def _delete_segment(self, seq: int) -> None:
+        """Remove um segmento do disco e do estado."""
+        if self._reader_segment == seq and self._reader is not None:
+            self._reader.close()
+            self._reader = None
+            self._reader_segment = -1
+        self._segments.pop(seq, None)
+        try:
+            self._segment_path(seq).unlink()
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    def append(self, metadata: Dict[str, Any], data: bytes) -> bool:
+        """
+        Grava um registro no fim da outbox.
+
+        :param metadata: Metadados serializáveis em JSON ('created_at' é
+                         preenchido se ausente).
+        :param data: Payload binário (bytes, bytearray ou memoryview).
+        :return: True se gravado; False se não couber na cota.
+        """
+        metadata = dict(metadata)
+        metadata.setdefault("created_at", time.time())
+        meta_bytes = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+        crc = zlib.crc32(data, zlib.crc32(meta_bytes))
+        record_size = _HEADER.size + len(meta_bytes) + len(data)
+
+        with self._lock:
+            self._enforce_limits(incoming=record_size)
+            if self.max_bytes and self._total_bytes() + record_size > self.max_bytes:
+                self._rejected += 1
+                return False
+
+            info = self._segments[self._write_segment]
+            if info.size and info.size + record_size > self.segment_max_bytes:
+                self._open_writer(self._write_segment + 1)
+                info = self._segments[self._write_segment]
+
+            self._writer.write(_HEADER.pack(_MAGIC, len(meta_bytes), len(data), crc))
+            self._writer.write(meta_bytes)
+            self._writer.write(data)
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+
+            info.size += record_size
+            info.records += 1
+            info.newest_created_at = max(info.newest_created_at, metadata["created_at"])
+            self._pending += 1
+            self._appended += 1
+            return True
+
+    def peek(self) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """
+        Retorna o registro mais antigo sem removê-lo.
+
+        Registros expirados ou corrompidos encontrados no caminho são
+        descartados.
+
+        :return: (metadados, dados) ou None se vazia.
+        """
+        with self._lock:
+            while self._pending > 0:
+                if self._read_segment not in self._segments:
+                    self._advance_segment()
+                    continue
+
+                reader = self._get_reader()
+                reader.seek(self._read_offset)
+                record = self._read_record(reader)
+
+                if record is None:
+                    if self._read_segment == self._write_segment:
+                        # Nada após o cursor no segmento corrente
+                        return None
+                    if self._read_offset < self._segments[self._read_segment].size:
+                        self._dropped_corrupt += 1
+                        self.logger.warning(
+                            f"Outbox: registro corrompido em {self._segment_path(self._read_segment).name}, "
+                            f"pulando restante do segmento"
+                        )
+                    self._advance_segment()
+                    continue
+
+                metadata, data, end = record
+                if self._is_expired(metadata):
+                    self._dropped_expired += 1
+                    self._consume(end)
+                    continue
+
+                self._peeked_end = (self._read_segment, end)
+                return metadata, data
+            return None
+
+    def ack(self) -> None:
+        """Remove o registro devolvido pelo último peek."""
+        with self._lock:
+            if self._peeked_end is None:
+                return
+            seq, end = self._peeked_end
+            self._peeked_end = None
+            if seq == self._read_segment:
+                self._acked += 1
+                self._consume(end)
+
+    def _consume(self, end: int) -> None:
+        """Avança o cursor até end (lock já adquirido)."""
+        self._read_offset = end
+        self._pending = max(0, self._pending - 1)
+        info = self._segments.get(self._read_segment)
+        if info is not None and end >= info.size and self._read_segment != self._write_segment:
+            self._advance_segment()
+        else:
+            self._save_index()
+
+    def _advance_segment(self) -> None:
+        """Apaga o segmento de leitura e passa ao próximo (lock já adquirido)."""
+        consumed = self._read_segment
+        remaining = [s for s in self._segments if s > consumed]
+        self._read_segment = min(remaining) if remaining else self._write_segment
+        self._read_offset = 0
+        if consumed != self._write_segment:
+            self._delete_segment(consumed)
+        self._peeked_end = None
+        self._save_index()
+
+    def _get_reader(self):
+        """Retorna o handle de leitura do segmento corrente."""
+        if self._reader_segment != self._read_segment or self._reader is None:
+            if self._reader is not None:
+                self._reader.close()
+            self._reader = open(self._segment_path(self._read_segment), "rb")
+            self._reader_segment = self._read_segment
+        return self._reader
+
+    def _is_expired(self, metadata: Dict[str, Any]) -> bool:
+        """Verifica o limite de idade de um registro."""
+        if not self.max_age_seconds:
+            return False
+        return time.time() - float(metadata.get("created_at", 0.0)) > self.max_age_seconds
+
+    def _total_bytes(self) -> int:
+        """Bytes ocupados pelos segmentos."""
+        return sum(info.size for info in self._segments.values())
+
+    def _enforce_limits(self, incoming: int = 0) -> None:
+        """
+        Descarta segmentos inteiros expirados ou acima da cota (lock já adquirido).
+
+        O segmento de escrita nunca é descartado aqui.
+        """
+        now = time.time()
+        for seq in sorted(self._segments):
+            if seq == self._write_segment:
+                break
+            info = self._segments[seq]
+            expired = self.max_age_seconds and now - info.newest_created_at > self.max_age_seconds
+            over_quota = self.max_bytes and self._total_bytes() + incoming > self.max_bytes
+            if not (expired or over_quota):
+                break
+
+            dropped = self._records_unread(seq)
+            if expired:
+                self._dropped_expired += dropped
+            elif dropped:
+                self._dropped_quota += dropped
+                self.logger.warning(f"Outbox: cota de disco atingida, {dropped} eventos antigos descartados")
+            self._pending = max(0, self._pending - dropped)
+
+            if seq == self._read_segment:
+                self._advance_segment()
+            else:
+                self._delete_segment(seq)
+
+    def _records_unread(self, seq: int) -> int:
+        """Registros ainda não lidos de um segmento."""
+        info = self._segments[seq]
+        if seq != self._read_segment or self._read_offset == 0:
+            return info.records
+        unread = 0
+        with open(self._segment_path(seq), "rb") as f:
+            f.seek(self._read_offset)
+            while self._read_record(f, with_data=False) is not None:
+                unread += 1
+        return unread
+
+    def __len__(self) -> int:
+        """Número de registros pendentes."""
+        return self._pending
+
+    def close(self) -> None:
+        """Fecha os arquivos abertos (o estado já está persistido)."""
+        with self._lock:
+            for handle in (self._writer, self._reader):
+                if handle is not None:
+                    try:
+                        handle.close()
+                    except OSError:
+                        pass
+            self._writer = None
+            self._reader = None
+            self._reader_segment = -1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas da outbox.
+
+        :return: Dicionário com estatísticas.
+        """
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "segments": len(self._segments),
+                "disk_bytes": self._total_bytes(),
+                "appended": self._appended,
+                "acked": self._acked,
+                "rejected": self._rejected,
+                "dropped_quota": self._dropped_quota,
+                "dropped_expired": self._dropped_expired,
+                "dropped_corrupt": self._dropped_corrupt
+            }
@@ -3,9 +3,16 @@ Implementação do repositório de câmeras usando FindFace Multi API.
 Infrastructure Layer - implementação concreta da interface do domínio.
 """
 
-from typing import List
+import json
 import logging
-from src.infrastructure.clients import FindfaceMulti, FindfaceMultiAsync
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.infrastructure.clients import FindfaceMulti, FindfaceMultiAsync, FindfaceLoadBalancer
 from src.domain.entities import Camera
 from src.domain.repositories import CameraRepository
 from src.domain.value_objects import IdVO, NameVO, CameraTokenVO, CameraSourceVO
@@ -14,71 +21,265 @@ from src.domain.value_objects import IdVO, NameVO, CameraTokenVO, CameraSourceVO
 class CameraRepositoryFindface(CameraRepository):
     """
     Implementação concreta do CameraRepository usando FindFace Multi API.
+
+    Os grupos são consultados em paralelo, seguindo a paginação (next_page).
+    Com cache_file, a última lista obtida com sucesso é gravada em disco: no
+    início seguinte as câmeras saem do cache na hora e a lista é revalidada
+    em background. Chamadas seguintes (reconciliação) consultam a API e só
+    recorrem ao cache se ela falhar.
     """
 
-    def __init__(self, findface_client, camera_prefix: str = 'TESTE'):
+    # Versão do formato do arquivo de cache
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        findface_client,
+        camera_prefix: str = 'TESTE',
+        cache_file: str = "",
+        discovery_workers: int = 4,
+        page_size: int = 100
+    ):
         """
         Inicializa o repositório de câmeras do FindFace.
 
-        :param findface_client: Instância do cliente FindfaceMulti ou FindfaceMultiAsync.
+        :param findface_client: Instância do cliente FindfaceMulti, FindfaceMultiAsync ou
+                                FindfaceLoadBalancer (None: apenas o cache é usado).
         :param camera_prefix: Prefixo para filtrar grupos de câmeras virtuais.
+        :param cache_file: Arquivo de cache da lista de câmeras ("" = desativado).
+                           Contém os tokens das câmeras: é gravado com permissão 0600.
+        :param discovery_workers: Grupos consultados em paralelo.
+        :param page_size: Itens por página nas listagens da API.
         """
-        # Aceita tanto FindfaceMulti quanto FindfaceMultiAsync (wrapper)
-        if not isinstance(findface_client, (FindfaceMulti, FindfaceMultiAsync)):
+        # Aceita FindfaceMulti, FindfaceMultiAsync (wrapper) e o balanceador de vários nós
+        if findface_client is not None and not isinstance(
+            findface_client, (FindfaceMulti, FindfaceMultiAsync, FindfaceLoadBalancer)
+        ):
             raise TypeError(
-                "O parâmetro 'findface_client' deve ser uma instância de FindfaceMulti "
-                "ou FindfaceMultiAsync."
+                "O parâmetro 'findface_client' deve ser uma instância de FindfaceMulti, "
+                "FindfaceMultiAsync ou FindfaceLoadBalancer."
             )
-        
+
         self.findface = findface_client
         self.camera_prefix = camera_prefix
+        self.cache_file = cache_file
+        self.discovery_workers = max(1, int(discovery_workers))
+        self.page_size = max(1, int(page_size))
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        self._revalidation_thread: Optional[threading.Thread] = None
+        self._first_call = True
+
     def get_active_cameras(self) -> List[Camera]:
         """
         Obtém todas as câmeras ativas do FindFace.
-        
+
+        Na primeira chamada, com cache válido, retorna as câmeras do cache e
+        revalida em background. Se a API falhar, usa o cache (se houver).
+
         :return: Lista de entidades Camera ativas.
         """
-        cameras = []
+        cached = self._load_cache()
+        first_call, self._first_call = self._first_call, False
+        if first_call and cached and self.findface is not None:
+            self.logger.info(f"Obtidas {len(cached)} câmeras do cache {self.cache_file}; revalidando em background")
+            self._revalidation_thread = threading.Thread(
+                target=self._revalidate,
+                args=(cached,),
+                name="CameraDiscovery",
+                daemon=True
+            )
+            self._revalidation_thread.start()
+            return cached
+
+        if self.findface is None:
+            if cached:
+                self.logger.warning(f"FindFace indisponível; usando {len(cached)} câmeras do cache")
+                return cached
+            self.logger.error("FindFace indisponível e sem cache de câmeras")
+            return []
 
         try:
-            # Obtém grupos de câmeras
-            grupos = self.findface.get_camera_groups()["results"]
-            grupos_filtrados = [
-                g for g in grupos 
-                if g["name"].lower().startswith(self.camera_prefix.lower())
-            ]
-
-            # Para cada grupo, obtém câmeras ATIVAS
-            for grupo in grupos_filtrados:
-                cameras_response = self.findface.get_cameras(
-                    camera_groups=[grupo["id"]],
-                    external_detector=True,
-                    ordering='id',
-                    active=True  # Filtra apenas câmeras ativas
-                )["results"]
-                
-                # Filtra câmeras com RTSP no comment
-                cameras_filtradas = [
-                    c for c in cameras_response 
-                    if c.get("comment", "").startswith("rtsp://")
-                ]
-                
-                # Converte para entidades Camera
-                for camera_data in cameras_filtradas:
-                    camera = Camera(
-                        camera_id=IdVO(camera_data["id"]),
-                        camera_name=NameVO(camera_data["name"]),
-                        camera_token=CameraTokenVO(camera_data["external_detector_token"]),
-                        source=CameraSourceVO(camera_data["comment"].strip()),
-                        active=camera_data.get("active", True)
-                    )
+            cameras = self.fetch_cameras()
+        except Exception as e:
+            if cached:
+                self.logger.warning(f"Erro ao obter câmeras do FindFace ({e}); usando {len(cached)} câmeras do cache")
+                return cached
+            self.logger.error(f"Erro ao obter câmeras do FindFace: {e}", exc_info=True)
+            return []
+
+        self.logger.log(
+            logging.INFO if first_call else logging.DEBUG,
+            f"Obtidas {len(cameras)} câmeras ativas do FindFace"
+        )
+        self._save_cache(cameras)
+        return cameras
+
+    def fetch_cameras(self) -> List[Camera]:
+        """
+        Consulta a API: grupos com o prefixo e, em paralelo, as câmeras de cada grupo.
+
+        :return: Lista de entidades Camera ativas.
+        :raises Exception: Se qualquer consulta falhar (a lista nunca é parcial).
+        """
+        start = time.monotonic()
+
+        # Obtém grupos de câmeras
+        grupos = self._fetch_all(self.findface.get_camera_groups)
+        grupos_filtrados = [
+            g for g in grupos
+            if g["name"].lower().startswith(self.camera_prefix.lower())
+        ]
+
+        # Para cada grupo, obtém câmeras ATIVAS (grupos em paralelo)
+        with ThreadPoolExecutor(
+            max_workers=min(self.discovery_workers, max(1, len(grupos_filtrados))),
+            thread_name_prefix="CameraDiscovery"
+        ) as executor:
+            por_grupo = list(executor.map(self._fetch_group_cameras, grupos_filtrados))
+
+        cameras = []
+        seen = set()
+        for cameras_grupo in por_grupo:
+            for camera in cameras_grupo:
+                if camera.camera_id.value() not in seen:
+                    seen.add(camera.camera_id.value())
                     cameras.append(camera)
 
-            self.logger.info(f"Obtidas {len(cameras)} câmeras ativas do FindFace")
-            return cameras
+        self.logger.debug(
+            f"Descoberta de câmeras: {len(grupos_filtrados)} grupos, {len(cameras)} câmeras "
+            f"em {time.monotonic() - start:.2f}s"
+        )
+        return cameras
+
+    def _fetch_group_cameras(self, grupo: Dict[str, Any]) -> List[Camera]:
+        """
+        Obtém as câmeras ativas de um grupo.
+
+        :param grupo: Grupo retornado pela API.
+        :return: Câmeras do grupo com RTSP no comment.
+        """
+        cameras_response = self._fetch_all(
+            self.findface.get_cameras,
+            camera_groups=[grupo["id"]],
+            external_detector=True,
+            ordering='id',
+            active=True  # Filtra apenas câmeras ativas
+        )
 
+        # Filtra câmeras com RTSP no comment e converte para entidades Camera
+        return [
+            self._to_camera(camera_data)
+            for camera_data in cameras_response
+            if (camera_data.get("comment") or "").startswith("rtsp://")
+        ]
+
+    def _fetch_all(self, list_method: Callable[..., Dict[str, Any]], **params) -> List[Dict[str, Any]]:
+        """
+        Percorre todas as páginas de uma listagem da API.
+
+        :param list_method: Método do SDK que aceita limit e page.
+        :param params: Filtros da listagem.
+        :return: Resultados de todas as páginas.
+        """
+        results = []
+        page = None
+        while True:
+            response = list_method(limit=self.page_size, page=page, **params)
+            results.extend(response.get("results", []))
+            page = self._next_page_cursor(response.get("next_page"))
+            if page is None:
+                return results
+
+    @staticmethod
+    def _next_page_cursor(next_page: Optional[str]) -> Optional[str]:
+        """Extrai o cursor 'page' de next_page (URL completa ou query string)."""
+        if not next_page:
+            return None
+        values = parse_qs(urlparse(next_page).query).get("page")
+        return values[0] if values else None
+
+    @staticmethod
+    def _to_camera(camera_data: Dict[str, Any]) -> Camera:
+        """
+        Converte um registro da API em entidade Camera.
+
+        O comment traz a URL do stream usado na detecção; uma segunda URL
+        RTSP, separada por espaço ou quebra de linha, é o stream principal
+        (alta resolução) usado no frame enviado ao FindFace.
+        """
+        urls = [token for token in camera_data["comment"].split() if token.startswith("rtsp://")]
+        return Camera(
+            camera_id=IdVO(camera_data["id"]),
+            camera_name=NameVO(camera_data["name"]),
+            camera_token=CameraTokenVO(camera_data["external_detector_token"]),
+            source=CameraSourceVO(urls[0]),
+            active=camera_data.get("active", True),
+            snapshot_source=CameraSourceVO(urls[1]) if len(urls) > 1 else None
+        )
+
+    # ------------------------------------------------------------------
+    # Cache em disco
+    # ------------------------------------------------------------------
+
+    def _revalidate(self, cached: List[Camera]):
+        """Consulta a API em background e atualiza o cache."""
+        try:
+            cameras = self.fetch_cameras()
         except Exception as e:
-            self.logger.error(f"Erro ao obter câmeras do FindFace: {e}", exc_info=True)
+            self.logger.warning(f"Revalidação das câmeras falhou; mantendo o cache: {e}")
+            return
+
+        self._save_cache(cameras)
+        cached_ids = {c.camera_id.value() for c in cached}
+        fresh_ids = {c.camera_id.value() for c in cameras}
+        if cached_ids != fresh_ids:
+            self.logger.warning(
+                f"Lista de câmeras mudou no FindFace (+{len(fresh_ids - cached_ids)} "
+                f"-{len(cached_ids - fresh_ids)}); cache atualizado"
+            )
+        else:
+            self.logger.info(f"Câmeras revalidadas: {len(cameras)} câmeras, cache atualizado")
+
+    def _load_cache(self) -> List[Camera]:
+        """
+        Lê o cache de câmeras.
+
+        :return: Câmeras do cache (vazio se desativado, ausente, inválido ou de outro prefixo).
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
             return []
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.CACHE_VERSION or data.get("prefix") != self.camera_prefix:
+                return []
+            return [Camera.from_dict(camera_data) for camera_data in data["cameras"]]
+        except Exception as e:
+            self.logger.warning(f"Cache de câmeras inválido ({self.cache_file}), ignorando: {e}")
+            return []
+
+    def _save_cache(self, cameras: List[Camera]) -> None:
+        """
+        Grava o cache de forma atômica (arquivo temporário + rename), com permissão 0600.
+
+        :param cameras: Câmeras a gravar.
+        """
+        if not self.cache_file or not cameras:
+            return
+        data = {
+            "version": self.CACHE_VERSION,
+            "prefix": self.camera_prefix,
+            "saved_at": time.time(),
+            "cameras": [camera.to_dict() for camera in cameras]
+        }
+        tmp_path = f"{self.cache_file}.tmp"
+        try:
+            directory = os.path.dirname(os.path.abspath(self.cache_file))
+            os.makedirs(directory, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            self.logger.warning(f"Não foi possível gravar o cache de câmeras ({self.cache_file}): {e}")